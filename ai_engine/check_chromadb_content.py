@@ -1,53 +1,51 @@
 """Check if ChromaDB documents have actual content"""
 import sys
-sys.path.insert(0, 'src')
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from vectorstore.chroma_client import ChromaClient
 from config import settings
 
-client = ChromaClient(
-    persist_directory=settings.CHROMA_DB_PATH,
-    collection_name=settings.CHROMA_COLLECTION_NAME
-)
-client.connect()
 
-# Query for Section 420
-results = client.query("Section 420 cheating", n_results=3)
-
-print("="*80)
-print("CHROMADB CONTENT CHECK")
-print("="*80)
-
-if results and 'documents' in results:
-    docs = results['documents']
-    metas = results['metadatas']
+def check_content(query: str = "Section 420 cheating", n_results: int = 3) -> None:
+    """Run one semantic query and print a preview of each returned document"""
+    client = ChromaClient(
+        persist_directory=settings.CHROMA_DB_PATH,
+        collection_name=settings.CHROMA_COLLECTION_NAME
+    )
+    client.connect()
     
-    print(f"\nTotal results: {len(docs)}")
-    print(f"Type of docs: {type(docs)}")
-    print(f"Type of metas: {type(metas)}")
+    results = client.query(query_texts=[query], n_results=n_results)
     
-    # Handle nested structure
-    if isinstance(docs[0], list):
-        docs = docs[0]
-        metas = metas[0] if metas else []
+    print("="*80)
+    print("CHROMADB CONTENT CHECK")
+    print("="*80)
     
-    print(f"\nAfter flattening - docs: {len(docs)}, metas: {len(metas)}")
+    # Results are nested per query; we issued a single query
+    docs = results['documents'][0] if results.get('documents') else []
+    metas = (results.get('metadatas') or [[]])[0] or []
     
-    for i in range(min(len(docs), 3)):  # Show only first 3
-        doc = docs[i]
-        meta = metas[i] if i < len(metas) else {}
-        
-        print(f"\n{i+1}. Act: {meta.get('act', 'N/A')} | Section: {meta.get('section', 'N/A')}")
+    if not docs:
+        print("No results found!")
+        print("="*80)
+        return
+    
+    print(f"\nQuery: '{query}' - {len(docs)} result(s)")
+    
+    for i, (doc, meta) in enumerate(zip(docs, metas), 1):
+        meta = meta or {}
+        print(f"\n{i}. Act: {meta.get('act', 'N/A')} | Section: {meta.get('section', 'N/A')}")
         print(f"   Title: {meta.get('title', 'N/A')}")
         print(f"   Content Length: {len(doc)} chars")
         
-        if len(doc) > 0:
-            preview = doc[:300]
-            print(f"   Content Preview:\n   {preview}...")
+        if doc:
+            print(f"   Content Preview:\n   {doc[:300]}...")
         else:
             print("   [PROBLEM] Content is EMPTY!")
         print()
-else:
-    print("No results found!")
+    
+    print("="*80)
+
 
-print("="*80)
+if __name__ == "__main__":
+    check_content()
@@ -2,9 +2,10 @@
 Quick test to verify ChromaDB has data
 """
 import sys
-sys.path.insert(0, 'src')
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.vectorstore.chroma_client import ChromaClient
+from vectorstore.chroma_client import ChromaClient
 
 client = ChromaClient(persist_directory="./data/chromadb", collection_name="legal_documents")
 client.connect()
@@ -4,14 +4,15 @@ Loads sample legal documents into ChromaDB for development and testing
 """
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.vectorstore.chroma_client import get_chroma_client
-from src.embeddings.embedder import get_embedder
-from src.data.sample_legal_data import SAMPLE_LEGAL_DOCUMENTS
-from src.config import settings
+from vectorstore.chroma_client import get_chroma_client
+from data.sample_legal_data import SAMPLE_LEGAL_DOCUMENTS
+from config import settings
 import logging
 
 # Configure logging
@@ -22,6 +23,42 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Number of documents sent to ChromaDB per add() call
+BATCH_SIZE = int(os.getenv("CHROMA_BATCH_SIZE", "200"))
+
+# Corpus size above which document preparation is spread across processes
+# (below it, process start-up and pickling cost more than the work itself)
+PARALLEL_PREP_THRESHOLD = int(os.getenv("PARALLEL_PREP_THRESHOLD", "5000"))
+
+
+def _prepare_doc(doc: dict) -> Tuple[str, dict, str]:
+    """Build the (text, metadata, id) triple for one document"""
+    # Combine title and content for better semantic search
+    return f"{doc['title']}\n\n{doc['content']}", doc['metadata'], doc['id']
+
+
+def prepare_documents(docs: Sequence[dict]) -> Tuple[List[str], List[dict], List[str]]:
+    """
+    Prepare documents for ingestion, using a process pool for large corpora
+    
+    Args:
+        docs: Raw documents with 'id', 'title', 'content' and 'metadata'
+        
+    Returns:
+        Tuple of (documents, metadatas, ids) lists
+    """
+    if len(docs) >= PARALLEL_PREP_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            prepared = list(pool.map(_prepare_doc, docs, chunksize=64))
+    else:
+        prepared = [_prepare_doc(doc) for doc in docs]
+    
+    if not prepared:
+        return [], [], []
+    
+    documents, metadatas, ids = map(list, zip(*prepared))
+    return documents, metadatas, ids
+
 
 def load_sample_data():
     """
@@ -33,58 +70,65 @@ def load_sample_data():
     
     try:
         # Initialize components
-        logger.info("\n📝 Step 1: Initializing ChromaDB client and embedder...")
+        logger.info("\n📝 Step 1: Initializing ChromaDB client...")
         chroma_client = get_chroma_client(
             persist_directory=settings.CHROMA_DB_PATH,
             collection_name=settings.CHROMA_COLLECTION_NAME,
             embedding_model=settings.MODEL_NAME
         )
-        logger.info(f"✅ ChromaDB client initialized")
-        logger.info(f"   Collection: {settings.CHROMA_COLLECTION_NAME}")
-        logger.info(f"   Persist Directory: {settings.CHROMA_DB_PATH}")
+        logger.info("✅ ChromaDB client initialized")
+        logger.info("   Collection: %s", settings.CHROMA_COLLECTION_NAME)
+        logger.info("   Persist Directory: %s", settings.CHROMA_DB_PATH)
+        logger.info("   Embedding Model: %s", settings.MODEL_NAME)
         
         # Check existing documents
         existing_count = chroma_client.count()
-        logger.info(f"\n📊 Current collection status:")
-        logger.info(f"   Existing documents: {existing_count}")
+        logger.info("\n📊 Current collection status:")
+        logger.info("   Existing documents: %s", existing_count)
         
         # Prepare documents for ingestion
-        logger.info(f"\n📝 Step 2: Preparing {len(SAMPLE_LEGAL_DOCUMENTS)} legal documents...")
+        logger.info("\n📝 Step 2: Preparing %s legal documents...", len(SAMPLE_LEGAL_DOCUMENTS))
         
-        documents = []
-        metadatas = []
-        ids = []
+        documents, metadatas, ids = prepare_documents(SAMPLE_LEGAL_DOCUMENTS)
+        logger.info("   Prepared %d documents: %s...", len(ids), ids[:5])
+        if logger.isEnabledFor(logging.DEBUG):
+            for doc in SAMPLE_LEGAL_DOCUMENTS:
+                logger.debug("   ✓ %s: %s...", doc['id'], doc['title'][:60])
         
-        for doc in SAMPLE_LEGAL_DOCUMENTS:
-            # Combine title and content for better semantic search
-            full_text = f"{doc['title']}\n\n{doc['content']}"
-            documents.append(full_text)
-            metadatas.append(doc['metadata'])
-            ids.append(doc['id'])
-            
-            logger.info(f"   ✓ {doc['id']}: {doc['title'][:60]}...")
+        # Embed all documents in one pass; unchanged texts come from the client's
+        # document embedding cache, so re-indexing only encodes new or edited documents
+        logger.info("\n📝 Step 2b: Computing embeddings for %s documents...", len(documents))
+        stats_before = dict(chroma_client.doc_embedding_stats)
+        vectors = chroma_client.embed_documents(documents)
+        cached = chroma_client.doc_embedding_stats['cached'] - stats_before['cached']
+        encoded = chroma_client.doc_embedding_stats['encoded'] - stats_before['encoded']
+        logger.info("   Embeddings: %s cached, %s encoded", cached, encoded)
         
-        # Add documents to ChromaDB
-        logger.info(f"\n📝 Step 3: Adding documents to ChromaDB...")
-        chroma_client.add_documents(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        # Add documents to ChromaDB in batches
+        logger.info("\n📝 Step 3: Adding documents to ChromaDB (batch size: %s)...", BATCH_SIZE)
+        for start in range(0, len(documents), BATCH_SIZE):
+            end = start + BATCH_SIZE
+            chroma_client.add_documents(
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end],
+                embeddings=vectors[start:end]
+            )
+            logger.info("   ✓ Batch %s: %s documents", start // BATCH_SIZE + 1, len(ids[start:end]))
         
         new_count = chroma_client.count()
-        logger.info(f"✅ Documents added successfully!")
-        logger.info(f"   Total documents in collection: {new_count}")
+        logger.info("✅ Documents added successfully!")
+        logger.info("   Total documents in collection: %s", new_count)
         
         # Display collection info
-        logger.info(f"\n📊 Collection Information:")
+        logger.info("\n📊 Collection Information:")
         info = chroma_client.get_collection_info()
-        logger.info(f"   Name: {info['name']}")
-        logger.info(f"   Document Count: {info['count']}")
-        logger.info(f"   Embedding Model: {info['embedding_model']}")
+        logger.info("   Name: %s", info['name'])
+        logger.info("   Document Count: %s", info['count'])
+        logger.info("   Embedding Model: %s", info['embedding_model'])
         
         # Test query
-        logger.info(f"\n📝 Step 4: Testing semantic search...")
+        logger.info("\n📝 Step 4: Testing semantic search...")
         test_queries = [
             "What is the punishment for murder?",
             "How to file an FIR?",
@@ -92,16 +136,16 @@ def load_sample_data():
         ]
         
         for query in test_queries:
-            logger.info(f"\n   Query: '{query}'")
+            logger.info("\n   Query: '%s'", query)
             results = chroma_client.query(
                 query_texts=[query],
                 n_results=2
             )
             
             if results['ids'][0]:
-                logger.info(f"   Top Result: {results['ids'][0][0]}")
-                logger.info(f"   Distance: {results['distances'][0][0]:.4f}")
-                logger.info(f"   Snippet: {results['documents'][0][0][:100]}...")
+                logger.info("   Top Result: %s", results['ids'][0][0])
+                logger.info("   Distance: %.4f", results['distances'][0][0])
+                logger.info("   Snippet: %s...", results['documents'][0][0][:100])
         
         logger.info("\n" + "=" * 70)
         logger.info("✅ Sample data loaded successfully!")
@@ -115,7 +159,7 @@ def load_sample_data():
         return True
         
     except Exception as e:
-        logger.error(f"\n❌ Failed to load sample data: {str(e)}", exc_info=True)
+        logger.error("\n❌ Failed to load sample data: %s", str(e), exc_info=True)
         return False
 
 
@@ -136,7 +180,7 @@ def clear_collection():
         return True
         
     except Exception as e:
-        logger.error(f"❌ Failed to clear collection: {str(e)}")
+        logger.error("❌ Failed to clear collection: %s", str(e))
         return False
 
 
@@ -1,14 +1,20 @@
 """Cache module for AI Engine"""
 from .redis_cache import (
     RedisCache,
+    AsyncRedisCache,
     get_cache,
+    get_async_cache,
+    close_async_cache,
     CachePrefix,
     CacheTTL
 )
 
 __all__ = [
     'RedisCache',
+    'AsyncRedisCache',
     'get_cache',
+    'get_async_cache',
+    'close_async_cache',
     'CachePrefix',
     'CacheTTL'
 ]
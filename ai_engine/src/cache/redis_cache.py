@@ -3,17 +3,109 @@ Redis Cache Manager for AI Engine
 Implements caching layer for query embeddings, search results, and graph facts
 """
 import redis
+import redis.asyncio as aioredis
 import json
 import hashlib
 import logging
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Optional, List, Dict
 import pickle
+import numpy as np
+
+# Optional compact binary serializer for plain dict/list payloads
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Optional fast non-cryptographic hash for cache keys
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# msgpack payloads above this size are zlib-compressed (legal text compresses ~3x)
+COMPRESS_MIN_BYTES = 4096
+COMPRESS_LEVEL = 3
+
+# 1-byte type tags prefixed to every cached payload so get() can dispatch
+_TAG_NDARRAY = b'n'   # raw float32 buffer (legacy, read-only)
+_TAG_FLOAT16 = b'h'   # float16 buffer (embeddings), restored as float32
+_TAG_MSGPACK = b'm'   # msgpack-encoded dicts/lists/scalars
+_TAG_MSGPACK_ZLIB = b'z'  # zlib-compressed msgpack (large text-heavy payloads)
+_TAG_PICKLE = b'p'    # fallback for arbitrary Python objects
+
+
+@lru_cache(maxsize=4096)
+def _cache_key(prefix: str, data: str) -> str:
+    """Hash data into a prefixed cache key (memoized for repeated inputs)"""
+    # Keys only need to be unique, not collision-resistant against attackers,
+    # so a 64-bit digest (16 hex chars) is enough
+    if XXHASH_AVAILABLE:
+        digest = xxhash.xxh3_64_hexdigest(data.encode('utf-8'))
+    else:
+        digest = hashlib.blake2b(data.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def _serialize(value: Any) -> bytes:
+    """Serialize a value into a tagged byte payload"""
+    if isinstance(value, np.ndarray) and value.dtype == np.float32:
+        # Half precision halves memory/bandwidth; for normalized embeddings the
+        # relative error (<1e-3) is well below cosine-retrieval noise. Only float32
+        # (embeddings) is downcast; other dtypes go through pickle losslessly.
+        array = value.astype(np.float16)
+        header = struct.pack(f'<B{array.ndim}I', array.ndim, *array.shape)
+        return _TAG_FLOAT16 + header + array.tobytes()
+    
+    if MSGPACK_AVAILABLE:
+        try:
+            packed = msgpack.packb(value, use_bin_type=True)
+            if len(packed) > COMPRESS_MIN_BYTES:
+                return _TAG_MSGPACK_ZLIB + zlib.compress(packed, COMPRESS_LEVEL)
+            return _TAG_MSGPACK + packed
+        except (TypeError, ValueError):
+            pass  # Not msgpack-compatible (e.g. dataclasses), fall back to pickle
+    
+    return _TAG_PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize(payload: bytes) -> Any:
+    """Reconstruct a value from a tagged byte payload"""
+    tag, body = payload[:1], payload[1:]
+    
+    if tag == _TAG_FLOAT16 or tag == _TAG_NDARRAY:
+        ndim = body[0]
+        shape = struct.unpack_from(f'<{ndim}I', body, 1)
+        offset = 1 + 4 * ndim
+        if tag == _TAG_FLOAT16:
+            return np.frombuffer(body, dtype=np.float16, offset=offset).astype(np.float32).reshape(shape)
+        return np.frombuffer(body, dtype=np.float32, offset=offset).reshape(shape)
+    # strict_map_key=False: non-str keys (e.g. {438: ...}) round-trip like they did with pickle
+    if tag == _TAG_MSGPACK:
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if tag == _TAG_MSGPACK_ZLIB:
+        return msgpack.unpackb(zlib.decompress(body), raw=False, strict_map_key=False)
+    if tag == _TAG_PICKLE:
+        return pickle.loads(body)
+    
+    raise ValueError(f"Unknown cache payload tag: {tag!r}")
+
 
 class RedisCache:
-    """Redis cache manager with TTL support"""
+    """Redis cache manager with TTL support and an in-process L1 for hot keys"""
+    
+    L1_MAX = 1024  # Max entries kept in the in-process L1 cache
+    L1_TTL = 60  # Max seconds an L1 entry lives (bounds staleness after another process deletes the key)
     
     def __init__(
         self,
@@ -21,7 +113,8 @@ class RedisCache:
         port: int = 6379,
         db: int = 0,
         password: Optional[str] = None,
-        decode_responses: bool = False  # False for binary data (pickled objects)
+        decode_responses: bool = False,  # False for binary (serialized) payloads
+        max_connections: int = 32
     ):
         """
         Initialize Redis cache
@@ -32,21 +125,34 @@ class RedisCache:
             db: Redis database number
             password: Redis password (optional)
             decode_responses: Whether to decode responses to strings
+            max_connections: Max connections in pool (callers block when exhausted)
         """
         self.host = host
         self.port = port
         self.db = db
         
+        # L1: key -> (expires_at, serialized payload), LRU-ordered; lock only guards dict ops.
+        # Holding the Redis payload (not the object) means an L1 hit decodes to the
+        # same value another process reads, and every hit gets its own copy.
+        self._l1: "OrderedDict[str, tuple]" = OrderedDict()
+        self._l1_lock = threading.Lock()
+        
         try:
-            self.client = redis.Redis(
+            # Bounded pool shared by all requests; blocks instead of opening
+            # ad-hoc connections when every connection is checked out
+            self.pool = redis.BlockingConnectionPool(
                 host=host,
                 port=port,
                 db=db,
                 password=password,
                 decode_responses=decode_responses,
+                max_connections=max_connections,
+                timeout=5,
                 socket_timeout=5,
-                socket_connect_timeout=5
+                socket_connect_timeout=5,
+                socket_keepalive=True
             )
+            self.client = redis.Redis(connection_pool=self.pool)
             
             # Test connection
             self.client.ping()
@@ -56,6 +162,7 @@ class RedisCache:
         except Exception as e:
             logger.warning(f"[WARN] Redis not available: {str(e)}")
             logger.warning("[WARN] Caching disabled, proceeding without cache")
+            self.pool = None
             self.client = None
             self.enabled = False
     
@@ -70,12 +177,34 @@ class RedisCache:
         Returns:
             Cache key
         """
-        hash_obj = hashlib.md5(data.encode('utf-8'))
-        return f"{prefix}:{hash_obj.hexdigest()}"
+        return _cache_key(prefix, data)
+    
+    def _l1_get(self, key: str) -> Optional[Any]:
+        """Look up key in the L1 cache and decode it (None if missing or expired)"""
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+        return _deserialize(payload)
+    
+    def _l1_put(self, key: str, payload: bytes, ttl: int) -> None:
+        """Store a serialized payload in the L1 cache, evicting the least recently used entry"""
+        with self._l1_lock:
+            self._l1[key] = (time.monotonic() + min(ttl, self.L1_TTL), payload)
+            self._l1.move_to_end(key)
+            if len(self._l1) > self.L1_MAX:
+                self._l1.popitem(last=False)
     
     def get(self, key: str) -> Optional[Any]:
         """
-        Get value from cache
+        Get value from cache (L1 first, then Redis)
+        
+        Each call returns a freshly decoded object, so callers may mutate it.
         
         Args:
             key: Cache key
@@ -86,11 +215,18 @@ class RedisCache:
         if not self.enabled:
             return None
         
+        value = self._l1_get(key)
+        if value is not None:
+            return value
+        
         try:
-            value = self.client.get(key)
-            if value:
-                # Unpickle the value
-                return pickle.loads(value)
+            raw = self.client.pipeline(transaction=False).get(key).ttl(key).execute()
+            payload, ttl = raw
+            if payload:
+                value = _deserialize(payload)
+                if ttl and ttl > 0:
+                    self._l1_put(key, payload, ttl)
+                return value
             return None
         except Exception as e:
             logger.debug(f"Cache get error: {str(e)}")
@@ -117,19 +253,85 @@ class RedisCache:
             return False
         
         try:
-            # Pickle the value
-            pickled_value = pickle.dumps(value)
-            self.client.setex(key, ttl, pickled_value)
+            payload = _serialize(value)
+            self.client.setex(key, ttl, payload)
+            self._l1_put(key, payload, ttl)
             return True
         except Exception as e:
             logger.debug(f"Cache set error: {str(e)}")
             return False
     
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get multiple values from cache in a single round-trip
+        
+        Args:
+            keys: List of cache keys
+            
+        Returns:
+            List of cached values (None for missing keys), in the same order as keys
+        """
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        
+        # Serve what we can from L1, fetch only the remainder from Redis
+        results = [self._l1_get(key) for key in keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        if not missing:
+            return results
+        
+        try:
+            values = self.client.mget([keys[i] for i in missing])
+            for i, value in zip(missing, values):
+                if value:
+                    results[i] = _deserialize(value)
+            return results
+        except Exception as e:
+            logger.debug(f"Cache mget error: {str(e)}")
+            return results
+    
+    def mset(
+        self,
+        items: Dict[str, Any],
+        ttl: int = 3600
+    ) -> bool:
+        """
+        Set multiple values in cache with TTL using a single pipelined round-trip
+        
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds (applied to every key)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled:
+            return False
+        
+        if not items:
+            return True
+        
+        try:
+            payloads = {key: _serialize(value) for key, value in items.items()}
+            pipe = self.client.pipeline(transaction=False)
+            for key, payload in payloads.items():
+                pipe.setex(key, ttl, payload)
+            pipe.execute()
+            for key, payload in payloads.items():
+                self._l1_put(key, payload, ttl)
+            return True
+        except Exception as e:
+            logger.debug(f"Cache mset error: {str(e)}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self.enabled:
             return False
         
+        with self._l1_lock:
+            self._l1.pop(key, None)
+        
         try:
             self.client.delete(key)
             return True
@@ -142,6 +344,9 @@ class RedisCache:
         if not self.enabled:
             return False
         
+        with self._l1_lock:
+            self._l1.clear()
+        
         try:
             self.client.flushdb()
             logger.info("[INFO] Cache cleared")
@@ -188,8 +393,148 @@ class RedisCache:
         return (hits / total) * 100
 
 
-# Global cache instance
+class AsyncRedisCache:
+    """
+    Async Redis cache manager for FastAPI request paths
+    
+    Mirrors RedisCache but uses redis.asyncio so cache I/O does not block the
+    event loop. Payload format and key scheme are shared with RedisCache.
+    """
+    
+    def __init__(
+        self,
+        host: str = 'localhost',
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_connections: int = 32
+    ):
+        """
+        Initialize async Redis cache (call connect() before use)
+        
+        Args:
+            host: Redis host
+            port: Redis port
+            db: Redis database number
+            password: Redis password (optional)
+            max_connections: Max connections in pool (callers wait when exhausted)
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.enabled = False
+        
+        self.pool = aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            max_connections=max_connections,
+            timeout=5,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+            socket_keepalive=True
+        )
+        self.client = aioredis.Redis(connection_pool=self.pool)
+    
+    async def connect(self) -> bool:
+        """
+        Test the connection and enable the cache if Redis is reachable
+        
+        Returns:
+            True if Redis is available, False otherwise
+        """
+        try:
+            await self.client.ping()
+            logger.info(f"[PASS] Async Redis cache connected: {self.host}:{self.port}")
+            self.enabled = True
+        except Exception as e:
+            logger.warning(f"[WARN] Redis not available: {str(e)}")
+            logger.warning("[WARN] Caching disabled, proceeding without cache")
+            self.enabled = False
+        return self.enabled
+    
+    def _generate_key(self, prefix: str, data: str) -> str:
+        """Generate cache key from prefix and data"""
+        return _cache_key(prefix, data)
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache (None if missing or cache disabled)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            value = await self.client.get(key)
+            if value:
+                return _deserialize(value)
+            return None
+        except Exception as e:
+            logger.debug(f"Cache get error: {str(e)}")
+            return None
+    
+    async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """Set value in cache with TTL"""
+        if not self.enabled:
+            return False
+        
+        try:
+            await self.client.setex(key, ttl, _serialize(value))
+            return True
+        except Exception as e:
+            logger.debug(f"Cache set error: {str(e)}")
+            return False
+    
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get multiple values from cache in a single round-trip"""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        
+        try:
+            values = await self.client.mget(keys)
+            return [_deserialize(value) if value else None for value in values]
+        except Exception as e:
+            logger.debug(f"Cache mget error: {str(e)}")
+            return [None] * len(keys)
+    
+    async def mset(self, items: Dict[str, Any], ttl: int = 3600) -> bool:
+        """Set multiple values with TTL using a single pipelined round-trip"""
+        if not self.enabled:
+            return False
+        
+        if not items:
+            return True
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, _serialize(value))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.debug(f"Cache mset error: {str(e)}")
+            return False
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        if not self.enabled:
+            return False
+        
+        try:
+            await self.client.delete(key)
+            return True
+        except Exception as e:
+            logger.debug(f"Cache delete error: {str(e)}")
+            return False
+    
+    async def close(self) -> None:
+        """Close the client and release pooled connections"""
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+
+# Global cache instances
 _cache_instance: Optional[RedisCache] = None
+_async_cache_instance: Optional[AsyncRedisCache] = None
 
 
 def get_cache(
@@ -218,6 +563,42 @@ def get_cache(
     return _cache_instance
 
 
+async def get_async_cache(
+    host: str = 'localhost',
+    port: int = 6379,
+    db: int = 0,
+    force_reload: bool = False
+) -> AsyncRedisCache:
+    """
+    Get or create the async Redis cache singleton
+    
+    Args:
+        host: Redis host
+        port: Redis port
+        db: Redis database number
+        force_reload: Force recreation of cache instance
+        
+    Returns:
+        Connected AsyncRedisCache instance (disabled if Redis is unreachable)
+    """
+    global _async_cache_instance
+    
+    if _async_cache_instance is None or force_reload:
+        _async_cache_instance = AsyncRedisCache(host=host, port=port, db=db)
+        await _async_cache_instance.connect()
+    
+    return _async_cache_instance
+
+
+async def close_async_cache() -> None:
+    """Close the async cache singleton (call on application shutdown)"""
+    global _async_cache_instance
+    
+    if _async_cache_instance is not None:
+        await _async_cache_instance.close()
+        _async_cache_instance = None
+
+
 # Cache key prefixes
 class CachePrefix:
     """Cache key prefixes for different data types"""
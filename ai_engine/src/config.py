@@ -3,6 +3,7 @@ Configuration module for AI Engine
 Loads environment variables and manages application settings
 """
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -20,6 +21,9 @@ class Settings(BaseSettings):
     
     # AI Model Configuration
     MODEL_NAME: str = os.getenv("MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_PRECISION: str = os.getenv("EMBEDDING_PRECISION", "fp32")  # fp32 | fp16 (CUDA) | bf16
+    EMBEDDING_USE_ONNX: bool = os.getenv("EMBEDDING_USE_ONNX", "False").lower() == "true"
+    EMBEDDING_DEVICE: str = os.getenv("EMBEDDING_DEVICE", "")  # cuda | cpu (empty = auto-detect)
     
     # Database Configuration
     # Use absolute path for ChromaDB to avoid issues when running from different directories
@@ -28,15 +32,37 @@ class Settings(BaseSettings):
         os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "chromadb")
     )
     CHROMA_COLLECTION_NAME: str = os.getenv("CHROMA_COLLECTION_NAME", "legal_documents")
+    # Optional Chroma server URL (e.g. http://localhost:8000); when set, clients use
+    # server mode instead of opening the local persistent store
+    CHROMA_HTTP_URL: str = os.getenv("CHROMA_HTTP_URL", "")
     
     # Neo4j Configuration
     NEO4J_URI: str = os.getenv("NEO4J_URI", "")
     NEO4J_USERNAME: str = os.getenv("NEO4J_USERNAME", "neo4j")
     NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "")
+    # Pool size should be >= uvicorn workers x per-request graph concurrency
+    NEO4J_POOL_SIZE: int = int(os.getenv("NEO4J_POOL_SIZE", "100"))
+    NEO4J_CONNECTION_TIMEOUT: float = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "30"))
+    NEO4J_ACQ_TIMEOUT: float = float(os.getenv("NEO4J_ACQ_TIMEOUT", "60"))
+    NEO4J_MAX_LIFETIME: float = float(os.getenv("NEO4J_MAX_LIFETIME", "3600"))
+    NEO4J_KEEP_ALIVE: bool = os.getenv("NEO4J_KEEP_ALIVE", "True").lower() == "true"
     
     # Internal API Security
     INTERNAL_API_KEY: str = os.getenv("INTERNAL_API_KEY", "")
     
+    # Concurrent single-query searches coalesced into one Chroma call (<= 1 disables)
+    RETRIEVAL_BATCH_SIZE: int = int(os.getenv("RETRIEVAL_BATCH_SIZE", "16"))
+    # Extra wait for more queries to join a batch (0 = only batch queries already waiting)
+    RETRIEVAL_BATCH_WINDOW_MS: float = float(os.getenv("RETRIEVAL_BATCH_WINDOW_MS", "0"))
+    
+    # Worker threads for blocking calls offloaded from async routes (0 = max(40, CPUs x 10))
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "0"))
+    
+    # Warm the Neo4j connection and ChromaDB embedder during startup
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "True").lower() == "true"
+    # Also load the Ollama model during warm-up (only worth it when requests set use_llm=True)
+    WARMUP_LLM: bool = os.getenv("WARMUP_LLM", "False").lower() == "true"
+    
     # Application Settings
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -47,5 +73,15 @@ class Settings(BaseSettings):
         extra = 'ignore'  # Allow extra env variables (for backward compatibility)
 
 
-# Create global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide Settings instance
+    
+    Settings are parsed and validated once; later calls return the cached object.
+    """
+    return Settings()
+
+
+# Global settings instance
+settings = get_settings()
@@ -2,6 +2,8 @@
 Sample Legal Documents for Development and Testing
 Contains hardcoded Indian legal provisions from IPC, CrPC, and Contract Act
 """
+import sys
+from collections import defaultdict
 
 # Sample legal documents with metadata
 SAMPLE_LEGAL_DOCUMENTS = [
@@ -125,13 +127,34 @@ This section establishes the principle of compensatory damages in contract law."
     }
 ]
 
+# Intern repeated metadata values (shared across docs) and store the corpus as a
+# tuple so it can't be resized. The document dicts themselves stay mutable (they
+# are pickled for the prep pool and handed to ChromaDB as metadata), so callers
+# must treat them as read-only
+_INTERNED_METADATA_KEYS = ('category', 'subcategory', 'act', 'chapter')
+for _doc in SAMPLE_LEGAL_DOCUMENTS:
+    _meta = _doc['metadata']
+    for _key in _INTERNED_METADATA_KEYS:
+        if isinstance(_meta.get(_key), str):
+            _meta[_key] = sys.intern(_meta[_key])
+del _doc, _meta, _key
+SAMPLE_LEGAL_DOCUMENTS = tuple(SAMPLE_LEGAL_DOCUMENTS)
+
+# Lookup indexes built once at import (category -> docs, act -> docs)
+_BY_CATEGORY = defaultdict(list)
+_BY_ACT = defaultdict(list)
+for _doc in SAMPLE_LEGAL_DOCUMENTS:
+    _BY_CATEGORY[_doc['metadata']['category']].append(_doc)
+    _BY_ACT[_doc['metadata']['act']].append(_doc)
+del _doc
+
 
 def get_sample_documents():
     """
     Get all sample legal documents
     
     Returns:
-        List of dictionaries containing legal documents with metadata
+        Tuple of dictionaries containing legal documents with metadata
     """
     return SAMPLE_LEGAL_DOCUMENTS
 
@@ -146,10 +169,8 @@ def get_documents_by_category(category: str):
     Returns:
         List of matching documents
     """
-    return [
-        doc for doc in SAMPLE_LEGAL_DOCUMENTS 
-        if doc['metadata']['category'] == category
-    ]
+    # Copy so callers can't mutate the shared index
+    return list(_BY_CATEGORY.get(category, ()))
 
 
 def get_documents_by_act(act: str):
@@ -162,7 +183,4 @@ def get_documents_by_act(act: str):
     Returns:
         List of matching documents
     """
-    return [
-        doc for doc in SAMPLE_LEGAL_DOCUMENTS 
-        if doc['metadata']['act'] == act
-    ]
+    return list(_BY_ACT.get(act, ()))
@@ -1,6 +1,6 @@
 """
 Embeddings module for text-to-vector conversion
 """
-from .embedder import Embedder, get_embedder
+from .embedder import Embedder, get_embedder, warm
 
-__all__ = ["Embedder", "get_embedder"]
+__all__ = ["Embedder", "get_embedder", "warm"]
@@ -3,12 +3,30 @@ Text Embedder for Legal Documents
 Converts text to vector embeddings using sentence-transformers
 """
 from sentence_transformers import SentenceTransformer
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Tuple
 import numpy as np
 import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.fast_rank import dot_scores, dot_scores_int8
 
 logger = logging.getLogger(__name__)
 
+# Document count above which preprocessing is spread over a thread pool
+PARALLEL_PREPROCESS_THRESHOLD = 256
+
+# On-disk home of exported ONNX models (see _load_onnx)
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "legal_embeds")
+)
+
+# Runs of whitespace collapsed by preprocess_legal_text
+_WS_RE = re.compile(r'\s+')
+
 
 class Embedder:
     """
@@ -19,7 +37,10 @@ class Embedder:
     def __init__(
         self,
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        precision: str = "fp32",
+        use_onnx: bool = False,
+        onnx_int8: bool = False
     ):
         """
         Initialize the embedder with a sentence-transformer model
@@ -27,11 +48,29 @@ class Embedder:
         Args:
             model_name: Name of the sentence-transformer model to use
             device: Device to run the model on ('cuda', 'cpu', or None for auto-detect)
+            precision: Inference precision - 'fp32', 'fp16' (CUDA only) or 'bf16'
+            use_onnx: Run inference through an ONNX Runtime export (requires optimum[onnxruntime])
+            onnx_int8: Dynamically quantize the ONNX export to int8 (AVX512-VNNI config)
         """
+        if precision not in ('fp32', 'fp16', 'bf16'):
+            raise ValueError(f"Unsupported precision: {precision}")
+        
         self.model_name = model_name
         self.device = device
+        self.precision = precision
+        self.use_onnx = use_onnx
+        self.onnx_int8 = onnx_int8
         self.model = None
+        self.ort_model = None  # ONNX Runtime model, set by load_model when use_onnx
+        self._onnx_pooling = None  # 'mean' / 'cls' / 'max', read from the model's Pooling module
+        self._onnx_normalize = False  # Whether the model ends in a Normalize module
+        self.active_precision = 'fp32'  # Precision the weights actually run in
         self.embedding_dimension = None
+        self.max_seq_length = None
+        self.device_name = None
+        self.tokenizer = None
+        self._max_chars = None  # Fallback truncation limit, set once the model is loaded
+        self._max_tokens = None
         
         logger.info(f"Embedder initialized with model: {model_name}")
     
@@ -42,20 +81,193 @@ class Embedder:
         try:
             logger.info(f"Loading model: {self.model_name}...")
             self.model = SentenceTransformer(self.model_name, device=self.device)
+            self._apply_precision()
             self.embedding_dimension = self.model.get_sentence_embedding_dimension()
+            self.tokenizer = getattr(self.model, 'tokenizer', None)
+            self.max_seq_length = self.model.max_seq_length
+            self.device_name = str(self.model.device)
+            # Leave room for the [CLS]/[SEP] tokens the model adds itself
+            self._max_tokens = max(self.max_seq_length - 2, 1)
+            # Rough estimate: 4 chars per token (used if the tokenizer has no offsets)
+            self._max_chars = self.max_seq_length * 4
+            if self.use_onnx:
+                self._load_onnx()
             logger.info(f"✅ Model loaded successfully")
             logger.info(f"📊 Embedding dimension: {self.embedding_dimension}")
         except Exception as e:
             logger.error(f"❌ Failed to load model: {str(e)}")
             raise
     
+    def _apply_precision(self) -> None:
+        """
+        Cast model weights to the requested half-precision format
+        """
+        if self.precision == 'fp32':
+            return
+        
+        import torch
+        
+        if self.precision == 'fp16':
+            if self.model.device.type != 'cuda':
+                logger.warning("⚠️ fp16 inference needs CUDA, keeping fp32 weights")
+                return
+            self.model = self.model.half()
+            self.active_precision = 'fp16'
+        else:
+            if not self._bf16_supported():
+                logger.warning(f"⚠️ bf16 inference not supported on {self.model.device.type}, keeping fp32 weights")
+                return
+            self.model = self.model.to(torch.bfloat16)
+            self.active_precision = 'bf16'
+        
+        # Opted into reduced precision: also allow TF32 matmuls for the remaining
+        # fp32 ops (process-wide torch setting, so never applied for fp32)
+        torch.set_float32_matmul_precision('high')
+        
+        logger.info(f"📊 Inference precision: {self.precision}")
+    
+    def _bf16_supported(self) -> bool:
+        """Whether the model's device runs bf16 natively (CPU needs AVX512-BF16/AMX, else it's emulated)"""
+        import torch
+        
+        if self.model.device.type == 'cuda':
+            return torch.cuda.is_bf16_supported()
+        try:
+            return torch.ops.mkldnn._is_mkldnn_bf16_supported()
+        except (AttributeError, RuntimeError):
+            return False
+    
+    @property
+    def backend(self) -> str:
+        """Inference backend and precision, e.g. 'torch-fp32', 'torch-fp16' or 'onnx-int8'"""
+        if self.ort_model is not None:
+            return 'onnx-int8' if self.onnx_int8 else 'onnx'
+        return f"torch-{self.active_precision}"
+    
+    def _onnx_head(self) -> Optional[Tuple[str, bool]]:
+        """
+        Pooling mode and trailing normalization of the SentenceTransformer pipeline
+        
+        Returns:
+            Tuple of (pooling mode, normalize), or None if the modules after the
+            transformer are not a single cls/mean/max Pooling optionally followed
+            by Normalize (the only heads _encode_onnx reproduces)
+        """
+        from sentence_transformers.models import Normalize, Pooling, Transformer
+        
+        pooling, normalize = None, False
+        for module in self.model:
+            if isinstance(module, Transformer):
+                continue
+            if isinstance(module, Pooling) and pooling is None:
+                modes = [mode for mode, enabled in (
+                    ('cls', module.pooling_mode_cls_token),
+                    ('mean', module.pooling_mode_mean_tokens),
+                    ('max', module.pooling_mode_max_tokens),
+                ) if enabled]
+                other = any(getattr(module, name, False) for name in (
+                    'pooling_mode_mean_sqrt_len_tokens',
+                    'pooling_mode_weightedmean_tokens',
+                    'pooling_mode_lasttoken'
+                ))
+                if len(modes) != 1 or other:
+                    return None
+                pooling = modes[0]
+            elif isinstance(module, Normalize):
+                normalize = True
+            else:
+                return None
+        return (pooling, normalize) if pooling else None
+    
+    def _load_onnx(self) -> None:
+        """
+        Export (once, cached on disk) and load an ONNX Runtime version of the model
+        
+        Pooling and normalization are taken from the SentenceTransformer modules,
+        so ONNX embeddings match PyTorch ones. Once the ONNX model is loaded the
+        PyTorch model is released.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+        except ImportError:
+            logger.warning("⚠️ optimum[onnxruntime] not installed, using PyTorch inference")
+            return
+        
+        head = self._onnx_head()
+        if head is None:
+            logger.warning(f"⚠️ {self.model_name} has a pooling head ONNX inference can't reproduce, using PyTorch inference")
+            return
+        
+        export_dir = os.path.join(EMBEDDING_CACHE_DIR, "onnx", self.model_name.replace('/', '__'))
+        if os.path.exists(os.path.join(export_dir, "model.onnx")):
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(export_dir)
+        else:
+            logger.info(f"Exporting {self.model_name} to ONNX...")
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+            ort_model.save_pretrained(export_dir)
+        
+        if self.onnx_int8:
+            quantized_file = os.path.join(export_dir, "model_quantized.onnx")
+            if not os.path.exists(quantized_file):
+                from optimum.onnxruntime import ORTQuantizer
+                from optimum.onnxruntime.configuration import AutoQuantizationConfig
+                
+                quantizer = ORTQuantizer.from_pretrained(ort_model)
+                qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+                quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(
+                export_dir, file_name="model_quantized.onnx"
+            )
+        
+        self.ort_model = ort_model
+        self._onnx_pooling, self._onnx_normalize = head
+        self.device_name = 'onnxruntime'
+        # Every encode now goes through ONNX Runtime; don't keep the PyTorch weights resident
+        self.model = None
+        logger.info(f"📊 ONNX Runtime inference enabled (int8: {self.onnx_int8})")
+    
+    def _encode_onnx(
+        self,
+        texts: List[str],
+        batch_size: int,
+        normalize_embeddings: bool
+    ) -> np.ndarray:
+        """
+        Encode texts with the ONNX Runtime model, pooling and normalizing like
+        the model's SentenceTransformer modules
+        """
+        pooled = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            hidden = np.asarray(self.ort_model(**inputs).last_hidden_state, dtype=np.float32)
+            mask = inputs['attention_mask'][..., None].astype(np.float32)
+            if self._onnx_pooling == 'cls':
+                pooled.append(hidden[:, 0])
+            elif self._onnx_pooling == 'max':
+                pooled.append(np.where(mask > 0, hidden, -1e9).max(axis=1))
+            else:
+                pooled.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        embeddings = np.concatenate(pooled)
+        # A Normalize module makes SentenceTransformer output unit vectors regardless of the flag
+        if normalize_embeddings or self._onnx_normalize:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+    
     def encode(
         self,
         texts: Union[str, List[str]],
         batch_size: int = 32,
         show_progress_bar: bool = False,
-        normalize_embeddings: bool = True
-    ) -> np.ndarray:
+        normalize_embeddings: bool = True,
+        dtype: str = 'float32'
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
         """
         Convert text(s) to vector embeddings
         
@@ -64,11 +276,17 @@ class Embedder:
             batch_size: Batch size for encoding
             show_progress_bar: Whether to show progress bar during encoding
             normalize_embeddings: Whether to normalize embeddings to unit length
+            dtype: Output precision - 'float32', 'float16', or 'int8'
+                   (symmetric per-row quantization)
             
         Returns:
-            numpy array of embeddings (shape: [num_texts, embedding_dim])
+            numpy array of embeddings (shape: [num_texts, embedding_dim]),
+            or a (int8 embeddings, per-row scales) tuple when dtype='int8'
         """
-        if not self.model:
+        if dtype not in ('float32', 'float16', 'int8'):
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        
+        if self.model is None and self.ort_model is None:
             raise RuntimeError("Model not loaded. Call load_model() first.")
         
         # Convert single string to list
@@ -76,15 +294,27 @@ class Embedder:
             texts = [texts]
         
         try:
-            embeddings = self.model.encode(
-                texts,
-                batch_size=batch_size,
-                show_progress_bar=show_progress_bar,
-                normalize_embeddings=normalize_embeddings,
-                convert_to_numpy=True
-            )
+            if self.ort_model is not None:
+                embeddings = self._encode_onnx(texts, batch_size, normalize_embeddings)
+            else:
+                embeddings = self.model.encode(
+                    texts,
+                    batch_size=batch_size,
+                    show_progress_bar=show_progress_bar,
+                    normalize_embeddings=normalize_embeddings,
+                    convert_to_numpy=True
+                )
+            if embeddings.dtype != np.float32:
+                # Half-precision models return fp16/bf16-derived arrays
+                embeddings = embeddings.astype(np.float32)
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Encoded %d text(s) to embeddings", len(texts))
             
-            logger.info(f"✅ Encoded {len(texts)} text(s) to embeddings")
+            if dtype == 'float16':
+                return embeddings.astype(np.float16)
+            if dtype == 'int8':
+                return self.quantize_int8(embeddings)
             return embeddings
             
         except Exception as e:
@@ -106,13 +336,29 @@ class Embedder:
         Returns:
             1D numpy array of embedding
         """
-        embeddings = self.encode(
-            texts=[text],
-            batch_size=1,
-            show_progress_bar=False,
-            normalize_embeddings=normalize_embeddings
-        )
-        return embeddings[0]
+        if self.model is None and self.ort_model is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+        
+        if self.ort_model is not None:
+            return self._encode_onnx([text], 1, normalize_embeddings)[0]
+        
+        # Hot single-query path: pass the bare string so SentenceTransformer
+        # returns the 1D vector directly (no list wrap / row unwrap)
+        try:
+            embedding = self.model.encode(
+                text,
+                batch_size=1,
+                show_progress_bar=False,
+                normalize_embeddings=normalize_embeddings,
+                convert_to_numpy=True
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to encode text: {str(e)}")
+            raise
+        
+        if embedding.dtype != np.float32:
+            embedding = embedding.astype(np.float32)
+        return embedding
     
     def encode_batch(
         self,
@@ -140,6 +386,23 @@ class Embedder:
             normalize_embeddings=normalize_embeddings
         )
     
+    @staticmethod
+    def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Symmetric per-row int8 quantization of float embeddings
+        
+        Args:
+            embeddings: 2D float array (shape: [num_texts, embedding_dim])
+            
+        Returns:
+            Tuple of (int8 embeddings, float32 per-row scales); the original
+            rows are approximately ``q * scale[:, None]``
+        """
+        scale = np.abs(embeddings).max(axis=1, keepdims=True) / 127.0
+        scale[scale == 0] = 1.0
+        q = np.round(embeddings / scale).astype(np.int8)
+        return q, scale.squeeze(axis=1).astype(np.float32)
+    
     def similarity(
         self,
         embedding1: np.ndarray,
@@ -155,17 +418,73 @@ class Embedder:
         Returns:
             Cosine similarity score (0 to 1)
         """
-        # Normalize if not already normalized
-        norm1 = np.linalg.norm(embedding1)
-        norm2 = np.linalg.norm(embedding2)
+        # Upcast quantized (int8/float16) vectors; per-row scales cancel out in cosine
+        if embedding1.dtype != np.float32:
+            embedding1 = embedding1.astype(np.float32)
+        if embedding2.dtype != np.float32:
+            embedding2 = embedding2.astype(np.float32)
         
-        if norm1 > 0:
-            embedding1 = embedding1 / norm1
-        if norm2 > 0:
-            embedding2 = embedding2 / norm2
+        # Single pass: dot / (|a| * |b|), without materializing normalized copies
+        norms = float(np.linalg.norm(embedding1)) * float(np.linalg.norm(embedding2))
+        if norms == 0.0:
+            return 0.0
+        return float(np.dot(embedding1, embedding2)) / norms
+    
+    @staticmethod
+    def similarity_prenorm(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
+        """
+        Cosine similarity for embeddings already normalized to unit length
+        (the default output of encode())
         
-        similarity = np.dot(embedding1, embedding2)
-        return float(similarity)
+        Args:
+            embedding1: First unit-length embedding vector
+            embedding2: Second unit-length embedding vector
+            
+        Returns:
+            Cosine similarity score
+        """
+        return float(embedding1 @ embedding2)
+    
+    @staticmethod
+    def similarity_batch(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of one query against many embeddings in a single gemv
+        
+        Args:
+            query: Query embedding (shape: [embedding_dim])
+            matrix: Candidate embeddings (shape: [num_docs, embedding_dim])
+            
+        Returns:
+            1D array of similarity scores (shape: [num_docs])
+        """
+        scores = matrix @ query
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        return np.divide(scores, norms, out=np.zeros_like(scores, dtype=np.float32), where=norms > 0)
+    
+    @staticmethod
+    def rank(
+        query: Union[np.ndarray, Tuple[np.ndarray, np.ndarray]],
+        matrix: Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Score a query against a corpus of normalized embeddings
+        
+        Args:
+            query: Float query embedding, or an (int8 embedding, scale) pair
+                   as returned by encode(..., dtype='int8')
+            matrix: Float corpus embeddings, or an (int8 embeddings, row scales) pair
+            
+        Returns:
+            1D array of similarity scores (shape: [num_docs])
+        """
+        if isinstance(query, tuple) and isinstance(matrix, tuple):
+            q, q_scale = query
+            return dot_scores_int8(
+                np.ravel(q), float(np.ravel(q_scale)[0]), matrix[0], matrix[1]
+            )
+        if isinstance(query, tuple) or isinstance(matrix, tuple):
+            raise ValueError("rank() needs both query and matrix quantized, or neither")
+        return dot_scores(np.ravel(query), matrix)
     
     def get_model_info(self) -> dict:
         """
@@ -174,7 +493,7 @@ class Embedder:
         Returns:
             Dictionary with model information
         """
-        if not self.model:
+        if self.model is None and self.ort_model is None:
             return {
                 'model_name': self.model_name,
                 'loaded': False
@@ -184,8 +503,9 @@ class Embedder:
             'model_name': self.model_name,
             'loaded': True,
             'embedding_dimension': self.embedding_dimension,
-            'device': str(self.model.device),
-            'max_seq_length': self.model.max_seq_length
+            'device': self.device_name,
+            'max_seq_length': self.max_seq_length,
+            'backend': self.backend
         }
     
     def preprocess_legal_text(self, text: str) -> str:
@@ -199,17 +519,56 @@ class Embedder:
             Preprocessed text
         """
         # Remove excessive whitespace
-        text = ' '.join(text.split())
+        text = _WS_RE.sub(' ', text).strip()
         
-        # Truncate if too long (model has max sequence length)
-        if self.model and len(text) > self.model.max_seq_length * 4:
-            # Rough estimate: 4 chars per token
-            max_chars = self.model.max_seq_length * 4
+        # Truncate at the model's real token limit so no compute is spent on
+        # tokens the transformer would drop anyway
+        if self.tokenizer is not None:
+            truncated = self._truncate_to_tokens(text)
+            if truncated is not None:
+                if len(truncated) < len(text):
+                    text = truncated
+                    logger.warning("Text truncated to %d tokens", self._max_tokens)
+                return text
+        
+        # Fallback: character heuristic
+        max_chars = self._max_chars
+        if max_chars and len(text) > max_chars:
             text = text[:max_chars]
-            logger.warning(f"Text truncated to {max_chars} characters")
+            logger.warning("Text truncated to %d characters", max_chars)
         
         return text
     
+    def _truncate_to_tokens(self, text: str) -> Optional[str]:
+        """
+        Cut text at the character offset of the last token that fits the model
+        
+        Args:
+            text: Whitespace-normalized text
+            
+        Returns:
+            The (possibly shortened) original text, or None if the tokenizer
+            cannot report character offsets
+        """
+        try:
+            encoding = self.tokenizer(
+                text,
+                add_special_tokens=False,
+                truncation=True,
+                max_length=self._max_tokens,
+                return_offsets_mapping=True
+            )
+        except (NotImplementedError, TypeError, ValueError):
+            # Slow (pure-Python) tokenizers don't support offset mapping
+            return None
+        
+        offsets = encoding.get('offset_mapping')
+        if not offsets or len(offsets) < self._max_tokens:
+            return text
+        # Slice the original string rather than decoding ids, which would
+        # lowercase / re-space text for uncased tokenizers
+        return text[:offsets[-1][1]]
+    
     def embed_legal_documents(
         self,
         documents: List[str],
@@ -230,7 +589,12 @@ class Embedder:
             2D numpy array of embeddings
         """
         if preprocess:
-            documents = [self.preprocess_legal_text(doc) for doc in documents]
+            if len(documents) >= PARALLEL_PREPROCESS_THRESHOLD:
+                # The fast (Rust) tokenizer used for truncation releases the GIL
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    documents = list(pool.map(self.preprocess_legal_text, documents))
+            else:
+                documents = [self.preprocess_legal_text(doc) for doc in documents]
         
         return self.encode_batch(
             texts=documents,
@@ -241,28 +605,73 @@ class Embedder:
 
 # Singleton instance for global access
 _embedder_instance: Optional[Embedder] = None
+_embedder_lock = threading.Lock()
+
+
+def _reset_embedder_after_fork() -> None:
+    """Drop the inherited instance (and its CUDA handles) in forked workers"""
+    global _embedder_instance, _embedder_lock
+    _embedder_instance = None
+    _embedder_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_embedder_after_fork)
 
 
 def get_embedder(
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
     device: Optional[str] = None,
-    force_reload: bool = False
+    force_reload: bool = False,
+    precision: str = "fp32",
+    use_onnx: bool = False
 ) -> Embedder:
     """
-    Get or create a singleton Embedder instance
+    Get or create a singleton Embedder instance (thread-safe)
     
     Args:
         model_name: Name of the sentence-transformer model
         device: Device to run the model on
         force_reload: Force reload the model even if already loaded
+        precision: Inference precision ('fp32', 'fp16' or 'bf16')
+        use_onnx: Run inference through ONNX Runtime
         
     Returns:
         Embedder instance
     """
     global _embedder_instance
     
-    if _embedder_instance is None or force_reload:
-        _embedder_instance = Embedder(model_name=model_name, device=device)
-        _embedder_instance.load_model()
+    # Fast path: no locking once the model is loaded
+    instance = _embedder_instance
+    if instance is not None and not force_reload:
+        return instance
+    
+    with _embedder_lock:
+        # Re-check: another thread may have loaded the model while we waited
+        if _embedder_instance is None or force_reload:
+            instance = Embedder(
+                model_name=model_name,
+                device=device,
+                precision=precision,
+                use_onnx=use_onnx
+            )
+            instance.load_model()
+            _embedder_instance = instance
     
     return _embedder_instance
+
+
+def warm(**kwargs) -> Embedder:
+    """
+    Load the singleton embedder and run one dummy encode, so model loading and
+    first-call kernel setup happen at process start instead of on the first request
+    
+    Args:
+        **kwargs: Forwarded to get_embedder()
+        
+    Returns:
+        Embedder instance
+    """
+    embedder = get_embedder(**kwargs)
+    embedder.encode_single("warm up")
+    return embedder
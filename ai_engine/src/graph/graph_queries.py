@@ -1,93 +1,194 @@
 """
 Graph Queries - Legal-specific graph query logic with optimized Cypher patterns
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Section number references, e.g. "section 302", "s.302", "s 438"
+_SECTION_RE = re.compile(r'section\s+(\d+)|s\.?\s*(\d+)')
 
-def fetch_legal_graph_facts(
-    question: str,
-    neo4j_client
-) -> List[Dict[str, Any]]:
+# Legal keywords -> the triggers they imply. "anticipatory bail" also implies the
+# plain "bail" concept, since the alternation below never reports overlapping hits.
+_KEYWORD_TRIGGERS = {
+    'anticipatory bail': ('s438', 'bail'),
+    'section 438': ('s438',),
+    's.438': ('s438',),
+    's 438': ('s438',),
+    'bail': ('bail',),
+    'murder': ('murder',),
+    'cheating': ('cheating',),
+}
+
+# Single-pass matcher over all keywords (longest first so phrases win over sub-words)
+_KEYWORD_RE = re.compile(
+    '|'.join(map(re.escape, sorted(_KEYWORD_TRIGGERS, key=len, reverse=True)))
+)
+
+# Graph intent keywords, one named group per intent bucket
+_INTENT_RE = re.compile(
+    r'(?P<case_law>case|judgment|precedent|ruling)'
+    r'|(?P<amendment>amendment|changed|modified|updated)'
+    r'|(?P<relationship>related|similar|connected|reference)'
+)
+_INTENT_PRIORITY = ('case_law', 'amendment', 'relationship')
+
+# Legal concept -> section it maps to (extensible)
+_CONCEPT_SECTIONS = {
+    'bail': '438',  # Map to Section 438
+    'murder': '302',  # Map to Section 302
+    'cheating': '420',  # Map to Section 420
+}
+
+
+def _plan_graph_lookup(question: str) -> Tuple[Set[str], Optional[str], List[str]]:
     """
-    Fetch relevant legal relationships from Neo4j based on question
-    
-    Uses optimized, indexed queries for common legal patterns.
+    Work out which sections a question needs from the graph
     
     Args:
         question: User's legal question
-        neo4j_client: Neo4jClient instance
         
     Returns:
-        List of graph facts (cases, sections, relationships)
+        Tuple of (keyword triggers hit, explicit section number or None,
+        de-duplicated list of sections to fetch)
     """
-    if not neo4j_client:
-        logger.debug("Neo4j client not available, skipping graph enrichment")
-        return []
-    
     question_lower = question.lower()
+    
+    # Scan the question once for every known legal keyword
+    hits = set()
+    for match in _KEYWORD_RE.finditer(question_lower):
+        hits.update(_KEYWORD_TRIGGERS[match.group(0)])
+    
+    section_num = extract_section_number(question_lower, already_lower=True)
+    
+    targets = []
+    if 's438' in hits:
+        targets.append("438")
+    if section_num:
+        targets.append(section_num)
+    targets.extend(section for concept, section in _CONCEPT_SECTIONS.items() if concept in hits)
+    
+    return hits, section_num, list(dict.fromkeys(targets))
+
+
+def _assemble_graph_facts(
+    hits: Set[str],
+    section_num: Optional[str],
+    bundle: Dict[str, Dict[str, List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """
+    Turn a section bundle into the ordered, de-duplicated list of graph facts
+    
+    Args:
+        hits: Keyword triggers from _plan_graph_lookup
+        section_num: Explicit section number from _plan_graph_lookup
+        bundle: Result of fetch_section_bundle for the planned sections
+        
+    Returns:
+        List of graph facts (cases, sections, relationships)
+    """
     graph_facts = []
+    seen_sections = set()  # Sections already covered by graph_facts
+    citations = {section: entry["cases"] for section, entry in bundle.items()}
     
     # Pattern 1: Anticipatory Bail / Section 438
-    if any(term in question_lower for term in ['anticipatory bail', 'section 438', 's.438', 's 438']):
+    if 's438' in hits:
         logger.info("Detected Section 438 query, fetching graph relationships")
         
         # Optimized query using indexed Section.number
-        facts = neo4j_client.find_case_citations("438")
+        facts = citations.get("438")
         if facts:
             graph_facts.extend(facts)
-            logger.info(f"Found {len(facts)} case citations for Section 438")
+            seen_sections.update(f.get('section', '') for f in facts)
+            logger.info("Found %d case citations for Section 438", len(facts))
         
         # Also get related sections
-        related = neo4j_client.find_related_provisions("438")
+        related = bundle["438"]["related"]
         if related:
             graph_facts.extend(related)
+            seen_sections.update(f.get('section', '') for f in related)
     
     # Pattern 2: Section number detection (e.g., "section 302", "s.302")
-    section_pattern = r'section\s+(\d+)|s\.?\s*(\d+)'
-    section_match = re.search(section_pattern, question_lower)
-    
-    if section_match:
-        section_num = section_match.group(1) or section_match.group(2)
-        logger.info(f"Detected section number: {section_num}")
+    if section_num:
+        logger.info("Detected section number: %s", section_num)
         
         # Fetch relationships for this section
-        facts = neo4j_client.find_case_citations(section_num)
+        facts = citations.get(section_num)
         if facts:
             graph_facts.extend(facts)
-            logger.info(f"Found {len(facts)} case citations for Section {section_num}")
-    
-    # Pattern 3: Specific legal concepts (extensible)
-    concept_queries = {
-        'bail': '438',  # Map to Section 438
-        'murder': '302',  # Map to Section 302
-        'cheating': '420',  # Map to Section 420
-    }
-    
-    for concept, section in concept_queries.items():
-        if concept in question_lower and section not in [f.get('section', '') for f in graph_facts]:
-            facts = neo4j_client.find_case_citations(section)
+            seen_sections.update(f.get('section', '') for f in facts)
+            logger.info("Found %d case citations for Section %s", len(facts), section_num)
+    
+    # Pattern 3: Specific legal concepts
+    for concept, section in _CONCEPT_SECTIONS.items():
+        if concept in hits and section not in seen_sections:
+            facts = citations.get(section)
             if facts:
                 graph_facts.extend(facts)
-                logger.info(f"Found {len(facts)} facts for concept '{concept}' (Section {section})")
-    
-    # Remove duplicates (by case_name + section)
-    unique_facts = []
-    seen = set()
+                seen_sections.update(f.get('section', '') for f in facts)
+                logger.info("Found %d facts for concept '%s' (Section %s)", len(facts), concept, section)
     
+    # Remove duplicates (by case_name + section), keeping first-seen order
+    unique = {}
     for fact in graph_facts:
-        identifier = f"{fact.get('case_name', '')}_{fact.get('section', '')}"
-        if identifier not in seen:
-            unique_facts.append(fact)
-            seen.add(identifier)
+        unique.setdefault((fact.get('case_name', ''), fact.get('section', '')), fact)
+    unique_facts = list(unique.values())
     
-    logger.info(f"Returning {len(unique_facts)} unique graph facts")
+    logger.info("Returning %d unique graph facts", len(unique_facts))
     return unique_facts
 
 
+def fetch_legal_graph_facts(
+    question: str,
+    neo4j_client
+) -> List[Dict[str, Any]]:
+    """
+    Fetch relevant legal relationships from Neo4j based on question
+    
+    Uses optimized, indexed queries for common legal patterns; every section the
+    question needs is fetched in a single round trip.
+    
+    Args:
+        question: User's legal question
+        neo4j_client: Neo4jClient instance
+        
+    Returns:
+        List of graph facts (cases, sections, relationships)
+    """
+    if not neo4j_client:
+        logger.debug("Neo4j client not available, skipping graph enrichment")
+        return []
+    
+    hits, section_num, targets = _plan_graph_lookup(question)
+    bundle = neo4j_client.fetch_section_bundle(targets, include_related='s438' in hits)
+    return _assemble_graph_facts(hits, section_num, bundle)
+
+
+async def afetch_legal_graph_facts(
+    question: str,
+    neo4j_client
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_legal_graph_facts
+    
+    Args:
+        question: User's legal question
+        neo4j_client: AsyncNeo4jClient instance
+        
+    Returns:
+        List of graph facts (cases, sections, relationships)
+    """
+    if not neo4j_client:
+        logger.debug("Neo4j client not available, skipping graph enrichment")
+        return []
+    
+    hits, section_num, targets = _plan_graph_lookup(question)
+    bundle = await neo4j_client.fetch_section_bundle(targets, include_related='s438' in hits)
+    return _assemble_graph_facts(hits, section_num, bundle)
+
+
 def build_graph_context(graph_data: List[Dict[str, Any]]) -> str:
     """
     Convert graph facts into formatted context text for LLM
@@ -101,7 +202,7 @@ def build_graph_context(graph_data: List[Dict[str, Any]]) -> str:
     if not graph_data:
         return ""
     
-    context = "\n\n--- Legal References from Knowledge Graph ---\n"
+    parts = ["\n\n--- Legal References from Knowledge Graph ---\n"]
     
     # Group by type
     cases = []
@@ -115,7 +216,7 @@ def build_graph_context(graph_data: List[Dict[str, Any]]) -> str:
     
     # Format case citations
     if cases:
-        context += "\n**Case Law Citations:**\n"
+        parts.append("\n**Case Law Citations:**\n")
         for case in cases[:5]:  # Limit to top 5
             case_name = case.get('case_name', 'Unknown Case')
             case_year = case.get('case_year', '')
@@ -132,11 +233,11 @@ def build_graph_context(graph_data: List[Dict[str, Any]]) -> str:
             if act:
                 citation += f" of {act}"
             
-            context += citation + "\n"
+            parts.append(citation + "\n")
     
     # Format related provisions
     if related_sections:
-        context += "\n**Related Provisions:**\n"
+        parts.append("\n**Related Provisions:**\n")
         for rel in related_sections[:3]:  # Limit to top 3
             rel_section = rel.get('related_section', '')
             rel_title = rel.get('related_title', '')
@@ -150,27 +251,27 @@ def build_graph_context(graph_data: List[Dict[str, Any]]) -> str:
                 relation += f" of {act}"
             relation += f" - {relationship}"
             
-            context += relation + "\n"
+            parts.append(relation + "\n")
     
-    context += "---\n"
+    parts.append("---\n")
     
-    return context
+    return ''.join(parts)
 
 
 # Helper functions for specific graph patterns
 
-def extract_section_number(text: str) -> Optional[str]:
+def extract_section_number(text: str, *, already_lower: bool = False) -> Optional[str]:
     """
     Extract section number from text
     
     Args:
         text: Input text
+        already_lower: Skip lowercasing when the caller already has a lowered copy
         
     Returns:
         Section number or None
     """
-    pattern = r'section\s+(\d+)|s\.?\s*(\d+)'
-    match = re.search(pattern, text.lower())
+    match = _SECTION_RE.search(text if already_lower else text.lower())
     
     if match:
         return match.group(1) or match.group(2)
@@ -178,23 +279,21 @@ def extract_section_number(text: str) -> Optional[str]:
     return None
 
 
-def detect_legal_intent(question: str) -> str:
+def detect_legal_intent(question: str, *, already_lower: bool = False) -> str:
     """
     Detect if question is asking for graph-relevant information
     
     Args:
         question: User's question
+        already_lower: Skip lowercasing when the caller already has a lowered copy
         
     Returns:
         Intent type: 'case_law', 'amendment', 'relationship', 'none'
     """
-    q_lower = question.lower()
-    
-    if any(term in q_lower for term in ['case', 'judgment', 'precedent', 'ruling']):
-        return 'case_law'
-    elif any(term in q_lower for term in ['amendment', 'changed', 'modified', 'updated']):
-        return 'amendment'
-    elif any(term in q_lower for term in ['related', 'similar', 'connected', 'reference']):
-        return 'relationship'
-    else:
-        return 'none'
+    found = {match.lastgroup for match in _INTENT_RE.finditer(question if already_lower else question.lower())}
+    
+    # One scan; buckets keep their original precedence regardless of position
+    for intent in _INTENT_PRIORITY:
+        if intent in found:
+            return intent
+    return 'none'
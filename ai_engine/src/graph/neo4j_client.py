@@ -2,10 +2,17 @@
 Neo4j Client - Optimized for Legal Knowledge Graph
 Features: Connection pooling, singleton pattern, parameterized queries, session management
 """
-from neo4j import GraphDatabase, Session
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Tuple
+import atexit
+import copy
+import hashlib
+import json
 import logging
 import os
+import threading
+import time
 
 # Import settings for env variables
 try:
@@ -14,9 +21,80 @@ try:
 except ImportError:
     HAS_SETTINGS = False
 
+# The driver is imported on first client construction, so deployments without
+# Neo4j credentials never pay for loading it
+if TYPE_CHECKING:
+    from neo4j import Session, SummaryCounters
+
 logger = logging.getLogger(__name__)
 
 
+# Citations + related provisions for a list of sections (see fetch_section_bundle)
+SECTION_BUNDLE_QUERY = """
+UNWIND $section_numbers AS sn
+CALL {
+    WITH sn
+    MATCH (c:Case)-[:INTERPRETS]->(s:Section {number: sn})
+    WHERE $include_cases
+    OPTIONAL MATCH (s)-[:PART_OF]->(a:Act)
+    WITH c, s, a
+    ORDER BY c.year DESC
+    LIMIT 20
+    RETURN collect({
+        case_name: c.name,
+        case_year: c.year,
+        section: s.number,
+        section_title: s.title,
+        act_name: a.name
+    }) AS cases
+}
+CALL {
+    WITH sn
+    MATCH (s:Section {number: sn})-[r:REFERENCES|RELATED_TO]-(related:Section)
+    WHERE $include_related
+    OPTIONAL MATCH (related)-[:PART_OF]->(a:Act)
+    WITH related, r, a
+    LIMIT 10
+    RETURN collect({
+        related_section: related.number,
+        related_title: related.title,
+        relationship: type(r),
+        act_name: a.name
+    }) AS related
+}
+RETURN sn, cases, related
+"""
+
+
+def _section_bundle_params(
+    section_numbers: List[str],
+    include_cases: bool,
+    include_related: bool
+) -> Dict[str, Any]:
+    """Query parameters for SECTION_BUNDLE_QUERY (duplicates removed, order kept)"""
+    return {
+        "section_numbers": list(dict.fromkeys(section_numbers)),
+        "include_cases": include_cases,
+        "include_related": include_related
+    }
+
+
+# Columns of SECTION_BUNDLE_QUERY, fetched positionally via run_query_values
+SECTION_BUNDLE_COLUMNS = ("sn", "cases", "related")
+
+
+def _group_section_bundle(
+    section_numbers: List[str],
+    rows: List[List[Any]]
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Map SECTION_BUNDLE_QUERY [sn, cases, related] rows to {section: {"cases": [...], "related": [...]}}"""
+    bundle = {sn: {"cases": [], "related": []} for sn in section_numbers}
+    for sn, cases, related in rows:
+        bundle[sn] = {"cases": cases, "related": related}
+    return bundle
+
+
+
 class Neo4jClient:
     """
     Optimized Neo4j client for legal knowledge graph
@@ -29,13 +107,34 @@ class Neo4jClient:
     - Health checks and error handling
     """
     
+    # Deepest traversal find_section_relationships will build a query for
+    MAX_RELATIONSHIP_DEPTH = 5
+    
+    # Relationship query text per depth (shared across instances)
+    _relationship_queries: Dict[int, str] = {}
+    
+    # Idempotent schema DDL backing the helper queries' lookups. Section numbers
+    # repeat across acts, so Section.number gets a plain index, not a uniqueness constraint.
+    SCHEMA_STATEMENTS = (
+        "CREATE INDEX section_number IF NOT EXISTS FOR (s:Section) ON (s.number)",
+        "CREATE INDEX case_year IF NOT EXISTS FOR (c:Case) ON (c.year)",
+        "CREATE INDEX act_name IF NOT EXISTS FOR (a:Act) ON (a.name)",
+    )
+    
     def __init__(
         self,
         uri: str,
         username: str,
         password: str,
-        max_connection_pool_size: int = 50,
-        connection_timeout: int = 30
+        max_connection_pool_size: int = 100,
+        connection_timeout: float = 30,
+        connection_acquisition_timeout: float = 60,
+        max_connection_lifetime: float = 3600,
+        keep_alive: bool = True,
+        query_cache_size: int = 1024,
+        query_cache_ttl: int = 300,
+        ensure_schema: bool = True,
+        database: Optional[str] = None
     ):
         """
         Initialize Neo4j client with connection pooling
@@ -44,21 +143,68 @@ class Neo4jClient:
             uri: Neo4j connection URI (e.g., neo4j+s://xxx.databases.neo4j.io)
             username: Neo4j username
             password: Neo4j password
-            max_connection_pool_size: Max connections in pool (default: 50)
+            max_connection_pool_size: Max connections in pool (default: 100); should be
+                >= uvicorn workers x per-request graph concurrency
             connection_timeout: Connection timeout in seconds (default: 30)
+            connection_acquisition_timeout: Max seconds to wait for a free pooled
+                connection before failing (default: 60)
+            max_connection_lifetime: Seconds after which pooled connections are
+                recycled, avoiding stale idle TCP connections (default: 3600)
+            keep_alive: Enable TCP keep-alive on pooled connections
+            query_cache_size: Max cached read-query results for calls made with
+                cache=True (0 disables the cache)
+            query_cache_ttl: Seconds a cached read-query result stays valid
+            ensure_schema: Create the lookup indexes if missing (disable for read-only replicas)
+            database: Target database name (None for the server default)
         """
         self.uri = uri
         self.username = username
+        self.database = database
+        
+        # Session held open by read_batch() for the current thread
+        self._local = threading.local()
         
         # Initialize driver with connection pooling
+        from neo4j import GraphDatabase
+        
         self.driver = GraphDatabase.driver(
             uri,
             auth=(username, password),
             max_connection_pool_size=max_connection_pool_size,
-            connection_timeout=connection_timeout
+            connection_timeout=connection_timeout,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+            max_connection_lifetime=max_connection_lifetime,
+            keep_alive=keep_alive
         )
+        self.max_connection_pool_size = max_connection_pool_size
+        
+        # Read-query result cache: key -> (expires_at, records), LRU-ordered
+        self._cache: "OrderedDict[bytes, Tuple[float, List[Any]]]" = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self._cache_size = query_cache_size
+        self._cache_ttl = query_cache_ttl
         
         logger.info(f"Neo4jClient initialized: {uri}")
+        
+        if ensure_schema:
+            self.ensure_schema()
+    
+    def ensure_schema(self) -> bool:
+        """
+        Create the indexes used by the helper queries (no-op if they already exist)
+        
+        Returns:
+            True if all statements succeeded, False otherwise
+        """
+        try:
+            with self._write_session() as session:
+                for statement in self.SCHEMA_STATEMENTS:
+                    session.run(statement).consume()
+            logger.info("[PASS] Neo4j schema indexes ensured")
+            return True
+        except Exception as e:
+            logger.warning(f"[WARN] Could not ensure Neo4j schema: {str(e)}")
+            return False
     
     def test_connection(self) -> bool:
         """
@@ -74,6 +220,7 @@ class Neo4jClient:
                 
                 if value == 1:
                     logger.info("[PASS] Neo4j connection successful")
+                    self._log_server_info()
                     return True
                 else:
                     logger.error("[FAIL] Neo4j connection test failed")
@@ -101,39 +248,252 @@ class Neo4jClient:
             
             return False
     
+    @staticmethod
+    def _cache_key(query: str, params: Optional[Dict[str, Any]]) -> bytes:
+        """Digest of the query text plus its canonicalized parameters"""
+        payload = query.encode('utf-8') + json.dumps(params or {}, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[List[Any]]:
+        """Return cached records (as deep copies) or None on miss/expiry"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, records = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        # Deep copy: rows hold nested lists/dicts (e.g. properties()) callers may mutate
+        return copy.deepcopy(records)
+    
+    def _cache_put(self, key: bytes, records: List[Any]) -> None:
+        """Store records (dicts or value lists), evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self._cache_ttl, copy.deepcopy(records))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        """Drop all cached read-query results (call after graph writes)"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        fetch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream query results record by record (uncached)
+        
+        Records are pulled from the server in batches of fetch_size, so callers that
+        stop iterating early never materialize the rest of the result.
+        
+        Args:
+            query: Cypher query string
+            params: Query parameters (optional)
+            fetch_size: Records requested per Bolt PULL
+            
+        Yields:
+            Result records as dictionaries
+        """
+        held = getattr(self._local, 'session', None)
+        if held is not None:
+            # Inside read_batch(): reuse the open session
+            for record in held.run(query, params or {}):
+                yield record.data()
+            return
+        
+        with self._read_session(fetch_size=fetch_size) as session:
+            for record in session.run(query, params or {}):
+                yield record.data()
+    
+    def _read_session(self, **config) -> "Session":
+        """Session routed to readers (followers/read replicas in a cluster)"""
+        from neo4j import READ_ACCESS
+        
+        return self.driver.session(
+            default_access_mode=READ_ACCESS,
+            database=self.database,
+            **config
+        )
+    
+    def _write_session(self, **config) -> "Session":
+        """Session routed to the cluster leader"""
+        from neo4j import WRITE_ACCESS
+        
+        return self.driver.session(
+            default_access_mode=WRITE_ACCESS,
+            database=self.database,
+            **config
+        )
+    
+    @contextmanager
+    def read_batch(self, fetch_size: int = 1000):
+        """
+        Hold one read session open for a sequence of reads on this thread
+        
+        Example:
+            with client.read_batch():
+                cases = client.find_case_citations("438")
+                related = client.find_related_provisions("438")
+        
+        Args:
+            fetch_size: Records requested per Bolt PULL
+            
+        Yields:
+            This client
+        """
+        if getattr(self._local, 'session', None) is not None:
+            # Nested batch: keep using the outer session
+            yield self
+            return
+        
+        with self._read_session(fetch_size=fetch_size) as session:
+            self._local.session = session
+            try:
+                yield self
+            finally:
+                self._local.session = None
+    
     def run_query(
         self,
         query: str,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = False,
+        write: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Execute Cypher query with parameters (prevents injection)
         
+        Runs in a read session unless write=True. With cache=True, identical
+        (query, params) reads are served from an in-process LRU+TTL cache; only
+        use it for read-only Cypher whose results may be up to query_cache_ttl old.
+        
         Args:
             query: Cypher query string
             params: Query parameters (optional)
+            cache: Serve/store the result in the read-query cache
+            write: Run in a write session (MERGE/CREATE/DDL that return rows);
+                   never cached, and clears the read cache afterwards
             
         Returns:
             List of result records as dictionaries
         """
+        if write:
+            return self._run_write_records(query, params)
+        
+        use_cache = cache and self._cache_size > 0
+        if use_cache:
+            key = self._cache_key(query, params)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.debug(f"Query cache hit: {len(cached)} results")
+                return cached
+        
         try:
-            with self.driver.session() as session:
-                result = session.run(query, params or {})
-                records = [record.data() for record in result]
+            records = list(self.iter_query(query, params))
+            
+            logger.debug(f"Query executed: {len(records)} results")
+            if use_cache:
+                self._cache_put(key, records)
+            return records
                 
-                logger.debug(f"Query executed: {len(records)} results")
-                return records
+        except Exception as e:
+            logger.error(f"Query failed: {str(e)}")
+            logger.error(f"Query: {query}")
+            return []
+    
+    def _run_write_records(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run a write statement in a write session and return its records (run_query(write=True))"""
+        try:
+            with self._write_session() as session:
+                records = [record.data() for record in session.run(query, params or {})]
+            
+            # Cached reads may now be stale
+            self.invalidate()
+            
+            logger.debug(f"Write query executed: {len(records)} results")
+            return records
+                
+        except Exception as e:
+            logger.error(f"Write query failed: {str(e)}")
+            logger.error(f"Query: {query}")
+            return []
+    
+    def run_query_values(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        columns: Tuple[str, ...],
+        cache: bool = False
+    ) -> List[List[Any]]:
+        """
+        Execute a read query returning only the named columns, as value lists
+        
+        Skips building a dict per record; use when the caller knows the columns
+        it needs. Cached like run_query when cache=True.
+        
+        Args:
+            query: Cypher query string
+            params: Query parameters
+            columns: Column names to return, in order
+            cache: Serve/store the result in the read-query cache
+            
+        Returns:
+            One list of values per record, ordered like columns
+        """
+        use_cache = cache and self._cache_size > 0
+        if use_cache:
+            key = self._cache_key(query + "\x00" + ",".join(columns), params)
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.debug(f"Query cache hit: {len(cached)} results")
+                return cached
+        
+        try:
+            held = getattr(self._local, 'session', None)
+            if held is not None:
+                # Inside read_batch(): reuse the open session
+                rows = held.run(query, params or {}).values(*columns)
+            else:
+                with self._read_session() as session:
+                    rows = session.run(query, params or {}).values(*columns)
+            
+            logger.debug(f"Query executed: {len(rows)} results")
+            if use_cache:
+                self._cache_put(key, rows)
+            return rows
                 
         except Exception as e:
             logger.error(f"Query failed: {str(e)}")
             logger.error(f"Query: {query}")
             return []
     
+    def _log_server_info(self) -> None:
+        """Log server details and pool sizing once the connection is verified"""
+        try:
+            info = self.driver.get_server_info()
+            logger.info(
+                f"[INFO] Neo4j server: {info.agent} (protocol {info.protocol_version}), "
+                f"pool size: {self.max_connection_pool_size}"
+            )
+        except Exception as e:
+            logger.debug(f"Could not read Neo4j server info: {str(e)}")
+    
     def run_write_query(
         self,
         query: str,
         params: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> Optional["SummaryCounters"]:
         """
         Execute write query (CREATE, MERGE, DELETE) with transaction
         
@@ -142,25 +502,23 @@ class Neo4jClient:
             params: Query parameters
             
         Returns:
-            Query summary statistics
+            The driver's SummaryCounters (nodes_created, relationships_created,
+            properties_set, ...) or None if the query failed. Use
+            counters_to_dict() where a JSON-serializable form is needed.
         """
         try:
-            with self.driver.session() as session:
-                result = session.run(query, params or {})
-                summary = result.consume()
+            with self._write_session() as session:
+                counters = session.run(query, params or {}).consume().counters
                 
-                stats = {
-                    "nodes_created": summary.counters.nodes_created,
-                    "relationships_created": summary.counters.relationships_created,
-                    "properties_set": summary.counters.properties_set
-                }
+                # Cached reads may now be stale
+                self.invalidate()
                 
-                logger.info(f"Write query executed: {stats}")
-                return stats
+                logger.info("Write query executed: %s", counters)
+                return counters
                 
         except Exception as e:
             logger.error(f"Write query failed: {str(e)}")
-            return {}
+            return None
     
     def close(self):
         """Close driver and release resources"""
@@ -193,9 +551,29 @@ class Neo4jClient:
         Returns:
             List of related nodes and relationships
         """
-        # Optimized query using index on Section.number
-        query = """
-        MATCH path = (s:Section {number: $section_number})-[*1..{max_depth}]-(related)
+        return self.run_query(
+            self._relationship_query(max_depth),
+            {"section_number": section_number},
+            cache=True
+        )
+    
+    @classmethod
+    def _relationship_query(cls, max_depth: int) -> str:
+        """
+        Return the (cached) relationship query text for a given depth
+        
+        Cypher can't take variable-length bounds as parameters, so one fixed query
+        string is built per depth and reused; identical text keeps Neo4j's plan cache warm.
+        """
+        depth = int(max_depth)
+        if not 1 <= depth <= cls.MAX_RELATIONSHIP_DEPTH:
+            raise ValueError(f"max_depth must be between 1 and {cls.MAX_RELATIONSHIP_DEPTH}")
+        
+        query = cls._relationship_queries.get(depth)
+        if query is None:
+            # Optimized query using index on Section.number
+            query = f"""
+        MATCH path = (s:Section {{number: $section_number}})-[*1..{depth}]-(related)
         RETURN 
             s.number AS section,
             s.title AS section_title,
@@ -204,11 +582,34 @@ class Neo4jClient:
             properties(related) AS related_properties
         LIMIT 50
         """
+            cls._relationship_queries[depth] = query
+        return query
+    
+    def fetch_section_bundle(
+        self,
+        section_numbers: List[str],
+        include_cases: bool = True,
+        include_related: bool = True
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch case citations and related provisions for several sections in one
+        round trip (UNWIND with one subquery per lookup)
         
-        # Format query with max_depth
-        query = query.replace("{max_depth}", str(max_depth))
+        Args:
+            section_numbers: Section numbers to look up
+            include_cases: Fetch citing cases (top 20 by year, newest first)
+            include_related: Fetch related provisions (up to 10)
+            
+        Returns:
+            Dict mapping section number -> {"cases": [...], "related": [...]}, with
+            rows shaped like find_case_citations / find_related_provisions
+        """
+        if not section_numbers:
+            return {}
         
-        return self.run_query(query, {"section_number": section_number})
+        params = _section_bundle_params(section_numbers, include_cases, include_related)
+        rows = self.run_query_values(SECTION_BUNDLE_QUERY, params, SECTION_BUNDLE_COLUMNS, cache=True)
+        return _group_section_bundle(section_numbers, rows)
     
     def find_case_citations(
         self,
@@ -223,20 +624,23 @@ class Neo4jClient:
         Returns:
             List of cases with citation details
         """
-        query = """
-        MATCH (c:Case)-[:INTERPRETS]->(s:Section {number: $section_number})
-        OPTIONAL MATCH (s)-[:PART_OF]->(a:Act)
-        RETURN 
-            c.name AS case_name,
-            c.year AS case_year,
-            s.number AS section,
-            s.title AS section_title,
-            a.name AS act_name
-        ORDER BY c.year DESC
-        LIMIT 20
+        return self.find_case_citations_bulk([section_number])[section_number]
+    
+    def find_case_citations_bulk(
+        self,
+        section_numbers: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
+        Find cases citing each of several sections in a single round trip
         
-        return self.run_query(query, {"section_number": section_number})
+        Args:
+            section_numbers: Section numbers to look up
+            
+        Returns:
+            Dict mapping section number -> list of cases
+        """
+        bundle = self.fetch_section_bundle(section_numbers, include_related=False)
+        return {sn: entry["cases"] for sn, entry in bundle.items()}
     
     def find_related_provisions(
         self,
@@ -251,22 +655,262 @@ class Neo4jClient:
         Returns:
             List of related provisions
         """
-        query = """
-        MATCH (s:Section {number: $section_number})-[r:REFERENCES|RELATED_TO]-(related:Section)
-        OPTIONAL MATCH (related)-[:PART_OF]->(a:Act)
-        RETURN 
-            related.number AS related_section,
-            related.title AS related_title,
-            type(r) AS relationship,
-            a.name AS act_name
-        LIMIT 10
+        bundle = self.fetch_section_bundle([section_number], include_cases=False)
+        return bundle[section_number]["related"]
+
+class AsyncNeo4jClient:
+    """
+    asyncio counterpart of Neo4jClient for FastAPI request paths
+    
+    Mirrors the read helpers of Neo4jClient so graph lookups can be awaited
+    alongside other I/O (vector retrieval, LLM generation) instead of blocking
+    the event loop.
+    """
+    
+    def __init__(
+        self,
+        uri: str,
+        username: str,
+        password: str,
+        max_connection_pool_size: int = 100,
+        connection_timeout: float = 30,
+        connection_acquisition_timeout: float = 60,
+        max_connection_lifetime: float = 3600,
+        keep_alive: bool = True,
+        database: Optional[str] = None
+    ):
+        """
+        Initialize async Neo4j client with connection pooling
+        
+        Args:
+            uri: Neo4j connection URI
+            username: Neo4j username
+            password: Neo4j password
+            max_connection_pool_size: Max connections in pool (default: 100)
+            connection_timeout: Connection timeout in seconds (default: 30)
+            connection_acquisition_timeout: Max seconds to wait for a pooled connection
+            max_connection_lifetime: Seconds after which pooled connections are recycled
+            keep_alive: Enable TCP keep-alive on pooled connections
+            database: Target database name (None for the server default)
+        """
+        self.uri = uri
+        self.database = database
+        from neo4j import AsyncGraphDatabase
+        
+        self.driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(username, password),
+            max_connection_pool_size=max_connection_pool_size,
+            connection_timeout=connection_timeout,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+            max_connection_lifetime=max_connection_lifetime,
+            keep_alive=keep_alive
+        )
+        
+        logger.info(f"AsyncNeo4jClient initialized: {uri}")
+    
+    async def test_connection(self) -> bool:
+        """
+        Test Neo4j connection health
+        
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            records = await self.run_query("RETURN 1 AS test")
+            if records and records[0].get("test") == 1:
+                logger.info("[PASS] Neo4j async connection successful")
+                return True
+            logger.error("[FAIL] Neo4j async connection test failed")
+            return False
+        except Exception as e:
+            logger.error(f"[FAIL] Neo4j async connection failed: {str(e)}")
+            return False
+    
+    def _read_session(self):
+        """Async session routed to readers"""
+        from neo4j import READ_ACCESS
+        
+        return self.driver.session(default_access_mode=READ_ACCESS, database=self.database)
+    
+    async def run_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
+        Execute a read query with parameters
         
-        return self.run_query(query, {"section_number": section_number})
+        Args:
+            query: Cypher query string
+            params: Query parameters (optional)
+            
+        Returns:
+            List of result records as dictionaries
+        """
+        try:
+            async with self._read_session() as session:
+                result = await session.run(query, params or {})
+                records = [record.data() async for record in result]
+                
+                logger.debug(f"Async query executed: {len(records)} results")
+                return records
+                
+        except Exception as e:
+            logger.error(f"Async query failed: {str(e)}")
+            logger.error(f"Query: {query}")
+            return []
+    
+    async def run_query_values(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        columns: Tuple[str, ...]
+    ) -> List[List[Any]]:
+        """
+        Async version of Neo4jClient.run_query_values (uncached)
+        
+        Args:
+            query: Cypher query string
+            params: Query parameters
+            columns: Column names to return, in order
+            
+        Returns:
+            One list of values per record, ordered like columns
+        """
+        try:
+            async with self._read_session() as session:
+                result = await session.run(query, params or {})
+                rows = await result.values(*columns)
+                
+                logger.debug(f"Async query executed: {len(rows)} results")
+                return rows
+                
+        except Exception as e:
+            logger.error(f"Async query failed: {str(e)}")
+            logger.error(f"Query: {query}")
+            return []
+    
+    async def close(self):
+        """Close driver and release resources"""
+        if self.driver:
+            await self.driver.close()
+            logger.info("Neo4j async driver closed")
+    
+    async def fetch_section_bundle(
+        self,
+        section_numbers: List[str],
+        include_cases: bool = True,
+        include_related: bool = True
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Async version of Neo4jClient.fetch_section_bundle
+        
+        Args:
+            section_numbers: Section numbers to look up
+            include_cases: Fetch citing cases
+            include_related: Fetch related provisions
+            
+        Returns:
+            Dict mapping section number -> {"cases": [...], "related": [...]}
+        """
+        if not section_numbers:
+            return {}
+        
+        params = _section_bundle_params(section_numbers, include_cases, include_related)
+        rows = await self.run_query_values(SECTION_BUNDLE_QUERY, params, SECTION_BUNDLE_COLUMNS)
+        return _group_section_bundle(section_numbers, rows)
+    
+    async def find_case_citations(self, section_number: str) -> List[Dict[str, Any]]:
+        """Async version of Neo4jClient.find_case_citations"""
+        bundle = await self.fetch_section_bundle([section_number], include_related=False)
+        return bundle[section_number]["cases"]
+    
+    async def find_related_provisions(self, section_number: str) -> List[Dict[str, Any]]:
+        """Async version of Neo4jClient.find_related_provisions"""
+        bundle = await self.fetch_section_bundle([section_number], include_cases=False)
+        return bundle[section_number]["related"]
+    
+    async def find_section_relationships(
+        self,
+        section_number: str,
+        max_depth: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Async version of Neo4jClient.find_section_relationships"""
+        return await self.run_query(
+            Neo4jClient._relationship_query(max_depth),
+            {"section_number": section_number}
+        )
+
+
+def counters_to_dict(counters: Optional["SummaryCounters"]) -> Dict[str, int]:
+    """
+    Convert write-query counters to a plain dict (at the API boundary)
+    
+    Args:
+        counters: Result of Neo4jClient.run_write_query
+        
+    Returns:
+        Dict with nodes_created, relationships_created and properties_set
+        (empty if the write failed)
+    """
+    if counters is None:
+        return {}
+    return {
+        "nodes_created": counters.nodes_created,
+        "relationships_created": counters.relationships_created,
+        "properties_set": counters.properties_set
+    }
 
 
-# Singleton instance
+# Singleton instances
 _neo4j_instance: Optional[Neo4jClient] = None
+_neo4j_lock = threading.Lock()
+_async_neo4j_instance: Optional[AsyncNeo4jClient] = None
+
+
+def _close_neo4j_client() -> None:
+    """Close the sync singleton's driver at interpreter exit (releases pooled sockets)"""
+    global _neo4j_instance
+    
+    if _neo4j_instance is not None:
+        _neo4j_instance.close()
+        _neo4j_instance = None
+
+
+atexit.register(_close_neo4j_client)
+
+
+def _resolve_credentials(
+    uri: Optional[str],
+    username: Optional[str],
+    password: Optional[str]
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Fill missing connection details from settings/environment"""
+    if HAS_SETTINGS:
+        return (
+            uri or settings.NEO4J_URI,
+            username or settings.NEO4J_USERNAME,
+            password or settings.NEO4J_PASSWORD
+        )
+    return (
+        uri or os.getenv("NEO4J_URI"),
+        username or os.getenv("NEO4J_USERNAME", "neo4j"),
+        password or os.getenv("NEO4J_PASSWORD")
+    )
+
+
+def _pool_config() -> Dict[str, Any]:
+    """Driver pool options from settings (driver defaults when settings are unavailable)"""
+    if not HAS_SETTINGS:
+        return {}
+    return {
+        "max_connection_pool_size": settings.NEO4J_POOL_SIZE,
+        "connection_timeout": settings.NEO4J_CONNECTION_TIMEOUT,
+        "connection_acquisition_timeout": settings.NEO4J_ACQ_TIMEOUT,
+        "max_connection_lifetime": settings.NEO4J_MAX_LIFETIME,
+        "keep_alive": settings.NEO4J_KEEP_ALIVE,
+    }
 
 
 def get_neo4j_client(
@@ -287,31 +931,79 @@ def get_neo4j_client(
     """
     global _neo4j_instance
     
-    if _neo4j_instance is None:
-        # Get from settings/environment if not provided
-        if HAS_SETTINGS:
-            uri = uri or settings.NEO4J_URI
-            username = username or settings.NEO4J_USERNAME
-            password = password or settings.NEO4J_PASSWORD
-        else:
-            uri = uri or os.getenv("NEO4J_URI")
-            username = username or os.getenv("NEO4J_USERNAME", "neo4j")
-            password = password or os.getenv("NEO4J_PASSWORD")
+    # Fast path: no lock once the client exists
+    instance = _neo4j_instance
+    if instance is not None:
+        return instance
+    
+    uri, username, password = _resolve_credentials(uri, username, password)
+    if not uri or not password:
+        logger.warning("Neo4j credentials missing, graph features disabled")
+        return None
+    
+    with _neo4j_lock:
+        # Re-check: another thread may have connected while we waited
+        if _neo4j_instance is None:
+            client = None
+            try:
+                client = Neo4jClient(uri, username, password, **_pool_config())
+                
+                # Test connection
+                if client.test_connection():
+                    _neo4j_instance = client
+                else:
+                    logger.error("Neo4j connection test failed")
+                    client.close()
+                    
+            except Exception as e:
+                logger.error(f"Failed to initialize Neo4j client: {str(e)}")
+                if client is not None:
+                    client.close()
+        
+        return _neo4j_instance
+
+
+async def get_async_neo4j_client(
+    uri: Optional[str] = None,
+    username: Optional[str] = None,
+    password: Optional[str] = None
+) -> Optional[AsyncNeo4jClient]:
+    """
+    Get or create singleton async Neo4j client
+    
+    Args:
+        uri: Neo4j URI (from env if not provided)
+        username: Neo4j username (from env if not provided)
+        password: Neo4j password (from env if not provided)
         
+    Returns:
+        AsyncNeo4jClient instance or None if credentials missing / unreachable
+    """
+    global _async_neo4j_instance
+    
+    if _async_neo4j_instance is None:
+        uri, username, password = _resolve_credentials(uri, username, password)
         if not uri or not password:
-            logger.warning("Neo4j credentials missing, graph features disabled")
+            logger.warning("Neo4j credentials missing, async graph features disabled")
             return None
         
         try:
-            _neo4j_instance = Neo4jClient(uri, username, password)
-            
-            # Test connection
-            if not _neo4j_instance.test_connection():
-                logger.error("Neo4j connection test failed")
-                _neo4j_instance = None
-                
+            client = AsyncNeo4jClient(uri, username, password, **_pool_config())
+            if await client.test_connection():
+                _async_neo4j_instance = client
+            else:
+                logger.error("Neo4j async connection test failed")
+                await client.close()
         except Exception as e:
-            logger.error(f"Failed to initialize Neo4j client: {str(e)}")
-            _neo4j_instance = None
+            logger.error(f"Failed to initialize async Neo4j client: {str(e)}")
+    
+    return _async_neo4j_instance
+
+
+async def close_async_neo4j_client() -> None:
+    """Close the async singleton (call on application shutdown)"""
+    global _async_neo4j_instance
     
-    return _neo4j_instance
+    if _async_neo4j_instance is not None:
+        await _async_neo4j_instance.close()
+        _async_neo4j_instance = None
@@ -2,13 +2,49 @@
 Ollama LLM Generator
 Handles communication with Ollama for answer generation
 """
-import requests
+import httpx
+import gzip
+import hashlib
 import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, Tuple
+
+from .prompts import CHARS_PER_TOKEN, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
+# Optional on-disk completion cache (survives restarts)
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Directory for the persistent completion cache; unset disables it
+OLLAMA_CACHE_DIR = os.getenv("OLLAMA_CACHE_DIR")
+
+# Gzip request bodies (for a remote Ollama behind a proxy that inflates them)
+OLLAMA_GZIP_REQUESTS = os.getenv("OLLAMA_GZIP_REQUESTS", "False").lower() == "true"
+
+# How long Ollama keeps the model loaded after a request. While it stays loaded,
+# the runner reuses the KV cache for the longest prompt prefix shared with the
+# previous request, so queries that retrieve the same leading documents skip
+# most of the prefill. Ollama's own default unloads after 5 minutes.
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Bodies smaller than this are sent uncompressed (gzip overhead isn't worth it)
+GZIP_MIN_BYTES = 1024
+
+# Optional HTTP/2 support (needs the h2 package; only negotiated over TLS)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class OllamaGenerator:
     """
@@ -16,11 +52,20 @@ class OllamaGenerator:
     Uses llama3.2:3b for natural language answer generation
     """
     
+    # Completions sampled above this temperature are too varied to be worth caching
+    MAX_CACHEABLE_TEMPERATURE = 0.5
+    
     def __init__(
         self,
         model_name: str = "llama3.2:3b",
         base_url: str = "http://localhost:11434",
-        timeout: int = 120  # Increased for cold starts
+        timeout: int = 120,  # Increased for cold starts
+        max_keepalive_connections: int = 10,
+        cache_size: int = 256,
+        disk_cache_dir: Optional[str] = OLLAMA_CACHE_DIR,
+        disk_cache_ttl: int = 86400,
+        compress_requests: bool = OLLAMA_GZIP_REQUESTS,
+        keep_alive: str = OLLAMA_KEEP_ALIVE
     ):
         """
         Initialize Ollama Generator
@@ -29,10 +74,43 @@ class OllamaGenerator:
             model_name: Name of the Ollama model to use
             base_url: Base URL of Ollama server
             timeout: Request timeout in seconds
+            max_keepalive_connections: Idle connections kept open in the pool
+            cache_size: Max completions kept in the in-memory LRU cache (0 disables it)
+            disk_cache_dir: Directory for the persistent completion cache (None disables it)
+            disk_cache_ttl: Seconds a completion stays in the disk cache
+            compress_requests: Gzip large request bodies (the server must accept
+                Content-Encoding: gzip)
+            keep_alive: How long Ollama keeps the model (and its prompt KV cache)
+                loaded between requests, e.g. "30m" or "-1" for indefinitely
         """
         self.model_name = model_name
         self.base_url = base_url
         self.timeout = timeout
+        self._limits = httpx.Limits(max_keepalive_connections=max_keepalive_connections)
+        self.compress_requests = compress_requests
+        self.keep_alive = keep_alive
+        
+        # Pooled keep-alive client reused by every call
+        self._client = httpx.Client(
+            base_url=base_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=timeout,
+            limits=self._limits
+        )
+        # Async client is created on first use inside the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        
+        # Exact-match completion cache: sha256 key -> generated text
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_size = cache_size
+        self._disk_cache_ttl = disk_cache_ttl
+        self._disk_cache = None
+        if disk_cache_dir:
+            if DISKCACHE_AVAILABLE:
+                self._disk_cache = diskcache.Cache(disk_cache_dir)
+            else:
+                logger.warning("[WARN] OLLAMA_CACHE_DIR set but diskcache is not installed, using memory cache only")
         
         logger.info(f"OllamaGenerator initialized with model: {model_name}")
     
@@ -45,7 +123,7 @@ class OllamaGenerator:
         """
         try:
             # Check if server is running
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self._client.get("/api/tags", timeout=5)
             
             if response.status_code == 200:
                 models = response.json().get('models', [])
@@ -62,7 +140,7 @@ class OllamaGenerator:
                 logger.error(f"❌ Ollama server returned status {response.status_code}")
                 return False
                 
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             logger.error(f"❌ Cannot connect to Ollama at {self.base_url}")
             logger.error(f"   Make sure Ollama is running: ollama serve")
             return False
@@ -70,15 +148,128 @@ class OllamaGenerator:
             logger.error(f"❌ Ollama health check failed: {str(e)}")
             return False
     
-    def generate(
+    def _build_payload(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the streaming /api/generate request body"""
+        return {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+                "top_p": kwargs.get('top_p', 0.9),
+                "top_k": kwargs.get('top_k', 40),
+            }
+        }
+    
+    def _encode_body(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a request body, gzipping it when enabled and large enough"""
+        body = json.dumps(payload).encode('utf-8')
+        headers = {"Content-Type": "application/json"}
+        if self.compress_requests and len(body) >= GZIP_MIN_BYTES:
+            # Prompts repeat document headers and legal boilerplate, so they compress well
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+    
+    def _parse_chunk(self, line: str) -> Optional[Dict[str, Any]]:
+        """Decode one NDJSON line of a streaming response, logging the final metrics"""
+        if not line:
+            return None
+        chunk = json.loads(line)
+        if "error" in chunk:
+            error_msg = f"Ollama error: {chunk['error']}"
+            logger.error(f"❌ {error_msg}")
+            raise Exception(error_msg)
+        if chunk.get("done"):
+            # Log metrics
+            total_duration = chunk.get("total_duration", 0) / 1e9  # Convert to seconds
+            logger.info(f"✅ Generated {chunk.get('eval_count', 0)} tokens in {total_duration:.2f}s")
+        return chunk
+    
+    def _status_error(self, response: httpx.Response) -> Exception:
+        """Build the exception for a non-200 response (body must already be read)"""
+        error_msg = f"Ollama returned status {response.status_code}: {response.text}"
+        logger.error(f"❌ {error_msg}")
+        return Exception(error_msg)
+    
+    def _raise_transport_error(self, error: Exception) -> None:
+        """Convert httpx transport errors into the generator's error messages"""
+        if isinstance(error, httpx.TimeoutException):
+            error_msg = f"Ollama request timed out after {self.timeout}s"
+        elif isinstance(error, httpx.ConnectError):
+            error_msg = f"Cannot connect to Ollama at {self.base_url}"
+        else:
+            logger.error(f"❌ Ollama generation failed: {str(error)}")
+            raise error
+        logger.error(f"❌ {error_msg}")
+        raise Exception(error_msg) from error
+    
+    def _cache_key(self, payload: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        """Completion cache key for a payload, or None if it should not be cached"""
+        options = payload["options"]
+        if not use_cache or options["temperature"] > self.MAX_CACHEABLE_TEMPERATURE:
+            return None
+        if not self._cache_size and self._disk_cache is None:
+            return None
+        raw = f"{self.model_name}|{json.dumps(options, sort_keys=True)}|{payload['prompt']}"
+        # Prompts are several KB; at that size OpenSSL's SHA-NI sha256 outruns blake2b
+        # (short query keys in cache.redis_cache use xxhash/blake2b instead)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        """Look a completion up in the memory cache, then the disk cache"""
+        if key is None:
+            return None
+        with self._cache_lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+        if self._disk_cache is not None:
+            text = self._disk_cache.get(key)
+            if text is not None:
+                self._cache_put(key, text, persist=False)
+                return text
+        return None
+    
+    def _cache_put(self, key: Optional[str], text: str, persist: bool = True) -> None:
+        """Store a completion, evicting the least recently used entry when full"""
+        if key is None or not text:
+            return
+        if self._cache_size:
+            with self._cache_lock:
+                self._cache[key] = text
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        if persist and self._disk_cache is not None:
+            self._disk_cache.set(key, text, expire=self._disk_cache_ttl)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached completions (memory and disk)"""
+        with self._cache_lock:
+            self._cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+    
+    def generate_stream(
         self,
         prompt: str,
         max_tokens: int = 512,
         temperature: float = 0.3,
+        use_cache: bool = True,
         **kwargs
-    ) -> str:
+    ) -> Iterator[str]:
         """
-        Generate text using Ollama
+        Generate text using Ollama, yielding tokens as they are decoded
         
         Args:
             prompt: The prompt to generate from
@@ -86,60 +277,160 @@ class OllamaGenerator:
             temperature: Sampling temperature (0.0-1.0)
                 - Lower (0.1-0.3) = More focused, factual (good for legal)
                 - Higher (0.7-0.9) = More creative, diverse
+            use_cache: Serve/store the completion from the exact-match cache
+                (ignored above MAX_CACHEABLE_TEMPERATURE)
             **kwargs: Additional Ollama parameters
             
-        Returns:
-            Generated text
+        Yields:
+            Generated text fragments
             
         Raises:
             Exception: If generation fails
         """
-        payload = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "num_predict": max_tokens,
-                "temperature": temperature,
-                "top_p": kwargs.get('top_p', 0.9),
-                "top_k": kwargs.get('top_k', 40),
-            }
-        }
+        payload = self._build_payload(prompt, max_tokens, temperature, **kwargs)
+        
+        cache_key = self._cache_key(payload, use_cache)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("[CACHE HIT] Returning cached completion")
+            yield cached
+            return
         
+        parts = []
         try:
             logger.debug(f"Generating with Ollama, prompt length: {len(prompt)} chars")
+            body, headers = self._encode_body(payload)
+            with self._client.stream("POST", "/api/generate", content=body, headers=headers) as response:
+                if response.status_code != 200:
+                    response.read()
+                    raise self._status_error(response)
+                for line in response.iter_lines():
+                    chunk = self._parse_chunk(line)
+                    if chunk is None:
+                        continue
+                    if chunk.get("response"):
+                        parts.append(chunk["response"])
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        self._cache_put(cache_key, "".join(parts))
+                        break
+        except httpx.HTTPError as e:
+            self._raise_transport_error(e)
+    
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async version of generate_stream() for use inside FastAPI handlers
+        
+        Args:
+            prompt: The prompt to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+            use_cache: Serve/store the completion from the exact-match cache
+            **kwargs: Additional Ollama parameters
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
+        Yields:
+            Generated text fragments
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=self._limits
             )
+        
+        payload = self._build_payload(prompt, max_tokens, temperature, **kwargs)
+        
+        cache_key = self._cache_key(payload, use_cache)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("[CACHE HIT] Returning cached completion")
+            yield cached
+            return
+        
+        parts = []
+        try:
+            logger.debug(f"Generating with Ollama (async), prompt length: {len(prompt)} chars")
+            body, headers = self._encode_body(payload)
+            async with self._async_client.stream("POST", "/api/generate", content=body, headers=headers) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise self._status_error(response)
+                async for line in response.aiter_lines():
+                    chunk = self._parse_chunk(line)
+                    if chunk is None:
+                        continue
+                    if chunk.get("response"):
+                        parts.append(chunk["response"])
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        self._cache_put(cache_key, "".join(parts))
+                        break
+        except httpx.HTTPError as e:
+            self._raise_transport_error(e)
+    
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Generate text using Ollama (full completion as one string)
+        
+        Args:
+            prompt: The prompt to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0.0-1.0)
+            use_cache: Serve/store the completion from the exact-match cache
+            **kwargs: Additional Ollama parameters
             
-            if response.status_code == 200:
-                result = response.json()
-                generated_text = result.get("response", "")
-                
-                # Log metrics
-                total_duration = result.get("total_duration", 0) / 1e9  # Convert to seconds
-                logger.info(f"✅ Generated {len(generated_text)} chars in {total_duration:.2f}s")
-                
-                return generated_text.strip()
-            else:
-                error_msg = f"Ollama returned status {response.status_code}: {response.text}"
-                logger.error(f"❌ {error_msg}")
-                raise Exception(error_msg)
-                
-        except requests.exceptions.Timeout:
-            error_msg = f"Ollama request timed out after {self.timeout}s"
-            logger.error(f"❌ {error_msg}")
-            raise Exception(error_msg)
-        except requests.exceptions.ConnectionError:
-            error_msg = f"Cannot connect to Ollama at {self.base_url}"
-            logger.error(f"❌ {error_msg}")
-            raise Exception(error_msg)
-        except Exception as e:
-            logger.error(f"❌ Ollama generation failed: {str(e)}")
-            raise
+        Returns:
+            Generated text
+            
+        Raises:
+            Exception: If generation fails
+        """
+        return "".join(self.generate_stream(prompt, max_tokens, temperature, use_cache, **kwargs)).strip()
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Async version of generate()
+        
+        Returns:
+            Generated text
+        """
+        parts = [part async for part in self.agenerate_stream(prompt, max_tokens, temperature, use_cache, **kwargs)]
+        return "".join(parts).strip()
+    
+    def close(self) -> None:
+        """Close the pooled sync HTTP client and the disk cache"""
+        self._client.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+    
+    async def aclose(self) -> None:
+        """Close both pooled HTTP clients and the disk cache"""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
     
     def generate_with_context(
         self,
@@ -185,22 +476,21 @@ class OllamaGenerator:
         Returns:
             Formatted context string
         """
-        context_parts = []
+        return "\n\n".join(self._format_one(i, doc) for i, doc in enumerate(documents, 1))
+    
+    @staticmethod
+    def _format_one(i: int, doc) -> str:
+        """Format a single context document (string or dict)"""
+        if isinstance(doc, dict):
+            # Extract text from dict
+            text = doc.get('content', doc.get('text', doc.get('document', str(doc))))
+        else:
+            text = str(doc)
         
-        for i, doc in enumerate(documents, 1):
-            if isinstance(doc, dict):
-                # Extract text from dict
-                text = doc.get('content', doc.get('text', doc.get('document', str(doc))))
-            else:
-                text = str(doc)
-            
-            # Limit length per document
-            if len(text) > 500:
-                text = text[:500] + "..."
-            
-            context_parts.append(f"[Document {i}]\n{text}")
+        # Limit length per document (~500 chars worth of tokens)
+        text = truncate_to_tokens(text, 500 // CHARS_PER_TOKEN)
         
-        return "\n\n".join(context_parts)
+        return f"[Document {i}]\n{text}"
     
     def get_model_info(self) -> Dict[str, Any]:
         """
@@ -210,8 +500,8 @@ class OllamaGenerator:
             Dictionary with model information
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/api/show",
+            response = self._client.post(
+                "/api/show",
                 json={"name": self.model_name},
                 timeout=5
             )
@@ -225,8 +515,9 @@ class OllamaGenerator:
             return {"error": str(e)}
 
 
-# Singleton instance
-_ollama_instance: Optional[OllamaGenerator] = None
+# Shared instances, one per (model, server)
+_ollama_instances: Dict[Tuple[str, str], OllamaGenerator] = {}
+_ollama_lock = threading.Lock()
 
 
 def get_ollama_generator(
@@ -234,7 +525,10 @@ def get_ollama_generator(
     base_url: str = "http://localhost:11434"
 ) -> OllamaGenerator:
     """
-    Get or create singleton Ollama generator
+    Get or create the shared Ollama generator for a model
+    
+    Every caller asking for the same model and server gets the same instance,
+    so they share its pooled HTTP clients and completion cache.
     
     Args:
         model_name: Name of the Ollama model
@@ -243,9 +537,25 @@ def get_ollama_generator(
     Returns:
         OllamaGenerator instance
     """
-    global _ollama_instance
+    key = (model_name, base_url)
+    instance = _ollama_instances.get(key)
+    if instance is not None:
+        return instance
     
-    if _ollama_instance is None:
-        _ollama_instance = OllamaGenerator(model_name=model_name, base_url=base_url)
+    with _ollama_lock:
+        # Re-check: another thread may have created it while we waited
+        instance = _ollama_instances.get(key)
+        if instance is None:
+            instance = OllamaGenerator(model_name=model_name, base_url=base_url)
+            _ollama_instances[key] = instance
+        return instance
+
+
+async def close_ollama_generator() -> None:
+    """Close the shared generators' sync and async HTTP clients (call on application shutdown)"""
+    with _ollama_lock:
+        instances = list(_ollama_instances.values())
+        _ollama_instances.clear()
     
-    return _ollama_instance
+    for instance in instances:
+        await instance.aclose()
@@ -2,6 +2,24 @@
 Legal Prompt Templates for LLM Answer Generation
 Intent-specific prompts for different types of legal queries
 """
+from string import Formatter
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Optional BPE tokenizer for token-accurate context truncation
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Rough chars-per-token ratio, used to convert character limits and as a fallback
+CHARS_PER_TOKEN = 4
+
+_tokenizer = None
+_tokenizer_failed = False
 
 # System prompt for legal assistant
 LEGAL_SYSTEM_PROMPT = """You are an expert legal AI assistant specializing in Indian law. Your role is to provide accurate, professional, and well-cited legal information based on provided documents.
@@ -134,6 +152,42 @@ Answer:"""
 }
 
 
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Pre-parse a str.format template into a renderer that only joins strings
+    
+    Args:
+        template: Template with {question}/{context}-style fields (no format specs)
+        
+    Returns:
+        Function taking the field values as keyword arguments
+    """
+    chunks = []
+    slots = []  # (index into chunks, field name)
+    for literal, field, _, _ in Formatter().parse(template):
+        if literal:
+            chunks.append(literal)
+        if field is not None:
+            slots.append((len(chunks), field))
+            chunks.append('')
+    chunks = tuple(chunks)
+    slots = tuple(slots)
+    
+    def render(**values: str) -> str:
+        out = list(chunks)
+        for index, field in slots:
+            out[index] = values[field]
+        return ''.join(out)
+    
+    return render
+
+
+# Templates parsed once at import; build_prompt is a lookup plus a join
+_COMPILED_PROMPTS: Dict[str, Callable[..., str]] = {
+    intent: _compile_template(template) for intent, template in LEGAL_PROMPTS.items()
+}
+
+
 def build_prompt(intent: str, question: str, context: str) -> str:
     """
     Build a complete prompt for LLM generation
@@ -147,49 +201,95 @@ def build_prompt(intent: str, question: str, context: str) -> str:
         Complete prompt string
     """
     # Get template for intent (fallback to unknown)
-    template = LEGAL_PROMPTS.get(intent, LEGAL_PROMPTS["unknown"])
+    render = _COMPILED_PROMPTS.get(intent, _COMPILED_PROMPTS["unknown"])
     
-    # Format template
-    prompt = template.format(
-        question=question,
-        context=context
-    )
+    return render(question=question, context=context)
+
+
+def _get_tokenizer():
+    """Load the cl100k_base encoding once (None if tiktoken is missing or unusable)"""
+    global _tokenizer, _tokenizer_failed
+    
+    if _tokenizer is None and TIKTOKEN_AVAILABLE and not _tokenizer_failed:
+        try:
+            _tokenizer = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # The encoding file is downloaded on first use; offline hosts fall back to chars
+            _tokenizer_failed = True
+            logger.warning(f"[WARN] tiktoken encoding unavailable, truncating by characters: {str(e)}")
+    return _tokenizer
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to a token budget, appending "..." when it was cut
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+        
+    Returns:
+        Truncated text (falls back to max_tokens * CHARS_PER_TOKEN characters
+        when no tokenizer is available)
+    """
+    tokenizer = _get_tokenizer()
+    
+    if tokenizer is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        return text[:max_chars] + "..." if len(text) > max_chars else text
+    
+    # Every token covers at least one character, so short texts can't be over budget
+    if len(text) <= max_tokens:
+        return text
+    
+    ids = tokenizer.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    
+    # Drop a partial multi-byte character left by the cut
+    return tokenizer.decode(ids[:max_tokens]).rstrip('\ufffd') + "..."
+
+
+def _format_llm_doc(i: int, doc: str, meta: dict, max_tokens: int) -> str:
+    """Format one retrieved document with its metadata header"""
+    # Build header with metadata
+    header = f"[Document {i}"
+    if 'act' in meta:
+        header += f" - {meta['act']}"
+    if 'section' in meta:
+        header += f", Section {meta['section']}"
+    header += "]"
     
-    return prompt
+    # Truncate document to its token budget
+    return f"{header}\n{truncate_to_tokens(doc, max_tokens)}"
 
 
-def format_context_for_llm(documents: list, metadatas: list, max_chars_per_doc: int = 600) -> str:
+def format_context_for_llm(
+    documents: list,
+    metadatas: list,
+    max_chars_per_doc: int = 600,
+    max_tokens_per_doc: Optional[int] = None
+) -> str:
     """
     Format retrieved documents into clean context for LLM
     
     Args:
         documents: List of document texts
         metadatas: List of metadata dicts
-        max_chars_per_doc: Maximum characters per document
+        max_chars_per_doc: Approximate per-document budget in characters
+            (converted to tokens at CHARS_PER_TOKEN)
+        max_tokens_per_doc: Per-document token budget (overrides max_chars_per_doc)
         
     Returns:
         Formatted context string
     """
-    context_parts = []
+    if max_tokens_per_doc is None:
+        max_tokens_per_doc = max_chars_per_doc // CHARS_PER_TOKEN
     
-    for i, (doc, meta) in enumerate(zip(documents, metadatas), 1):
-        # Build header with metadata
-        header = f"[Document {i}"
-        if 'act' in meta:
-            header += f" - {meta['act']}"
-        if 'section' in meta:
-            header += f", Section {meta['section']}"
-        header += "]"
-        
-        # Truncate document if too long
-        if len(doc) > max_chars_per_doc:
-            doc_text = doc[:max_chars_per_doc] + "..."
-        else:
-            doc_text = doc
-        
-        context_parts.append(f"{header}\n{doc_text}")
-    
-    return "\n\n".join(context_parts)
+    return "\n\n".join(
+        _format_llm_doc(i, doc, meta, max_tokens_per_doc)
+        for i, (doc, meta) in enumerate(zip(documents, metadatas), 1)
+    )
 
 
 # Shorter prompt for testing/debugging
@@ -4,12 +4,22 @@ FastAPI-based microservice for legal AI processing
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
+import time
+
+import anyio.to_thread
 
 from config import settings
 from routes import query
 from middleware import verify_internal_api_key
+from cache.redis_cache import close_async_cache
+from graph.neo4j_client import close_async_neo4j_client, get_neo4j_client
+from llm.ollama_generator import close_ollama_generator, get_ollama_generator
+from vectorstore.chroma_client import get_chroma_client
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +29,70 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _warm_ollama() -> None:
+    """Force Ollama to load the model with a one-token generation"""
+    try:
+        get_ollama_generator().generate("ready?", max_tokens=1, temperature=0.0, use_cache=False)
+        logger.info("✅ Ollama model warmed up")
+    except Exception as e:
+        logger.warning(f"⚠️ Ollama warm-up skipped: {str(e)}")
+
+
+def _warm_neo4j() -> None:
+    """Open the Neo4j pool and touch the Section index so its pages are cached"""
+    try:
+        client = get_neo4j_client()  # Runs test_connection on first creation
+        if client is None:
+            return
+        client.run_query(
+            "MATCH (s:Section) WHERE s.number = $number RETURN s.number LIMIT 1",
+            {"number": "438"}
+        )
+        logger.info("✅ Neo4j connection warmed up")
+    except Exception as e:
+        logger.warning(f"⚠️ Neo4j warm-up skipped: {str(e)}")
+
+
+def _warm_chroma() -> None:
+    """Open the shared ChromaDB client and load its embedding model once"""
+    try:
+        client = get_chroma_client(
+            persist_directory=settings.CHROMA_DB_PATH,
+            collection_name=settings.CHROMA_COLLECTION_NAME,
+            embedding_model=settings.MODEL_NAME
+        )
+        client.encode("warm up")
+        logger.info(f"✅ ChromaDB ready ({client.count()} documents)")
+    except Exception as e:
+        logger.warning(f"⚠️ ChromaDB warm-up skipped: {str(e)}")
+
+
+async def warm_up() -> None:
+    """Warm Neo4j, ChromaDB and (if enabled) Ollama concurrently so the first request avoids cold-start cost"""
+    start = time.perf_counter()
+    warmers = [_warm_neo4j, _warm_chroma]
+    if settings.WARMUP_LLM:
+        # Queries default to use_llm=False, so loading the model is opt-in
+        warmers.append(_warm_ollama)
+    await asyncio.gather(*(asyncio.to_thread(warm) for warm in warmers))
+    logger.info(f"🔥 Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+
+def _configure_threadpools() -> None:
+    """
+    Size the thread pools used for blocking work in async handlers
+    
+    asyncio.to_thread (our routes/pipeline) uses the loop's default executor and
+    run_in_threadpool (sync endpoints) uses anyio's limiter; both default to ~40.
+    """
+    size = settings.THREADPOOL_SIZE or max(40, (os.cpu_count() or 1) * 10)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=size, thread_name_prefix="ai-engine")
+    )
+    logger.info(f"Thread pool size: {size}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -29,10 +103,18 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {'Development' if settings.DEBUG else 'Production'}")
     logger.info(f"Running on {settings.API_HOST}:{settings.API_PORT}")
     
+    _configure_threadpools()
+    
+    if settings.WARMUP_ON_STARTUP:
+        await warm_up()
+    
     yield
     
     # Shutdown
     logger.info("🛑 AI Engine shutting down...")
+    await close_async_neo4j_client()
+    await close_async_cache()
+    await close_ollama_generator()
 
 
 # Create FastAPI application
@@ -4,25 +4,37 @@ Validates requests from backend using INTERNAL_API_KEY
 """
 from fastapi import Request, HTTPException, status
 from config import settings
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Public endpoints: exact paths answered by a set lookup, docs UIs by prefix
+_PUBLIC_EXACT = frozenset({"/", "/health", "/openapi.json"})
+_PUBLIC_PREFIXES = ("/docs", "/redoc")
+
+# Expected key frozen into bytes once, so requests skip the settings lookup
+_EXPECTED_KEY_BYTES = settings.INTERNAL_API_KEY.encode("utf-8") if settings.INTERNAL_API_KEY else None
+if _EXPECTED_KEY_BYTES is None:
+    logger.error("INTERNAL_API_KEY not configured in AI Engine! Protected endpoints will return 500")
+
+
 async def verify_internal_api_key(request: Request, call_next):
     """
     Middleware to verify internal API key from backend
     
     Public endpoints (no auth required):
+    - /
     - /health
-    - /docs
     - /openapi.json
+    - /docs, /redoc (and their assets)
     
     Protected endpoints (require API key):
     - /api/*
     """
     # Allow public endpoints
-    public_paths = ["/health", "/docs", "/openapi.json", "/redoc"]
-    if any(request.url.path.startswith(path) for path in public_paths):
+    path = request.url.path
+    if path in _PUBLIC_EXACT or path.startswith(_PUBLIC_PREFIXES):
         return await call_next(request)
     
     # Check API key for protected endpoints
@@ -35,14 +47,14 @@ async def verify_internal_api_key(request: Request, call_next):
             detail="Missing X-Internal-API-Key header"
         )
     
-    if not settings.INTERNAL_API_KEY:
-        logger.error("INTERNAL_API_KEY not configured in AI Engine!")
+    if _EXPECTED_KEY_BYTES is None:  # logged once at import
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Server configuration error"
         )
     
-    if api_key != settings.INTERNAL_API_KEY:
+    # Constant-time comparison so response timing doesn't leak the key
+    if not hmac.compare_digest(api_key.encode("utf-8"), _EXPECTED_KEY_BYTES):
         logger.warning(f"Invalid API key attempt for {request.url.path}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -9,15 +9,23 @@ Pipeline Stages:
 4. Generate Answer - Create structured response with sources
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 from enum import Enum
+import asyncio
+import copy
 import logging
 import re
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
 
-from vectorstore.chroma_client import ChromaClient
-from embeddings.embedder import Embedder
+import numpy as np
+
+from vectorstore.chroma_client import ChromaClient, get_chroma_client
+from embeddings.embedder import Embedder, get_embedder
 from config import settings
 
 # Configure logger FIRST (before using it in try-except blocks)
@@ -25,7 +33,7 @@ logger = logging.getLogger(__name__)
 
 # Optional LLM imports (lazy loaded)
 try:
-    from llm.ollama_generator import OllamaGenerator
+    from llm.ollama_generator import get_ollama_generator
     from llm.prompts import build_prompt, format_context_for_llm
     LLM_AVAILABLE = True
 except ImportError:
@@ -34,7 +42,7 @@ except ImportError:
 
 # Optional Graph imports (lazy loaded)
 try:
-    from graph.graph_queries import fetch_legal_graph_facts, build_graph_context
+    from graph.graph_queries import fetch_legal_graph_facts, afetch_legal_graph_facts, build_graph_context
     GRAPH_AVAILABLE = True
 except ImportError:
     GRAPH_AVAILABLE = False
@@ -42,12 +50,67 @@ except ImportError:
 
 # Optional Cache imports (lazy loaded)
 try:
-    from cache import get_cache, CachePrefix, CacheTTL
+    from cache import AsyncRedisCache, get_cache, get_async_cache, CachePrefix, CacheTTL
     CACHE_AVAILABLE = True
 except ImportError:
     CACHE_AVAILABLE = False
     logger.warning("Cache module not available, proceeding without caching")
 
+# Act / section mentions used for metadata filtering in decide_retrieval_strategy
+_ACT_RE = re.compile(
+    r'\b(IPC|CrPC|CPC|Indian Penal Code|Criminal Procedure Code|Civil Procedure Code)\b',
+    re.IGNORECASE
+)
+_SECTION_RE = re.compile(r'\bsection\s+\d+\b', re.IGNORECASE)
+
+# Canonical act names, so "IPC" and "Indian Penal Code" compare equal
+_ACT_ALIASES = {
+    'indian penal code': 'ipc',
+    'criminal procedure code': 'crpc',
+    'civil procedure code': 'cpc',
+}
+
+# Section / clause numbers (e.g. 302, 498A) that must match for a semantic cache hit
+_NUMBER_RE = re.compile(r'\b\d+[A-Za-z]?\b')
+
+# Punctuation runs, replaced by a space when normalizing queries for cache keys
+_PUNCT_RE = re.compile(r'[^\w\s]+')
+
+# Distinct lowercased queries whose intent analysis is memoized per pipeline
+INTENT_CACHE_SIZE = 4096
+
+# Distinct queries whose embedding is memoized per pipeline
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Bumped when the cached PipelineResult payload changes shape, so stale entries are never read
+RESULT_CACHE_VERSION = 2
+
+# In-process result cache checked before Redis (entries, seconds)
+RESULT_L1_SIZE = 512
+RESULT_L1_TTL = 300
+
+# Semantic cache: near-duplicate questions (cosine >= threshold between normalized
+# query embeddings) reuse a recent result; same TTL as the L1
+SEMANTIC_CACHE_SIZE = 512
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# Worker threads for graph enrichment overlapping retrieval in process_query
+GRAPH_ENRICH_WORKERS = 4
+_graph_executor: Optional[ThreadPoolExecutor] = None
+_graph_executor_lock = threading.Lock()
+
+
+def _get_graph_executor() -> ThreadPoolExecutor:
+    """Get or create the shared graph-enrichment thread pool"""
+    global _graph_executor
+    if _graph_executor is None:
+        with _graph_executor_lock:
+            if _graph_executor is None:
+                _graph_executor = ThreadPoolExecutor(
+                    max_workers=GRAPH_ENRICH_WORKERS, thread_name_prefix="graph-enrich"
+                )
+    return _graph_executor
+
 
 class QueryIntent(str, Enum):
     """Types of query intents for legal questions"""
@@ -60,7 +123,7 @@ class QueryIntent(str, Enum):
     UNKNOWN = "unknown"           # Cannot determine intent
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IntentAnalysis:
     """Result of intent detection"""
     intent: QueryIntent
@@ -69,7 +132,7 @@ class IntentAnalysis:
     keywords_matched: List[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetrievalStrategy:
     """Strategy for document retrieval"""
     num_documents: int
@@ -78,7 +141,7 @@ class RetrievalStrategy:
     metadata_filter: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetrievedContext:
     """Retrieved documents with metadata"""
     documents: List[str]
@@ -88,7 +151,7 @@ class RetrievedContext:
     relevance_scores: List[float]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PipelineResult:
     """Final result from the adaptive RAG pipeline"""
     question: str
@@ -120,9 +183,11 @@ class AdaptiveRAGPipeline:
         chroma_client: Optional[ChromaClient] = None,
         embedder: Optional[Embedder] = None,
         neo4j_client = None,
+        async_neo4j_client = None,
         use_llm: bool = False,
         llm_model: str = "llama3.2:3b",
-        use_cache: bool = True
+        use_cache: bool = True,
+        eager_init: bool = True
     ):
         """
         Initialize the Adaptive RAG Pipeline
@@ -131,21 +196,40 @@ class AdaptiveRAGPipeline:
             chroma_client: Optional ChromaDB client (will create if not provided)
             embedder: Optional embedder instance (will create if not provided)
             neo4j_client: Optional Neo4j client for graph enrichment (will skip if not provided)
+            async_neo4j_client: Optional AsyncNeo4jClient used by aprocess_query
             use_llm: Whether to use LLM for answer generation (default: False)
             llm_model: Name of the Ollama model to use (default: llama3.2:3b)
             use_cache: Whether to use Redis caching (default: True)
+            eager_init: Load the embedder and connect ChromaDB now, with a warm-up
+                encode, instead of on the first query (default: True)
         """
         self.chroma_client = chroma_client
         self.embedder = embedder
         self.neo4j_client = neo4j_client
-        self.use_graph = neo4j_client is not None and GRAPH_AVAILABLE
+        self.async_neo4j_client = async_neo4j_client
+        self.use_graph = (neo4j_client is not None or async_neo4j_client is not None) and GRAPH_AVAILABLE
         self.use_llm = use_llm and LLM_AVAILABLE
         self.llm_model = llm_model
         self.llm_generator = None  # Lazy loaded
         
+        # L1 result cache: normalized query -> (expires_at, result), LRU-ordered
+        self._l1: "OrderedDict[str, Tuple[float, PipelineResult]]" = OrderedDict()
+        self._l1_lock = threading.Lock()
+        
+        # Semantic cache ring buffer: row i of _sem_matrix is the embedding for
+        # _sem_entries[i] = (result options, legal refs, expires_at, result); matrix sized on first put
+        self._sem_matrix: Optional[np.ndarray] = None
+        self._sem_entries: List[Optional[Tuple[str, frozenset, float, PipelineResult]]] = [None] * SEMANTIC_CACHE_SIZE
+        self._sem_next = 0
+        self._sem_lock = threading.Lock()
+        
+        # Repeat queries skip the encoder entirely
+        self._embed_query = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(self._embed_query_uncached)
+        
         # Initialize cache
         self.use_cache = use_cache and CACHE_AVAILABLE
         self.cache = None
+        self.async_cache = None  # AsyncRedisCache for the async paths, connected on first use
         if self.use_cache:
             try:
                 self.cache = get_cache()
@@ -233,29 +317,100 @@ class AdaptiveRAGPipeline:
             QueryIntent.UNKNOWN: (3, 5)            # Default moderate retrieval
         }
         
+        self._compile_intent_matcher()
+        
+        if eager_init:
+            self._warm_clients()
+        
         logger.info(
             f"AdaptiveRAGPipeline initialized (LLM: {'enabled' if self.use_llm else 'disabled'}, "
             f"Graph: {'enabled' if self.use_graph else 'disabled'})"
         )
     
     def _ensure_clients(self) -> None:
-        """Ensure ChromaDB and Embedder clients are initialized"""
+        """Ensure ChromaDB and Embedder clients are initialized (shared process-wide singletons)"""
         if self.chroma_client is None:
-            self.chroma_client = ChromaClient(
+            self.chroma_client = get_chroma_client(
                 persist_directory=settings.CHROMA_DB_PATH,
                 collection_name=settings.CHROMA_COLLECTION_NAME,
                 embedding_model=settings.MODEL_NAME
             )
-            self.chroma_client.connect()
             logger.info("ChromaDB client initialized")
         
         if self.embedder is None:
-            self.embedder = Embedder(model_name=settings.MODEL_NAME)
-            self.embedder.load_model()
+            self.embedder = get_embedder(
+                model_name=settings.MODEL_NAME,
+                device=settings.EMBEDDING_DEVICE or None,
+                precision=settings.EMBEDDING_PRECISION,
+                use_onnx=settings.EMBEDDING_USE_ONNX
+            )
             logger.info("Embedder initialized")
     
+    def _warm_clients(self) -> None:
+        """Initialize clients and run one dummy encode so the first query pays no load cost"""
+        try:
+            self._ensure_clients()
+            self.embedder.encode_single("warm up")
+            logger.info("✅ Embedder and ChromaDB warmed up")
+        except Exception as e:
+            # First query retries the lazy path
+            logger.warning(f"⚠️ Eager client init failed, will retry on first query: {str(e)}")
+    
+    def _embed_query_uncached(self, query: str) -> List[float]:
+        """Embed a query with the pipeline's own model (memoized by _embed_query)"""
+        self._ensure_clients()
+        return self.embedder.encode_single(query, normalize_embeddings=True).tolist()
+    
     # ==================== STAGE 1: DETECT INTENT ====================
     
+    def _compile_intent_matcher(self) -> None:
+        """
+        Invert self.intent_patterns into keyword -> intent lookup tables
+        
+        detect_intent scans the flat keyword vocabulary against the query once and
+        then only touches the intents owning the keywords that were found, instead
+        of walking every intent's keyword list per query.
+        
+        Call again after changing self.intent_patterns.
+        """
+        owners = {}      # keyword -> [(intent, position in that intent's keyword list)]
+        excluders = {}   # keyword -> [intents it excludes]
+        for intent, pattern_data in self.intent_patterns.items():
+            for position, keyword in enumerate(pattern_data['keywords']):
+                owners.setdefault(keyword, []).append((intent, position))
+            for keyword in pattern_data.get('exclude_if', ()):
+                excluders.setdefault(keyword, []).append(intent)
+        
+        self._intent_vocabulary = tuple(owners.keys() | excluders.keys())
+        self._keyword_owners = {keyword: tuple(entries) for keyword, entries in owners.items()}
+        self._keyword_excluders = {keyword: tuple(entries) for keyword, entries in excluders.items()}
+        
+        # (intent, keyword count, weight, multi_word) by priority (1 = highest, 6 = lowest);
+        # ties in score go to the earlier one
+        self._sorted_patterns = tuple(
+            (intent, len(pattern_data['keywords']), pattern_data['weight'], pattern_data.get('multi_word', False))
+            for intent, pattern_data in sorted(
+                self.intent_patterns.items(),
+                key=lambda item: item[1].get('priority', 99)
+            )
+        )
+        
+        # _ceiling_from[k]: highest score any intent from row k on could reach
+        # (all of its keywords matched), so the scan can stop once it is beaten
+        ceilings = [
+            weight * (1 + 0.1 * sum(len(k.split()) for k in self.intent_patterns[intent]['keywords']) / n_keywords)
+            if multi_word else weight
+            for intent, n_keywords, weight, multi_word in self._sorted_patterns
+        ]
+        self._ceiling_from = tuple(max(ceilings[k:]) for k in range(len(ceilings)))
+        
+        self._intent_priority = {
+            intent: pattern_data.get('priority', 6) for intent, pattern_data in self.intent_patterns.items()
+        }
+        
+        # Detection is a pure function of the lowercased query; a fresh cache per compile
+        self._intent_cache = lru_cache(maxsize=INTENT_CACHE_SIZE)(self._detect_intent_uncached)
+    
     def detect_intent(self, query: str) -> IntentAnalysis:
         """
         Stage 1: Detect the intent of the user's query
@@ -266,49 +421,58 @@ class AdaptiveRAGPipeline:
         Returns:
             IntentAnalysis with detected intent and confidence
         """
-        query_lower = query.lower()
+        analysis = self._intent_cache(query.lower())
         
-        # Sort intents by priority (1 = highest, 6 = lowest)
-        sorted_intents = sorted(
-            self.intent_patterns.items(),
-            key=lambda x: x[1].get('priority', 99)
-        )
+        logger.info("Intent detected: %s (confidence: %.2f)", analysis.intent, analysis.confidence)
+        
+        # Hand out a copy so callers can't mutate the memoized keyword list
+        return replace(analysis, keywords_matched=list(analysis.keywords_matched))
+    
+    def _detect_intent_uncached(self, query_lower: str) -> IntentAnalysis:
+        """Intent detection proper (memoized per query by detect_intent)"""
+        # One pass over the vocabulary, then group hits by the intents that own them
+        hits = {}
+        excluded = set()
+        for keyword in self._intent_vocabulary:
+            if keyword in query_lower:
+                for intent, position in self._keyword_owners.get(keyword, ()):
+                    hits.setdefault(intent, []).append((position, keyword))
+                excluded.update(self._keyword_excluders.get(keyword, ()))
         
         intent_scores = {}
         matched_keywords = {}
         
-        # Check each intent in priority order
-        for intent, pattern_data in sorted_intents:
-            keywords = pattern_data['keywords']
-            weight = pattern_data['weight']
-            matches = []
+        # Score matched intents in priority order
+        best_so_far = 0.0
+        for row, (intent, n_keywords, weight, multi_word) in enumerate(self._sorted_patterns):
+            # No remaining intent can beat the leader
+            if best_so_far > self._ceiling_from[row]:
+                break
+            
+            if intent not in hits:
+                continue
             
             # Check for exclusion patterns (for definitional)
-            if 'exclude_if' in pattern_data:
-                exclude_keywords = pattern_data['exclude_if']
-                # If any exclusion keyword is found, skip this intent
-                if any(excl in query_lower for excl in exclude_keywords):
-                    logger.debug(f"Skipping {intent} due to exclusion pattern")
-                    continue
+            if intent in excluded:
+                logger.debug("Skipping %s due to exclusion pattern", intent)
+                continue
             
-            # Match keywords
-            for keyword in keywords:
-                if keyword in query_lower:
-                    matches.append(keyword)
+            # Matched keywords in declaration order
+            matches = [keyword for _, keyword in sorted(hits[intent])]
             
-            if matches:
-                # Calculate score
-                # For multi-word patterns, exact match gets higher score
-                if pattern_data.get('multi_word', False):
-                    # Give bonus for longer matches
-                    match_lengths = [len(m.split()) for m in matches]
-                    avg_length = sum(match_lengths) / len(match_lengths)
-                    score = (len(matches) / len(keywords)) * weight * (1 + avg_length * 0.1)
-                else:
-                    score = (len(matches) / len(keywords)) * weight
-                
-                intent_scores[intent] = score
-                matched_keywords[intent] = matches
+            # Calculate score
+            # For multi-word patterns, exact match gets higher score
+            if multi_word:
+                # Give bonus for longer matches
+                match_lengths = [len(m.split()) for m in matches]
+                avg_length = sum(match_lengths) / len(match_lengths)
+                score = (len(matches) / n_keywords) * weight * (1 + avg_length * 0.1)
+            else:
+                score = (len(matches) / n_keywords) * weight
+            
+            intent_scores[intent] = score
+            matched_keywords[intent] = matches
+            best_so_far = max(best_so_far, score)
         
         # Determine best intent
         if intent_scores:
@@ -318,7 +482,7 @@ class AdaptiveRAGPipeline:
             
             # Calculate confidence based on score and priority
             # Higher priority intents get confidence boost
-            priority = self.intent_patterns[best_intent].get('priority', 6)
+            priority = self._intent_priority[best_intent]
             priority_boost = (7 - priority) * 0.05  # 0.30 boost for priority 1, 0.05 for priority 6
             
             confidence = min(best_score + priority_boost, 0.95)  # Cap at 0.95
@@ -331,8 +495,6 @@ class AdaptiveRAGPipeline:
             keywords_found = []
             reasoning = "No clear intent pattern detected, using default strategy"
         
-        logger.info(f"Intent detected: {best_intent} (confidence: {confidence:.2f})")
-        
         return IntentAnalysis(
             intent=best_intent,
             confidence=confidence,
@@ -381,10 +543,7 @@ class AdaptiveRAGPipeline:
         metadata_filter = None
         
         # Check for IPC/CrPC/Act mentions
-        act_pattern = r'\b(IPC|CrPC|CPC|Indian Penal Code|Criminal Procedure Code|Civil Procedure Code)\b'
-        section_pattern = r'\bsection\s+\d+\b'
-        
-        if re.search(act_pattern, query, re.IGNORECASE):
+        if _ACT_RE.search(query):
             use_metadata_filter = True
             # Could add actual filter logic here
         
@@ -420,15 +579,37 @@ class AdaptiveRAGPipeline:
         """
         self._ensure_clients()
         
-        # Query ChromaDB
-        results = self.chroma_client.query(
-            query_texts=[query],
+        # Query ChromaDB with our own embedding, so Chroma never runs (or loads)
+        # its embedding function for the query; concurrent requests share one search
+        results = self.chroma_client.query_one(
+            self._embed_query(query),
             n_results=strategy.num_documents,
             where=strategy.metadata_filter
         )
         
+        return self._context_from_results(results, 0, strategy)
+    
+    def _context_from_results(
+        self,
+        results: Dict[str, Any],
+        row: int,
+        strategy: RetrievalStrategy
+    ) -> RetrievedContext:
+        """
+        Score and filter one query's row of a ChromaDB query result
+        
+        Args:
+            results: ChromaDB query result (one row per query embedding)
+            row: Index of the query within the result
+            strategy: Retrieval strategy for that query
+            
+        Returns:
+            RetrievedContext with at most strategy.num_documents documents
+        """
+        n = strategy.num_documents
+        
         # Extract results
-        if not results['ids'][0]:
+        if not results['ids'][row]:
             logger.warning("No documents retrieved")
             return RetrievedContext(
                 documents=[],
@@ -438,41 +619,32 @@ class AdaptiveRAGPipeline:
                 relevance_scores=[]
             )
         
-        documents = results['documents'][0]
-        metadatas = results['metadatas'][0]
-        distances = results['distances'][0]
-        ids = results['ids'][0]
+        # Rows are sorted by distance, so a batch queried with a larger
+        # n_results is cut back to this query's own top-n
+        documents = results['documents'][row][:n]
+        metadatas = results['metadatas'][row][:n]
+        distances = results['distances'][row][:n]
+        ids = results['ids'][row][:n]
         
         # Convert distances to relevance scores (0-1, higher is better)
-        # ChromaDB uses L2 distance, smaller is better
-        relevance_scores = [max(0.0, 1.0 - (dist / 2.0)) for dist in distances]
+        # ChromaDB uses squared L2 distance, which is 2 - 2*cosine for unit vectors
+        scores = np.maximum(0.0, 1.0 - np.asarray(distances, dtype=np.float64) * 0.5)
         
         # Filter by minimum relevance threshold
-        filtered_data = []
-        for i, score in enumerate(relevance_scores):
-            if score >= strategy.min_relevance_threshold:
-                filtered_data.append((documents[i], metadatas[i], distances[i], ids[i], score))
+        keep = np.flatnonzero(scores >= strategy.min_relevance_threshold).tolist()
         
         # If filtering removed too many, keep at least 1
-        if not filtered_data and documents:
-            filtered_data.append((
-                documents[0], metadatas[0], distances[0], ids[0], relevance_scores[0]
-            ))
-        
-        # Unpack filtered data
-        if filtered_data:
-            docs, metas, dists, doc_ids, scores = zip(*filtered_data)
-            logger.info(f"Retrieved {len(docs)} documents (filtered from {len(documents)})")
-        else:
-            docs, metas, dists, doc_ids, scores = [], [], [], [], []
-            logger.warning("All documents filtered out by relevance threshold")
+        if not keep:
+            keep = [0]
+        
+        logger.info(f"Retrieved {len(keep)} documents (filtered from {len(documents)})")
         
         return RetrievedContext(
-            documents=list(docs),
-            metadatas=list(metas),
-            distances=list(dists),
-            ids=list(doc_ids),
-            relevance_scores=list(scores)
+            documents=[documents[i] for i in keep],
+            metadatas=[metadatas[i] for i in keep],
+            distances=[distances[i] for i in keep],
+            ids=[ids[i] for i in keep],
+            relevance_scores=scores[keep].tolist()
         )
     
     # ==================== STAGE 4: GENERATE ANSWER ====================
@@ -518,14 +690,17 @@ class AdaptiveRAGPipeline:
             answer = self._generate_rulebased_answer(query, sources, intent_analysis)
         
         # Calculate overall confidence
-        top_source = sources[0]
-        confidence = (top_source['relevance_score'] + intent_analysis.confidence) / 2
-        confidence = round(confidence, 4)
+        confidence = self._answer_confidence(sources, intent_analysis)
         
         logger.info(f"Generated answer with confidence: {confidence}")
         
         return answer, confidence, sources
     
+    @staticmethod
+    def _answer_confidence(sources: List[Dict[str, Any]], intent_analysis: IntentAnalysis) -> float:
+        """Overall confidence: mean of the top source's relevance and the intent confidence"""
+        return round((sources[0]['relevance_score'] + intent_analysis.confidence) / 2, 4)
+    
     def _build_sources_list(self, context: RetrievedContext) -> List[Dict[str, Any]]:
         """Build sources list from retrieved context"""
         sources = []
@@ -535,9 +710,10 @@ class AdaptiveRAGPipeline:
             context.metadatas,
             context.relevance_scores
         )):
-            # Extract title from document (first line or ID)
-            title = document.split('\n')[0] if '\n' in document else doc_id
-            title = title[:100]  # Limit title length
+            # Extract title from document (first line or ID); partition stops at
+            # the first newline instead of splitting the whole document
+            first_line, newline, _ = document.partition('\n')
+            title = (first_line if newline else doc_id)[:100]  # Limit title length
             
             # Create excerpt
             excerpt = document[:300] + "..." if len(document) > 300 else document
@@ -554,10 +730,10 @@ class AdaptiveRAGPipeline:
         return sources
     
     def _ensure_llm_generator(self) -> None:
-        """Lazy load Ollama generator"""
+        """Lazy load the shared Ollama generator (closed at app shutdown, not per pipeline)"""
         if self.llm_generator is None:
             logger.info(f"Initializing Ollama generator with model: {self.llm_model}")
-            self.llm_generator = OllamaGenerator(model_name=self.llm_model)
+            self.llm_generator = get_ollama_generator(model_name=self.llm_model)
             
             # Check health
             if not self.llm_generator.check_health():
@@ -572,6 +748,24 @@ class AdaptiveRAGPipeline:
         """Generate answer using Ollama LLM"""
         self._ensure_llm_generator()
         
+        prompt = self._build_llm_prompt(query, context, intent_analysis)
+        
+        # Generate with Ollama
+        answer = self.llm_generator.generate(
+            prompt=prompt,
+            max_tokens=512,
+            temperature=0.3  # Lower temperature for factual legal answers
+        )
+        
+        return answer
+    
+    def _build_llm_prompt(
+        self,
+        query: str,
+        context: RetrievedContext,
+        intent_analysis: IntentAnalysis
+    ) -> str:
+        """Build the intent-specific LLM prompt from retrieved context"""
         # Format context for LLM
         context_text = format_context_for_llm(
             context.documents,
@@ -586,14 +780,7 @@ class AdaptiveRAGPipeline:
             context=context_text
         )
         
-        # Generate with Ollama
-        answer = self.llm_generator.generate(
-            prompt=prompt,
-            max_tokens=512,
-            temperature=0.3  # Lower temperature for factual legal answers
-        )
-        
-        return answer
+        return prompt
     
     def _generate_rulebased_answer(
         self,
@@ -628,13 +815,15 @@ class AdaptiveRAGPipeline:
         all_sources: List[Dict[str, Any]]
     ) -> str:
         """Generate answer for definitional queries"""
-        answer = f"Based on {top_source['metadata'].get('source', 'legal documents')}:\n\n"
-        answer += top_source['excerpt']
+        parts = [
+            f"Based on {top_source['metadata'].get('source', 'legal documents')}:\n\n",
+            top_source['excerpt']
+        ]
         
         if len(all_sources) > 1:
-            answer += f"\n\nRelated provisions found in {len(all_sources) - 1} additional source(s)."
+            parts.append(f"\n\nRelated provisions found in {len(all_sources) - 1} additional source(s).")
         
-        return answer
+        return "".join(parts)
     
     def _generate_factual_answer(
         self,
@@ -644,19 +833,20 @@ class AdaptiveRAGPipeline:
     ) -> str:
         """Generate answer for factual queries"""
         metadata = top_source['metadata']
-        answer = f"According to {metadata.get('source', 'legal documents')}"
+        parts = [f"According to {metadata.get('source', 'legal documents')}"]
         
         if 'section' in metadata:
-            answer += f", Section {metadata['section']}"
+            parts.append(f", Section {metadata['section']}")
         if 'act' in metadata:
-            answer += f" of {metadata['act']}"
+            parts.append(f" of {metadata['act']}")
         
-        answer += ":\n\n" + top_source['excerpt']
+        parts.append(":\n\n")
+        parts.append(top_source['excerpt'])
         
         if len(all_sources) > 1:
-            answer += f"\n\n{len(all_sources) - 1} other relevant provision(s) also apply."
+            parts.append(f"\n\n{len(all_sources) - 1} other relevant provision(s) also apply.")
         
-        return answer
+        return "".join(parts)
     
     def _generate_procedural_answer(
         self,
@@ -665,13 +855,13 @@ class AdaptiveRAGPipeline:
         all_sources: List[Dict[str, Any]]
     ) -> str:
         """Generate answer for procedural queries"""
-        answer = f"**Procedure:**\n\n{top_source['excerpt']}"
+        parts = ["**Procedure:**\n\n", top_source['excerpt']]
         
         if len(all_sources) > 1:
-            answer += f"\n\n**Additional Steps/Requirements:**\n"
-            answer += f"Refer to {len(all_sources) - 1} additional source(s) for complete procedure."
+            parts.append("\n\n**Additional Steps/Requirements:**\n")
+            parts.append(f"Refer to {len(all_sources) - 1} additional source(s) for complete procedure.")
         
-        return answer
+        return "".join(parts)
     
     def _generate_comparative_answer(
         self,
@@ -679,16 +869,16 @@ class AdaptiveRAGPipeline:
         all_sources: List[Dict[str, Any]]
     ) -> str:
         """Generate answer for comparative queries"""
-        answer = "**Comparison based on legal provisions:**\n\n"
+        parts = ["**Comparison based on legal provisions:**\n\n"]
         
         for i, source in enumerate(all_sources[:3], 1):  # Top 3 sources
             title = source['metadata'].get('source', f'Source {i}')
-            answer += f"**{i}. {title}:**\n{source['excerpt'][:200]}...\n\n"
+            parts.append(f"**{i}. {title}:**\n{source['excerpt'][:200]}...\n\n")
         
         if len(all_sources) > 3:
-            answer += f"*{len(all_sources) - 3} more provisions available for review.*"
+            parts.append(f"*{len(all_sources) - 3} more provisions available for review.*")
         
-        return answer
+        return "".join(parts)
     
     def _generate_exploratory_answer(
         self,
@@ -696,17 +886,19 @@ class AdaptiveRAGPipeline:
         all_sources: List[Dict[str, Any]]
     ) -> str:
         """Generate answer for exploratory queries"""
-        answer = "**Comprehensive Overview:**\n\n"
-        answer += f"Found {len(all_sources)} relevant legal provisions:\n\n"
+        parts = [
+            "**Comprehensive Overview:**\n\n",
+            f"Found {len(all_sources)} relevant legal provisions:\n\n"
+        ]
         
         for i, source in enumerate(all_sources[:4], 1):  # Top 4 sources
             title = source['metadata'].get('source', f'Provision {i}')
-            answer += f"**{i}. {title}**\n{source['excerpt'][:250]}...\n\n"
+            parts.append(f"**{i}. {title}**\n{source['excerpt'][:250]}...\n\n")
         
         if len(all_sources) > 4:
-            answer += f"*{len(all_sources) - 4} additional provisions available.*"
+            parts.append(f"*{len(all_sources) - 4} additional provisions available.*")
         
-        return answer
+        return "".join(parts)
     
     def _generate_default_answer(
         self,
@@ -715,47 +907,393 @@ class AdaptiveRAGPipeline:
         all_sources: List[Dict[str, Any]]
     ) -> str:
         """Generate default answer for unknown intent"""
-        answer = f"**Relevant Legal Information:**\n\n{top_source['excerpt']}"
+        parts = ["**Relevant Legal Information:**\n\n", top_source['excerpt']]
         
         if len(all_sources) > 1:
-            answer += f"\n\nFound {len(all_sources)} relevant provision(s)."
+            parts.append(f"\n\nFound {len(all_sources)} relevant provision(s).")
         
-        return answer
+        return "".join(parts)
     
     # ==================== MAIN PIPELINE ====================
     
-    def process_query(self, query: str, **kwargs) -> PipelineResult:
+    @staticmethod
+    def _normalize_query(query: str) -> str:
         """
-        Main pipeline: Process a query through all 4 stages with caching
+        Canonical form of a query for cache keys: lowercased, punctuation replaced
+        by spaces, whitespace collapsed ("What is IPC 302?" == "what  is ipc 302 ?")
+        
+        Punctuation becomes a space rather than being deleted, so "3.02" and
+        "302" stay distinct.
+        """
+        return ' '.join(_PUNCT_RE.sub(' ', query.lower()).split())
+    
+    @classmethod
+    def _result_cache_key(cls, query: str, kwargs: Dict[str, Any]) -> str:
+        """Normalized query plus result-shaping options"""
+        key = cls._normalize_query(query)
+        if 'max_docs' in kwargs:
+            key += f"|max_docs={kwargs['max_docs']}"
+        if not kwargs.get('return_answer', True):
+            key += "|sources_only"
+        return key
+    
+    def _l1_get(self, key: str) -> Optional[PipelineResult]:
+        """Look up a result in the L1 cache (None if missing or expired)"""
+        with self._l1_lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return result
+    
+    @staticmethod
+    def _private_copy(result: PipelineResult, **changes: Any) -> PipelineResult:
+        """
+        Copy a result with its own mutable fields (sources, graph references,
+        strategy, metadata), so cached entries and callers never share them
+        """
+        for name in ('sources', 'graph_references', 'retrieval_strategy', 'metadata'):
+            if name not in changes:
+                changes[name] = copy.deepcopy(getattr(result, name))
+        return replace(result, **changes)
+    
+    def _l1_put(self, key: str, result: PipelineResult) -> None:
+        """Store a private copy of a result, evicting the least recently used entry"""
+        result = self._private_copy(result)
+        with self._l1_lock:
+            self._l1[key] = (time.monotonic() + RESULT_L1_TTL, result)
+            self._l1.move_to_end(key)
+            if len(self._l1) > RESULT_L1_SIZE:
+                self._l1.popitem(last=False)
+    
+    @staticmethod
+    def _legal_refs(query: str) -> frozenset:
+        """
+        Acts and section numbers a query mentions
+        
+        Embeddings barely separate "Section 302 IPC" from "Section 304 IPC", so a
+        semantic cache hit also requires these to match exactly.
+        """
+        acts = (match.lower() for match in _ACT_RE.findall(query))
+        return frozenset(
+            [_ACT_ALIASES.get(act, act) for act in acts]
+            + [number.upper() for number in _NUMBER_RE.findall(query)]
+        )
+    
+    def _semantic_get(self, query: str, cache_key: str) -> Optional[Tuple[PipelineResult, float]]:
+        """
+        Find a cached result for a near-duplicate question that cites the same
+        acts and sections
         
         Args:
-            query: User's legal question
-            **kwargs: Additional options (max_docs, force_intent, bypass_cache, etc.)
+            query: User's question
+            cache_key: Its result cache key (entries must share its options suffix)
             
         Returns:
-            PipelineResult with structured answer and metadata
+            Tuple of (cached result, cosine similarity), or None
         """
-        start_time = time.time()
+        if self._sem_matrix is None:
+            return None
+        
+        try:
+            # Memoized, and reused by retrieval on a miss
+            vector = np.asarray(self._embed_query(query), dtype=np.float32)
+        except Exception as e:
+            logger.debug(f"[CACHE] Semantic lookup skipped: {str(e)}")
+            return None
+        
+        options = cache_key.partition('|')[2]
+        refs = self._legal_refs(query)
+        now = time.monotonic()
+        with self._sem_lock:
+            # Embeddings are unit-length, so one matrix-vector product gives every cosine
+            scores = self._sem_matrix @ vector
+            candidates = np.flatnonzero(scores >= SEMANTIC_CACHE_THRESHOLD)
+            for row in candidates[np.argsort(-scores[candidates])]:  # Best match first
+                entry = self._sem_entries[row]
+                if entry is not None and entry[0] == options and entry[1] == refs and entry[2] > now:
+                    return entry[3], float(scores[row])
+        return None
+    
+    def _semantic_put(self, cache_key: str, query_embedding: List[float], result: PipelineResult) -> None:
+        """Add a result to the semantic cache, overwriting the oldest slot"""
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        result = self._private_copy(result)
+        with self._sem_lock:
+            if self._sem_matrix is None:
+                self._sem_matrix = np.zeros((SEMANTIC_CACHE_SIZE, vector.shape[0]), dtype=np.float32)
+            row = self._sem_next
+            self._sem_matrix[row] = vector
+            self._sem_entries[row] = (
+                cache_key.partition('|')[2],
+                self._legal_refs(result.question),
+                time.monotonic() + RESULT_L1_TTL,
+                result
+            )
+            self._sem_next = (row + 1) % SEMANTIC_CACHE_SIZE
+    
+    def clear_cache(self, query: Optional[str] = None, **kwargs) -> None:
+        """
+        Invalidate cached results in every tier (L1, semantic and Redis)
         
-        logger.info(f"Processing query: {query}")
+        Clearing only Redis leaves the in-process tiers serving stale answers
+        until their TTL expires, so invalidation should always go through here.
         
-        # Check cache first (unless bypassed)
-        bypass_cache = kwargs.get('bypass_cache', False)
-        cache_key = None
+        Args:
+            query: Only invalidate this question (None clears everything)
+            **kwargs: Result options the question was asked with (max_docs, return_answer)
+        """
+        if query is None:
+            with self._l1_lock:
+                self._l1.clear()
+            with self._sem_lock:
+                self._sem_matrix = None
+                self._sem_entries = [None] * SEMANTIC_CACHE_SIZE
+                self._sem_next = 0
+            if self.use_cache:
+                self.cache.clear_all()
+            return
+        
+        cache_key = self._result_cache_key(query, kwargs)
+        with self._l1_lock:
+            self._l1.pop(cache_key, None)
+        
+        # Only entries with the same options and legal refs can answer this question
+        options = cache_key.partition('|')[2]
+        refs = self._legal_refs(query)
+        with self._sem_lock:
+            for row, entry in enumerate(self._sem_entries):
+                if entry is not None and entry[0] == options and entry[1] == refs:
+                    self._sem_entries[row] = None
         
-        if self.use_cache and not bypass_cache:
-            cache_key = self.cache._generate_key(CachePrefix.SEARCH_RESULT, query)
-            cached_result = self.cache.get(cache_key)
-            
-            if cached_result:
-                logger.info("[CACHE HIT] Returning cached result")
-                # Update processing time to show cache speed
-                cached_result.processing_time_ms = (time.time() - start_time) * 1000
-                cached_result.metadata['cache_hit'] = True
-                return cached_result
+        if self.use_cache:
+            self.cache.delete(self._redis_search_key(cache_key))
+    
+    @staticmethod
+    def _redis_result_key(cache_key: str) -> str:
+        """Redis key for a result cache key (versioned with the cached payload format)"""
+        return f"v{RESULT_CACHE_VERSION}|{cache_key}"
+    
+    def _redis_search_key(self, cache_key: str) -> str:
+        """Full Redis key for a result cache key (same for RedisCache and AsyncRedisCache)"""
+        return self.cache._generate_key(CachePrefix.SEARCH_RESULT, self._redis_result_key(cache_key))
+    
+    @staticmethod
+    def _compact_for_cache(result: PipelineResult) -> Dict[str, Any]:
+        """
+        Plain-dict form of a result for Redis
         
-        logger.info("[CACHE MISS] Processing query")
+        Each source's full document text ('content') is dropped: it dominates the
+        entry size and is restored from ChromaDB by ID on a hit.
+        """
+        payload = asdict(result)
+        for source in payload['sources']:
+            source.pop('content', None)
+        return payload
+    
+    def _result_from_cache(self, value: Any) -> Optional[PipelineResult]:
+        """Rebuild a PipelineResult from its cached plain-dict form"""
+        if value is None:
+            return None
+        
+        sources = [dict(source) for source in value['sources']]
+        missing = [source['id'] for source in sources if 'content' not in source]
+        if missing:
+            try:
+                self._ensure_clients()
+                texts = self.chroma_client.get_document_texts(missing)
+            except Exception as e:
+                logger.debug(f"[CACHE] Could not restore source content: {str(e)}")
+                texts = {}
+            for source in sources:
+                if 'content' not in source:
+                    source['content'] = texts.get(source['id'], source['excerpt'])
+        
+        return PipelineResult(**{**value, 'intent': QueryIntent(value['intent']), 'sources': sources})
+    
+    def _cache_lookup(
+        self,
+        query: str,
+        kwargs: Dict[str, Any],
+        start_time: float,
+        semantic: bool = True
+    ) -> Tuple[Optional[str], Optional[PipelineResult]]:
+        """
+        Check the in-process L1 cache, then Redis, then the semantic cache for a query
+        
+        Args:
+            semantic: Also look for near-duplicate questions (embeds the query)
+        
+        Returns:
+            Tuple of (cache key or None if caching is bypassed, cached result or None).
+            Hits are deep copies of the mutable fields, so callers can't mutate the
+            cached entry.
+        """
+        if kwargs.get('bypass_cache', False):
+            return None, None
         
+        cache_key = self._result_cache_key(query, kwargs)
+        cached_result = self._l1_get(cache_key)
+        tier = "L1"
+        
+        if cached_result is None and self.use_cache:
+            cached_result = self._result_from_cache(self.cache.get(self._redis_search_key(cache_key)))
+            tier = "Redis"
+            if cached_result is not None:
+                self._l1_put(cache_key, cached_result)
+        
+        return cache_key, self._cache_hit(query, cache_key, cached_result, tier, start_time, semantic)
+    
+    def _cache_lookup_many(
+        self,
+        queries: List[str],
+        kwargs: Dict[str, Any],
+        start_time: float
+    ) -> List[Tuple[Optional[str], Optional[PipelineResult]]]:
+        """
+        Exact-tier _cache_lookup for a batch: L1 per query, then one Redis MGET
+        for every L1 miss
+        
+        Returns:
+            One (cache key, cached result or None) tuple per query, in order
+        """
+        if kwargs.get('bypass_cache', False):
+            return [(None, None)] * len(queries)
+        
+        cache_keys = [self._result_cache_key(query, kwargs) for query in queries]
+        cached = [self._l1_get(key) for key in cache_keys]
+        tiers = ["L1"] * len(queries)
+        
+        misses = [i for i, result in enumerate(cached) if result is None]
+        if misses and self.use_cache:
+            values = self.cache.mget([self._redis_search_key(cache_keys[i]) for i in misses])
+            for i, value in zip(misses, values):
+                tiers[i] = "Redis"
+                cached[i] = self._result_from_cache(value)
+                if cached[i] is not None:
+                    self._l1_put(cache_keys[i], cached[i])
+        
+        return [
+            (key, self._cache_hit(query, key, result, tier, start_time, False))
+            for query, key, result, tier in zip(queries, cache_keys, cached, tiers)
+        ]
+    
+    async def _acache_lookup(
+        self,
+        query: str,
+        kwargs: Dict[str, Any],
+        start_time: float,
+        semantic: bool = True
+    ) -> Tuple[Optional[str], Optional[PipelineResult]]:
+        """
+        Async _cache_lookup: the Redis read goes through AsyncRedisCache, and only
+        restoring source text from ChromaDB and the semantic lookup (which embeds
+        the query) run in a worker thread
+        """
+        if kwargs.get('bypass_cache', False):
+            return None, None
+        
+        cache_key = self._result_cache_key(query, kwargs)
+        cached_result = self._l1_get(cache_key)
+        tier = "L1"
+        
+        if cached_result is None:
+            async_cache = await self._aget_async_cache()
+            if async_cache is not None:
+                value = await async_cache.get(self._redis_search_key(cache_key))
+                if value is not None:
+                    cached_result = await asyncio.to_thread(self._result_from_cache, value)
+                    self._l1_put(cache_key, cached_result)
+                tier = "Redis"
+        
+        if cached_result is None and semantic:
+            hit = await asyncio.to_thread(self._cache_hit, query, cache_key, None, tier, start_time, semantic)
+        else:
+            hit = self._cache_hit(query, cache_key, cached_result, tier, start_time, False)
+        return cache_key, hit
+    
+    async def _aget_async_cache(self) -> Optional["AsyncRedisCache"]:
+        """Shared AsyncRedisCache (None when caching is off or Redis is unreachable)"""
+        if not self.use_cache:
+            return None
+        if self.async_cache is None:
+            self.async_cache = await get_async_cache()
+        return self.async_cache if self.async_cache.enabled else None
+    
+    def _cache_hit(
+        self,
+        query: str,
+        cache_key: str,
+        cached_result: Optional[PipelineResult],
+        tier: str,
+        start_time: float,
+        semantic: bool
+    ) -> Optional[PipelineResult]:
+        """Fall back to the semantic cache on a miss; return a private copy of any hit"""
+        hit_metadata = {'cache_hit': True}
+        if cached_result is None and semantic:
+            match = self._semantic_get(query, cache_key)
+            if match is not None:
+                cached_result, similarity = match
+                tier = "semantic"
+                hit_metadata['semantic_similarity'] = round(similarity, 4)
+        
+        if cached_result is not None:
+            logger.info(f"[CACHE HIT] Returning cached result ({tier})")
+            # Update processing time to show cache speed
+            return self._private_copy(
+                cached_result,
+                question=query,
+                processing_time_ms=(time.time() - start_time) * 1000,
+                metadata={**copy.deepcopy(cached_result.metadata), **hit_metadata}
+            )
+        
+        return None
+    
+    def _run_stages(
+        self,
+        query: str,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[IntentAnalysis, RetrievalStrategy, RetrievedContext, str, float, List[Dict[str, Any]]]:
+        """
+        Run stages 1-4 (intent, strategy, retrieval, generation)
+        
+        Returns:
+            Tuple of (intent analysis, retrieval strategy, context, answer, confidence, sources)
+        """
+        intent_analysis, retrieval_strategy, context = self._retrieve_stages(query, kwargs)
+        
+        # STAGE 4: Generate Answer
+        answer, confidence, sources = self._answer_stage(query, context, intent_analysis, kwargs)
+        
+        return intent_analysis, retrieval_strategy, context, answer, confidence, sources
+    
+    def _answer_stage(
+        self,
+        query: str,
+        context: RetrievedContext,
+        intent_analysis: IntentAnalysis,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[str, float, List[Dict[str, Any]]]:
+        """Run stage 4, or only build the sources list when return_answer=False"""
+        if kwargs.get('return_answer', True):
+            return self.generate_answer(query, context, intent_analysis)
+        
+        # Retrieval-only: no answer synthesis (and never an LLM call)
+        sources = self._build_sources_list(context)
+        confidence = sources[0]['relevance_score'] if sources else 0.0
+        return "", confidence, sources
+    
+    def _plan_retrieval(
+        self,
+        query: str,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[IntentAnalysis, RetrievalStrategy]:
+        """Run stages 1-2 (intent, strategy)"""
         # STAGE 1: Detect Intent
         intent_analysis = self.detect_intent(query)
         
@@ -764,24 +1302,73 @@ class AdaptiveRAGPipeline:
         
         # Allow override of num_documents if provided
         if 'max_docs' in kwargs:
-            retrieval_strategy.num_documents = kwargs['max_docs']
+            retrieval_strategy = replace(retrieval_strategy, num_documents=kwargs['max_docs'])
+        
+        return intent_analysis, retrieval_strategy
+    
+    def _retrieve_stages(
+        self,
+        query: str,
+        kwargs: Dict[str, Any]
+    ) -> Tuple[IntentAnalysis, RetrievalStrategy, RetrievedContext]:
+        """
+        Run stages 1-3 (intent, strategy, retrieval)
+        
+        Returns:
+            Tuple of (intent analysis, retrieval strategy, context)
+        """
+        intent_analysis, retrieval_strategy = self._plan_retrieval(query, kwargs)
         
         # STAGE 3: Retrieve Context
         context = self.retrieve_context(query, retrieval_strategy)
         
-        # STAGE 3.5: Graph Enrichment (if Neo4j available)
-        graph_facts = []
-        if self.use_graph:
-            try:
-                graph_facts = fetch_legal_graph_facts(query, self.neo4j_client)
-                logger.info(f"Graph enrichment: {len(graph_facts)} facts retrieved")
-            except Exception as e:
-                logger.warning(f"Graph enrichment failed: {str(e)}, proceeding without graph")
+        return intent_analysis, retrieval_strategy, context
+    
+    def _fetch_graph_facts(self, query: str) -> List[Dict[str, Any]]:
+        """STAGE 3.5: Graph Enrichment (if Neo4j available)"""
+        if not self.use_graph:
+            return []
+        try:
+            graph_facts = fetch_legal_graph_facts(query, self.neo4j_client)
+            logger.info(f"Graph enrichment: {len(graph_facts)} facts retrieved")
+            return graph_facts
+        except Exception as e:
+            logger.warning(f"Graph enrichment failed: {str(e)}, proceeding without graph")
+            return []
+    
+    async def _afetch_graph_facts(self, query: str) -> List[Dict[str, Any]]:
+        """STAGE 3.5 on the async Neo4j driver (thread fallback for the sync client)"""
+        if not self.use_graph:
+            return []
+        if self.async_neo4j_client is None:
+            return await asyncio.to_thread(self._fetch_graph_facts, query)
+        try:
+            graph_facts = await afetch_legal_graph_facts(query, self.async_neo4j_client)
+            logger.info(f"Graph enrichment: {len(graph_facts)} facts retrieved")
+            return graph_facts
+        except Exception as e:
+            logger.warning(f"Graph enrichment failed: {str(e)}, proceeding without graph")
+            return []
+    
+    def _build_result(
+        self,
+        query: str,
+        stages: Tuple[IntentAnalysis, RetrievalStrategy, RetrievedContext, str, float, List[Dict[str, Any]]],
+        graph_facts: List[Dict[str, Any]],
+        start_time: float,
+        cache_key: Optional[str],
+        query_embedding: Optional[List[float]] = None,
+        store_redis: bool = True
+    ) -> PipelineResult:
+        """
+        Assemble the PipelineResult and store it in the caches
         
-        # STAGE 4: Generate Answer
-        answer, confidence, sources = self.generate_answer(
-            query, context, intent_analysis
-        )
+        Args:
+            store_redis: Also write the sync Redis cache (async callers pass False
+                and write through AsyncRedisCache with _astore_redis; process_queries
+                passes False and writes the whole batch with one mset)
+        """
+        intent_analysis, retrieval_strategy, context, answer, confidence, sources = stages
         
         # Calculate processing time
         processing_time = (time.time() - start_time) * 1000  # ms
@@ -813,13 +1400,28 @@ class AdaptiveRAGPipeline:
             }
         )
         
-        # Cache the result
-        if self.use_cache and cache_key:
+        # Cache the result (L1 always, Redis when available)
+        if cache_key:
+            self._l1_put(cache_key, result)
             try:
-                self.cache.set(cache_key, result, ttl=CacheTTL.SEARCH_RESULT)
-                logger.info("[CACHE] Result cached successfully")
+                self._semantic_put(
+                    cache_key,
+                    query_embedding if query_embedding is not None else self._embed_query(query),
+                    result
+                )
             except Exception as e:
-                logger.debug(f"[CACHE] Failed to cache result: {str(e)}")
+                logger.debug(f"[CACHE] Failed to add semantic cache entry: {str(e)}")
+            if self.use_cache and store_redis:
+                try:
+                    # Plain dicts go through msgpack; a dataclass would fall back to pickle
+                    self.cache.set(
+                        self._redis_search_key(cache_key),
+                        self._compact_for_cache(result),
+                        ttl=CacheTTL.SEARCH_RESULT
+                    )
+                    logger.info("[CACHE] Result cached successfully")
+                except Exception as e:
+                    logger.debug(f"[CACHE] Failed to cache result: {str(e)}")
         
         logger.info(
             f"Pipeline completed: intent={result.intent}, "
@@ -829,3 +1431,299 @@ class AdaptiveRAGPipeline:
         )
         
         return result
+    
+    async def _astore_redis(self, cache_key: Optional[str], result: PipelineResult) -> None:
+        """Write a freshly built result to Redis through AsyncRedisCache"""
+        if not cache_key:
+            return
+        async_cache = await self._aget_async_cache()
+        if async_cache is not None and await async_cache.set(
+            self._redis_search_key(cache_key),
+            self._compact_for_cache(result),
+            ttl=CacheTTL.SEARCH_RESULT
+        ):
+            logger.info("[CACHE] Result cached successfully")
+    
+    def process_query(self, query: str, **kwargs) -> PipelineResult:
+        """
+        Main pipeline: Process a query through all 4 stages with caching
+        
+        Args:
+            query: User's legal question
+            **kwargs: Additional options (max_docs, force_intent, bypass_cache,
+                return_answer, etc.)
+            
+        Returns:
+            PipelineResult with structured answer and metadata
+        """
+        start_time = time.time()
+        
+        logger.info(f"Processing query: {query}")
+        
+        # Check cache first (unless bypassed)
+        cache_key, cached_result = self._cache_lookup(query, kwargs, start_time)
+        if cached_result:
+            return cached_result
+        
+        logger.info("[CACHE MISS] Processing query")
+        
+        # Graph facts only depend on the query, so fetch them while retrieval and
+        # generation run on this thread (_fetch_graph_facts never raises)
+        if self.use_graph:
+            graph_future = _get_graph_executor().submit(self._fetch_graph_facts, query)
+            stages = self._run_stages(query, kwargs)
+            graph_facts = graph_future.result()
+        else:
+            stages = self._run_stages(query, kwargs)
+            graph_facts = []
+        
+        return self._build_result(query, stages, graph_facts, start_time, cache_key)
+    
+    def retrieve(self, query: str, **kwargs) -> PipelineResult:
+        """
+        Retrieval-only query: sources without a generated answer
+        
+        Args:
+            query: User's legal question
+            **kwargs: Options as for process_query
+            
+        Returns:
+            PipelineResult with an empty answer and confidence set to the top
+            source's relevance score
+        """
+        return self.process_query(query, return_answer=False, **kwargs)
+    
+    def process_queries(self, queries: List[str], batch_size: int = 32, **kwargs) -> List[PipelineResult]:
+        """
+        Process many queries at once, batching the embedding and vector search
+        
+        Uncached queries are embedded in one encoder call and sent to ChromaDB as
+        one query per distinct metadata filter; answer generation and graph
+        enrichment then run per query as in process_query.
+        
+        Args:
+            queries: User questions
+            batch_size: Encoder batch size
+            **kwargs: Options applied to every query (max_docs, bypass_cache, etc.)
+            
+        Returns:
+            PipelineResults in the same order as queries
+        """
+        start_time = time.time()
+        
+        logger.info(f"Processing batch of {len(queries)} queries")
+        
+        results: List[Optional[PipelineResult]] = [None] * len(queries)
+        pending = []  # (index, cache key, intent analysis, retrieval strategy)
+        # Exact tiers only: a semantic probe would embed each query on its own
+        lookups = self._cache_lookup_many(queries, kwargs, start_time)
+        for i, (query, (cache_key, cached_result)) in enumerate(zip(queries, lookups)):
+            if cached_result:
+                results[i] = cached_result
+            else:
+                pending.append((i, cache_key) + self._plan_retrieval(query, kwargs))
+        
+        if not pending:
+            return results
+        
+        logger.info(f"[CACHE MISS] Processing {len(pending)} of {len(queries)} queries")
+        
+        graph_futures = {}
+        if self.use_graph:
+            executor = _get_graph_executor()
+            graph_futures = {
+                i: executor.submit(self._fetch_graph_facts, queries[i]) for i, _, _, _ in pending
+            }
+        
+        # STAGE 3: one encoder call for every uncached query
+        self._ensure_clients()
+        embeddings = self.embedder.encode(
+            [queries[i] for i, _, _, _ in pending],
+            batch_size=batch_size,
+            normalize_embeddings=True
+        ).tolist()
+        
+        # One ChromaDB query per distinct metadata filter, at the largest n_results
+        groups: Dict[str, List[int]] = {}
+        for slot, (_, _, _, strategy) in enumerate(pending):
+            groups.setdefault(repr(strategy.metadata_filter), []).append(slot)
+        
+        contexts: List[Optional[RetrievedContext]] = [None] * len(pending)
+        for slots in groups.values():
+            strategies = [pending[slot][3] for slot in slots]
+            batch_results = self.chroma_client.query(
+                query_embeddings=[embeddings[slot] for slot in slots],
+                n_results=max(strategy.num_documents for strategy in strategies),
+                where=strategies[0].metadata_filter
+            )
+            for row, slot in enumerate(slots):
+                contexts[slot] = self._context_from_results(batch_results, row, strategies[row])
+        
+        for slot, ((i, cache_key, intent_analysis, strategy), context) in enumerate(zip(pending, contexts)):
+            # STAGE 4: Generate Answer
+            answer, confidence, sources = self._answer_stage(queries[i], context, intent_analysis, kwargs)
+            stages = (intent_analysis, strategy, context, answer, confidence, sources)
+            graph_facts = graph_futures[i].result() if i in graph_futures else []
+            results[i] = self._build_result(
+                queries[i], stages, graph_facts, start_time, cache_key, embeddings[slot], store_redis=False
+            )
+        
+        # One pipelined Redis write for every new result
+        if self.use_cache:
+            items = {
+                self._redis_search_key(cache_key): self._compact_for_cache(results[i])
+                for i, cache_key, _, _ in pending if cache_key
+            }
+            if items and self.cache.mset(items, ttl=CacheTTL.SEARCH_RESULT):
+                logger.info(f"[CACHE] {len(items)} results cached successfully")
+        
+        return results
+    
+    async def aprocess_query(self, query: str, **kwargs) -> PipelineResult:
+        """
+        Async pipeline for FastAPI handlers: graph enrichment runs concurrently with
+        retrieval + answer generation instead of after them, and the blocking stages
+        run in a worker thread so the event loop stays free
+        
+        Args:
+            query: User's legal question
+            **kwargs: Additional options (max_docs, force_intent, bypass_cache,
+                return_answer, etc.)
+            
+        Returns:
+            PipelineResult with structured answer and metadata
+        """
+        start_time = time.time()
+        
+        logger.info(f"Processing query (async): {query}")
+        
+        cache_key, cached_result = await self._acache_lookup(query, kwargs, start_time)
+        if cached_result:
+            return cached_result
+        
+        logger.info("[CACHE MISS] Processing query")
+        
+        # Graph facts are not used by answer generation, so both can be in flight at once
+        stages, graph_facts = await asyncio.gather(
+            asyncio.to_thread(self._run_stages, query, kwargs),
+            self._afetch_graph_facts(query)
+        )
+        
+        result = await asyncio.to_thread(
+            self._build_result, query, stages, graph_facts, start_time, cache_key, store_redis=False
+        )
+        await self._astore_redis(cache_key, result)
+        return result
+    
+    async def _astream_answer_tokens(
+        self,
+        query: str,
+        context: RetrievedContext,
+        intent_analysis: IntentAnalysis,
+        sources: List[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """
+        STAGE 4 as a stream: Ollama tokens with the LLM enabled, else the rule-based answer in one piece
+        
+        Like generate_answer, falls back to the rule-based answer if the LLM fails
+        before producing any output; a failure mid-stream is raised, since the
+        tokens already sent can't be taken back.
+        """
+        if self.use_llm:
+            emitted = False
+            try:
+                await asyncio.to_thread(self._ensure_llm_generator)
+                prompt = self._build_llm_prompt(query, context, intent_analysis)
+                async for token in self.llm_generator.agenerate_stream(
+                    prompt=prompt,
+                    max_tokens=512,
+                    temperature=0.3  # Lower temperature for factual legal answers
+                ):
+                    emitted = True
+                    yield token
+                if emitted:
+                    return
+                logger.warning("LLM returned an empty answer, falling back to rule-based")
+            except Exception as e:
+                if emitted:
+                    raise
+                logger.warning(f"LLM generation failed, falling back to rule-based: {str(e)}")
+        
+        yield self._generate_rulebased_answer(query, sources, intent_analysis)
+    
+    async def process_query_stream(self, query: str, **kwargs) -> AsyncIterator[Union[str, PipelineResult]]:
+        """
+        Streaming pipeline: yields answer fragments as they are generated, then the
+        complete PipelineResult
+        
+        Retrieval runs in a worker thread while graph enrichment runs concurrently;
+        with the LLM enabled the answer is streamed token by token from Ollama. The
+        assembled result is cached like process_query's, and a cache hit yields the
+        cached answer in one piece. With return_answer=False no answer is generated
+        (as in process_query) and only the final result is yielded.
+        
+        Args:
+            query: User's legal question
+            **kwargs: Additional options (max_docs, bypass_cache, return_answer, etc.)
+            
+        Yields:
+            Answer text fragments (str), followed by the final PipelineResult
+        """
+        start_time = time.time()
+        
+        logger.info(f"Streaming query: {query}")
+        
+        cache_key, cached_result = await self._acache_lookup(query, kwargs, start_time)
+        if cached_result:
+            if cached_result.answer:
+                yield cached_result.answer
+            yield cached_result
+            return
+        
+        graph_task = asyncio.ensure_future(self._afetch_graph_facts(query))
+        try:
+            intent_analysis, retrieval_strategy, context = await asyncio.to_thread(
+                self._retrieve_stages, query, kwargs
+            )
+            
+            if not kwargs.get('return_answer', True) or not context.documents:
+                # Sources only, or nothing retrieved: stage 4 exactly as in process_query
+                answer, confidence, sources = self._answer_stage(query, context, intent_analysis, kwargs)
+                if answer:
+                    yield answer
+            else:
+                sources = self._build_sources_list(context)
+                parts = []
+                async for token in self._astream_answer_tokens(query, context, intent_analysis, sources):
+                    parts.append(token)
+                    yield token
+                # Stripped like OllamaGenerator.generate, so /adaptive-query caches the same text
+                answer = "".join(parts).strip()
+                confidence = self._answer_confidence(sources, intent_analysis)
+            
+            graph_facts = await graph_task
+        finally:
+            # Client disconnected or generation failed: don't leave the graph query running
+            graph_task.cancel()
+        
+        stages = (intent_analysis, retrieval_strategy, context, answer, confidence, sources)
+        result = await asyncio.to_thread(
+            self._build_result, query, stages, graph_facts, start_time, cache_key, store_redis=False
+        )
+        await self._astore_redis(cache_key, result)
+        yield result
+    
+    async def astream_answer(self, query: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream only the answer text for a query (see process_query_stream)
+        
+        Args:
+            query: User's legal question
+            **kwargs: Additional options (max_docs, etc.)
+            
+        Yields:
+            Answer text fragments
+        """
+        async for item in self.process_query_stream(query, **kwargs):
+            if isinstance(item, str):
+                yield item
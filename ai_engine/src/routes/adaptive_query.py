@@ -3,13 +3,17 @@ Adaptive Query Route for FastAPI
 New endpoint using the Adaptive RAG Pipeline
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+import asyncio
+import json
+import threading
 import time
 import logging
 
-from pipelines.adaptive_rag import AdaptiveRAGPipeline
-from graph.neo4j_client import get_neo4j_client
+from pipelines.adaptive_rag import AdaptiveRAGPipeline, PipelineResult
+from graph.neo4j_client import get_neo4j_client, get_async_neo4j_client
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,7 @@ router = APIRouter(prefix="/api", tags=["adaptive-query"])
 # Initialize pipeline (singleton)
 _pipeline_instance: Optional[AdaptiveRAGPipeline] = None
 _neo4j_client = None  # Global Neo4j client
+_pipeline_lock = threading.Lock()  # get_pipeline runs in worker threads
 
 # Initialize Neo4j client once
 def get_neo4j():
@@ -32,17 +37,43 @@ def get_pipeline(use_llm: bool = False) -> AdaptiveRAGPipeline:
     """Get or create pipeline instance with specified LLM mode"""
     global _pipeline_instance
     
-    # Get Neo4j client
-    neo4j = get_neo4j()
+    with _pipeline_lock:
+        # Get Neo4j client
+        neo4j = get_neo4j()
+        
+        # If switching LLM mode, recreate pipeline
+        if _pipeline_instance is None or _pipeline_instance.use_llm != use_llm:
+            _pipeline_instance = AdaptiveRAGPipeline(
+                use_llm=use_llm,
+                neo4j_client=neo4j  # Pass Neo4j client
+            )
+        
+        return _pipeline_instance
+
+
+async def aget_pipeline(use_llm: bool = False) -> AdaptiveRAGPipeline:
+    """
+    Async get_pipeline for route handlers
     
-    # If switching LLM mode, recreate pipeline
-    if _pipeline_instance is None or _pipeline_instance.use_llm != use_llm:
-        _pipeline_instance = AdaptiveRAGPipeline(
-            use_llm=use_llm,
-            neo4j_client=neo4j  # Pass Neo4j client
-        )
+    Creating the pipeline connects Neo4j and loads the embedding model, so that
+    path runs in a worker thread instead of blocking the event loop.
+    """
+    instance = _pipeline_instance
+    if instance is not None and instance.use_llm == use_llm:
+        return instance
+    return await asyncio.to_thread(get_pipeline, use_llm)
+
+
+def _collect_status(pipeline: AdaptiveRAGPipeline) -> Tuple[int, Dict[str, Any]]:
+    """Blocking ChromaDB count and Redis stats for /adaptive-status (run in a worker thread)"""
+    pipeline._ensure_clients()
+    doc_count = pipeline.chroma_client.count()
     
-    return _pipeline_instance
+    cache_stats = {}
+    if hasattr(pipeline, 'cache') and pipeline.cache:
+        cache_stats = pipeline.cache.get_stats()
+    
+    return doc_count, cache_stats
 
 
 class AdaptiveQueryRequest(BaseModel):
@@ -67,6 +98,23 @@ class AdaptiveQueryResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+def _to_response(result: PipelineResult) -> AdaptiveQueryResponse:
+    """Convert a PipelineResult to the API response model"""
+    return AdaptiveQueryResponse(
+        question=result.question,
+        intent=result.intent.value,
+        intent_confidence=result.intent_confidence,
+        answer=result.answer,
+        sources=result.sources,
+        graph_references=result.graph_references,  # NEW
+        documents_used=result.num_sources_retrieved,
+        retrieval_strategy=result.retrieval_strategy,
+        confidence=result.confidence,
+        processing_time_ms=result.processing_time_ms,
+        metadata=result.metadata
+    )
+
+
 @router.post("/adaptive-query", response_model=AdaptiveQueryResponse)
 async def adaptive_query(request: AdaptiveQueryRequest) -> AdaptiveQueryResponse:
     """
@@ -88,14 +136,16 @@ async def adaptive_query(request: AdaptiveQueryRequest) -> AdaptiveQueryResponse
         logger.info(f"Received adaptive query: {request.question} (LLM: {request.use_llm})")
         
         # Get pipeline instance with LLM mode
-        pipeline = get_pipeline(use_llm=request.use_llm)
+        pipeline = await aget_pipeline(use_llm=request.use_llm)
+        if pipeline.use_graph and pipeline.async_neo4j_client is None:
+            pipeline.async_neo4j_client = await get_async_neo4j_client()
         
         # Process query through adaptive pipeline
         kwargs = {}
         if request.max_docs:
             kwargs['max_docs'] = request.max_docs
         
-        result = pipeline.process_query(request.question, **kwargs)
+        result = await pipeline.aprocess_query(request.question, **kwargs)
         
         logger.info(
             f"Adaptive query completed: intent={result.intent.value}, "
@@ -103,19 +153,7 @@ async def adaptive_query(request: AdaptiveQueryRequest) -> AdaptiveQueryResponse
         )
         
         # Convert to response format
-        return AdaptiveQueryResponse(
-            question=result.question,
-            intent=result.intent.value,
-            intent_confidence=result.intent_confidence,
-            answer=result.answer,
-            sources=result.sources,
-            graph_references=result.graph_references,  # NEW
-            documents_used=result.num_sources_retrieved,
-            retrieval_strategy=result.retrieval_strategy,
-            confidence=result.confidence,
-            processing_time_ms=result.processing_time_ms,
-            metadata=result.metadata
-        )
+        return _to_response(result)
         
     except Exception as e:
         logger.error(f"Error processing adaptive query: {str(e)}", exc_info=True)
@@ -125,6 +163,58 @@ async def adaptive_query(request: AdaptiveQueryRequest) -> AdaptiveQueryResponse
         )
 
 
+async def _sse_events(items: AsyncIterator[Union[str, PipelineResult]]) -> AsyncIterator[str]:
+    """
+    Wrap a pipeline stream as server-sent events: one data event per answer
+    fragment, a result event with the structured response (minus the answer
+    already streamed), then a done event
+    """
+    try:
+        async for item in items:
+            if isinstance(item, str):
+                yield f"data: {json.dumps({'token': item})}\n\n"
+            else:
+                result = _to_response(item).model_dump(exclude={'answer'})
+                yield f"event: result\ndata: {json.dumps(result, default=str)}\n\n"
+    except Exception as e:
+        logger.error(f"Error streaming adaptive query: {str(e)}", exc_info=True)
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
+
+
+@router.post("/adaptive-query/stream")
+async def adaptive_query_stream(request: AdaptiveQueryRequest) -> StreamingResponse:
+    """
+    Stream the answer to a legal query as server-sent events
+    
+    Each event carries a `token` fragment of the answer as soon as the LLM
+    produces it, so the first bytes arrive long before generation finishes.
+    A final `result` event carries the sources, graph references and the rest
+    of the /adaptive-query response (without the answer text).
+    
+    Args:
+        request: AdaptiveQueryRequest with the legal question
+        
+    Returns:
+        text/event-stream response of answer fragments
+    """
+    logger.info(f"Received streaming adaptive query: {request.question} (LLM: {request.use_llm})")
+    
+    pipeline = await aget_pipeline(use_llm=request.use_llm)
+    if pipeline.use_graph and pipeline.async_neo4j_client is None:
+        pipeline.async_neo4j_client = await get_async_neo4j_client()
+    
+    kwargs = {}
+    if request.max_docs:
+        kwargs['max_docs'] = request.max_docs
+    
+    return StreamingResponse(
+        _sse_events(pipeline.process_query_stream(request.question, **kwargs)),
+        media_type="text/event-stream"
+    )
+
+
 @router.get("/adaptive-status")
 async def get_adaptive_status() -> Dict[str, Any]:
     """
@@ -134,16 +224,10 @@ async def get_adaptive_status() -> Dict[str, Any]:
         Status information including pipeline configuration
     """
     try:
-        pipeline = get_pipeline()
-        
-        # Get ChromaDB document count
-        pipeline._ensure_clients()
-        doc_count = pipeline.chroma_client.count()
+        pipeline = await aget_pipeline()
         
-        # Get cache stats
-        cache_stats = {}
-        if hasattr(pipeline, 'cache') and pipeline.cache:
-            cache_stats = pipeline.cache.get_stats()
+        # Get ChromaDB document count and cache stats off the event loop
+        doc_count, cache_stats = await asyncio.to_thread(_collect_status, pipeline)
         
         return {
             "status": "operational",
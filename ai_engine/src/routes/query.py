@@ -5,9 +5,12 @@ Handles legal question processing and retrieval
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
+import asyncio
 import time
 import logging
 
+import numpy as np
+
 from vectorstore.chroma_client import get_chroma_client
 from embeddings.embedder import get_embedder
 from config import settings
@@ -42,6 +45,38 @@ class QueryResponse(BaseModel):
     processing_time_ms: float
 
 
+def _get_chroma():
+    """Shared, already-connected ChromaClient (created at startup by main.warm_up)"""
+    return get_chroma_client(
+        persist_directory=settings.CHROMA_DB_PATH,
+        collection_name=settings.CHROMA_COLLECTION_NAME,
+        embedding_model=settings.MODEL_NAME
+    )
+
+
+def _search_chroma(question: str, n_results: int) -> Optional[Dict[str, Any]]:
+    """
+    Blocking ChromaDB search (run in a worker thread by the route)
+    
+    Returns:
+        Raw query results, or None if the collection is empty
+    """
+    chroma_client = _get_chroma()
+    
+    # Check if collection has documents
+    doc_count = chroma_client.count()
+    if doc_count == 0:
+        return None
+    
+    logger.info(f"Searching in collection with {doc_count} documents")
+    
+    # Perform semantic search with an explicit (memoized) query embedding
+    return chroma_client.query_one(
+        chroma_client.encode(question).tolist(),
+        n_results=n_results
+    )
+
+
 @router.post("/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest) -> QueryResponse:
     """
@@ -58,57 +93,41 @@ async def process_query(request: QueryRequest) -> QueryResponse:
     try:
         logger.info(f"Processing query: {request.question}")
         
-        # Initialize ChromaDB client (create fresh instance to avoid singleton caching)
-        from vectorstore.chroma_client import ChromaClient
-        chroma_client = ChromaClient(
-            persist_directory=settings.CHROMA_DB_PATH,
-            collection_name=settings.CHROMA_COLLECTION_NAME,
-            embedding_model=settings.MODEL_NAME
+        # Embedding + search block, so keep them off the event loop
+        results = await asyncio.to_thread(
+            _search_chroma,
+            request.question,
+            min(request.max_results, 10)  # Cap at 10 results
         )
-        chroma_client.connect()
-        
-        # Check if collection has documents
-        doc_count = chroma_client.count()
-        if doc_count == 0:
+        if results is None:
             logger.warning("ChromaDB collection is empty")
             raise HTTPException(
                 status_code=503,
                 detail="Knowledge base is empty. Please load legal documents first."
             )
         
-        logger.info(f"Searching in collection with {doc_count} documents")
-        
-        # Perform semantic search
-        results = chroma_client.query(
-            query_texts=[request.question],
-            n_results=min(request.max_results, 10)  # Cap at 10 results
-        )
-        
         # Process results into sources
         sources = []
         if results['ids'][0]:
-            for i, (doc_id, document, metadata, distance) in enumerate(zip(
+            # Convert distances to relevance scores (0-1, higher is better) in one pass
+            # ChromaDB uses L2 distance, so smaller is better
+            scores = np.maximum(0.0, 1.0 - np.asarray(results['distances'][0], dtype=np.float64) * 0.5)
+            
+            for i, (doc_id, document, metadata, relevance_score) in enumerate(zip(
                 results['ids'][0],
                 results['documents'][0],
                 results['metadatas'][0],
-                results['distances'][0]
+                scores.round(4).tolist()
             )):
-                # Extract title from document (first line)
-                title = document.split('\n')[0] if '\n' in document else doc_id
-                
-                # Create excerpt (first 200 chars of content)
-                excerpt = document[:200] + "..." if len(document) > 200 else document
-                
-                # Convert distance to relevance score (0-1, higher is better)
-                # ChromaDB uses L2 distance, so smaller is better
-                # We convert to similarity score
-                relevance_score = max(0.0, 1.0 - (distance / 2.0))
+                # Extract title from document (first line); partition stops at the first newline
+                first_line, newline, _ = document.partition('\n')
                 
                 sources.append(Source(
                     id=doc_id,
-                    title=title,
-                    excerpt=excerpt,
-                    relevance_score=round(relevance_score, 4),
+                    title=first_line if newline else doc_id,
+                    # Create excerpt (first 200 chars of content)
+                    excerpt=document[:200] + "..." if len(document) > 200 else document,
+                    relevance_score=relevance_score,
                     metadata=metadata
                 ))
                 
@@ -159,6 +178,11 @@ async def process_query(request: QueryRequest) -> QueryResponse:
         )
 
 
+def _count_chroma() -> int:
+    """Blocking ChromaDB document count (run in a worker thread)"""
+    return _get_chroma().count()
+
+
 @router.get("/status")
 async def get_status() -> Dict[str, Any]:
     """
@@ -168,14 +192,8 @@ async def get_status() -> Dict[str, Any]:
         Status information including available models and database connections
     """
     try:
-        # Check ChromaDB status (create fresh instance)
-        from vectorstore.chroma_client import ChromaClient
-        chroma_client = ChromaClient(
-            persist_directory=settings.CHROMA_DB_PATH,
-            collection_name=settings.CHROMA_COLLECTION_NAME
-        )
-        chroma_client.connect()
-        doc_count = chroma_client.count()
+        # Check ChromaDB status
+        doc_count = await asyncio.to_thread(_count_chroma)
         vectordb_status = "operational"
         
     except Exception as e:
@@ -0,0 +1,6 @@
+"""
+Utility module for numeric helpers shared across the AI Engine
+"""
+from .fast_rank import dot_scores, dot_scores_int8
+
+__all__ = ["dot_scores", "dot_scores_int8"]
@@ -0,0 +1,97 @@
+"""
+Fast Ranking Helpers
+Dot-product scoring of normalized float and int8-quantized embeddings
+"""
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Optional JIT compilation (falls back to vectorized NumPy)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _dot_scores_jit(query: np.ndarray, matrix: np.ndarray, out: np.ndarray) -> None:
+        """Row-parallel dot product for unit-length float embeddings"""
+        num_rows, dim = matrix.shape
+        for i in prange(num_rows):
+            acc = 0.0
+            for j in range(dim):
+                acc += query[j] * matrix[i, j]
+            out[i] = acc
+    
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _dot_scores_int8_jit(
+        query: np.ndarray,
+        query_scale: float,
+        matrix: np.ndarray,
+        row_scales: np.ndarray,
+        out: np.ndarray
+    ) -> None:
+        """Row-parallel int8 dot product with int32 accumulation and one rescale per row"""
+        num_rows, dim = matrix.shape
+        for i in prange(num_rows):
+            acc = np.int32(0)
+            for j in range(dim):
+                acc += np.int32(query[j]) * np.int32(matrix[i, j])
+            out[i] = acc * query_scale * row_scales[i]
+
+
+def dot_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Score unit-length embeddings by dot product (equal to cosine similarity)
+    
+    Args:
+        query: 1D normalized query embedding (shape: [embedding_dim])
+        matrix: 2D normalized document embeddings (shape: [num_docs, embedding_dim])
+        
+    Returns:
+        1D float32 array of similarity scores (shape: [num_docs])
+    """
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    
+    if NUMBA_AVAILABLE:
+        out = np.empty(matrix.shape[0], dtype=np.float32)
+        _dot_scores_jit(query, matrix, out)
+        return out
+    
+    return matrix @ query
+
+
+def dot_scores_int8(
+    query: np.ndarray,
+    query_scale: float,
+    matrix: np.ndarray,
+    row_scales: np.ndarray
+) -> np.ndarray:
+    """
+    Score int8-quantized embeddings (see Embedder.quantize_int8) by dot product
+    
+    Args:
+        query: 1D int8 query embedding
+        query_scale: Dequantization scale of the query
+        matrix: 2D int8 document embeddings
+        row_scales: Per-row dequantization scales of the matrix
+        
+    Returns:
+        1D float32 array of approximate dot-product scores (shape: [num_docs])
+    """
+    query = np.ascontiguousarray(query, dtype=np.int8)
+    matrix = np.ascontiguousarray(matrix, dtype=np.int8)
+    row_scales = np.ascontiguousarray(row_scales, dtype=np.float32)
+    
+    if NUMBA_AVAILABLE:
+        out = np.empty(matrix.shape[0], dtype=np.float32)
+        _dot_scores_int8_jit(query, np.float32(query_scale), matrix, row_scales, out)
+        return out
+    
+    # int32 accumulation: 384 * 127^2 overflows int16
+    dots = matrix.astype(np.int32) @ query.astype(np.int32)
+    return (dots * (query_scale * row_scales)).astype(np.float32)
@@ -4,13 +4,198 @@ Handles initialization, collection management, and document operations
 """
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+import hashlib
 import logging
 import os
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from embeddings.embedder import Embedder, get_embedder
+
+# Import settings for env variables
+try:
+    from config import settings
+    HAS_SETTINGS = True
+except ImportError:
+    HAS_SETTINGS = False
 
 logger = logging.getLogger(__name__)
 
+# Distinct query strings whose embedding is kept per client
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Coalescing of concurrent single-query searches (see QueryBatcher)
+if HAS_SETTINGS:
+    QUERY_BATCH_SIZE = settings.RETRIEVAL_BATCH_SIZE
+    QUERY_BATCH_WINDOW_MS = settings.RETRIEVAL_BATCH_WINDOW_MS
+else:
+    QUERY_BATCH_SIZE = int(os.getenv("RETRIEVAL_BATCH_SIZE", "16"))
+    QUERY_BATCH_WINDOW_MS = float(os.getenv("RETRIEVAL_BATCH_WINDOW_MS", "0"))
+
+# Longest a query_one caller waits for its batch before giving up (seconds)
+QUERY_BATCH_TIMEOUT = 30.0
+
+# Documents per collection.add call (Chroma recommends ~50-250 per write)
+ADD_BATCH_SIZE = 128
+
+# Texts per forward pass when the collection embeds documents
+EMBED_BATCH_SIZE = 64
+
+# Document embeddings reused across add_documents calls, keyed by sha256(text) + model + backend
+DOC_EMBEDDING_CACHE_FILE = "emb_cache.db"
+
+# Keys per SELECT ... IN (...) (stays under SQLite's host-parameter limit)
+_SQLITE_IN_CHUNK = 500
+
+# Per-query fields split out of a batched collection.query result
+_RESULT_FIELDS = ('ids', 'documents', 'metadatas', 'distances')
+
+
+class EmbedderFunction(chromadb.EmbeddingFunction):
+    """
+    Chroma embedding function backed by the shared Embedder
+    
+    Replaces SentenceTransformerEmbeddingFunction so the collection uses the same
+    model instance as the pipeline, placed on EMBEDDING_DEVICE (CUDA when
+    available) and cast to EMBEDDING_PRECISION (e.g. fp16 weights on GPU).
+    """
+    
+    def __init__(self, model_name: str):
+        """
+        Args:
+            model_name: Name of the sentence-transformer model
+        """
+        if HAS_SETTINGS:
+            device = settings.EMBEDDING_DEVICE or None
+            precision = settings.EMBEDDING_PRECISION
+            use_onnx = settings.EMBEDDING_USE_ONNX
+        else:
+            device = os.getenv("EMBEDDING_DEVICE") or None
+            precision = os.getenv("EMBEDDING_PRECISION", "fp32")
+            use_onnx = os.getenv("EMBEDDING_USE_ONNX", "False").lower() == "true"
+        
+        embedder = get_embedder(model_name=model_name, device=device, precision=precision, use_onnx=use_onnx)
+        if embedder.model_name != model_name:
+            # The shared instance serves another model; load a private one
+            embedder = Embedder(model_name=model_name, device=device, precision=precision, use_onnx=use_onnx)
+            embedder.load_model()
+        self.embedder = embedder
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        # Unnormalized, like SentenceTransformerEmbeddingFunction, so existing vectors stay comparable
+        return self.embedder.encode(
+            list(input),
+            batch_size=EMBED_BATCH_SIZE,
+            normalize_embeddings=False
+        ).tolist()
+
+
+class QueryBatcher:
+    """
+    Coalesces concurrent single-embedding searches into one collection.query call
+    
+    A worker thread takes the first waiting request and everything queued behind
+    it (up to max_batch, optionally waiting window_ms for more), groups them by
+    metadata filter and runs one query per group at the largest n_results. Under
+    load, requests pile up while the previous search runs, so batches form with
+    no added delay; a lone request is sent straight away.
+    """
+    
+    def __init__(self, client: "ChromaClient", max_batch: int = 16, window_ms: float = 0.0):
+        """
+        Args:
+            client: Connected ChromaClient to query
+            max_batch: Most queries sent in one collection.query call
+            window_ms: Extra time to wait for companions after the first request
+        """
+        self.client = client
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: "queue.Queue[Tuple[List[float], int, Optional[Dict[str, Any]], Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="chroma-batcher", daemon=True)
+        self._worker.start()
+    
+    def query(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search for one embedding, blocking until its batch has run
+        
+        Returns:
+            Single-row result dict in ChromaClient.query's format
+            
+        Raises:
+            concurrent.futures.TimeoutError: The batch did not finish within QUERY_BATCH_TIMEOUT
+        """
+        future: Future = Future()
+        self._queue.put((query_embedding, n_results, where, future))
+        try:
+            return future.result(timeout=QUERY_BATCH_TIMEOUT)
+        except FutureTimeoutError:
+            # The worker skips cancelled futures when the batch eventually runs
+            future.cancel()
+            raise
+    
+    def _run(self) -> None:
+        """Worker loop: collect a batch, dispatch it, repeat"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                # _dispatch resolves futures itself; this only keeps the worker alive
+                logger.error(f"❌ Query batch dispatch failed: {str(e)}")
+                self._fail(batch, e)
+    
+    def _dispatch(self, batch: List[Tuple[List[float], int, Optional[Dict[str, Any]], Future]]) -> None:
+        """Run one collection query per metadata filter and hand each caller its row"""
+        groups: Dict[str, list] = {}
+        for item in batch:
+            groups.setdefault(repr(item[2]), []).append(item)
+        
+        for items in groups.values():
+            try:
+                results = self.client.query(
+                    query_embeddings=[embedding for embedding, _, _, _ in items],
+                    n_results=max(n for _, n, _, _ in items),
+                    where=items[0][2]
+                )
+                
+                if len(items) > 1:
+                    logger.debug(f"Batched {len(items)} concurrent queries into one search")
+                
+                # Rows are sorted by distance, so each caller's top-n is a prefix
+                for row, (_, n, _, future) in enumerate(items):
+                    if not future.done():
+                        future.set_result({field: [results[field][row][:n]] for field in _RESULT_FIELDS})
+            except Exception as e:
+                self._fail(items, e)
+    
+    @staticmethod
+    def _fail(items: List[Tuple[List[float], int, Optional[Dict[str, Any]], Future]], error: Exception) -> None:
+        """Fail every caller in items whose future is still unresolved"""
+        for _, _, _, future in items:
+            if not future.done():
+                future.set_exception(error)
+
 
 class ChromaClient:
     """
@@ -21,48 +206,89 @@ class ChromaClient:
         self,
         persist_directory: str = "./data/chromadb",
         collection_name: str = "legal_documents",
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        http_url: Optional[str] = None
     ):
         """
         Initialize ChromaDB client
         
         Args:
-            persist_directory: Path to persist ChromaDB data
+            persist_directory: Path to persist ChromaDB data (embedded mode)
             collection_name: Name of the collection to use
             embedding_model: Name of the sentence-transformer model
+            http_url: Chroma server URL (from CHROMA_HTTP_URL if not provided);
+                      when set, connects in server mode instead of embedded mode
         """
+        if http_url is None:
+            http_url = settings.CHROMA_HTTP_URL if HAS_SETTINGS else os.getenv("CHROMA_HTTP_URL", "")
+        
         self.persist_directory = persist_directory
         self.collection_name = collection_name
         self.embedding_model = embedding_model
+        self.http_url = http_url or None
         
-        # Ensure persist directory exists
-        os.makedirs(persist_directory, exist_ok=True)
+        # Ensure persist directory exists (embedded mode only)
+        if not self.http_url:
+            os.makedirs(persist_directory, exist_ok=True)
         
         # Initialize ChromaDB client
         self.client = None
         self.collection = None
         self.embedding_function = None
         
-        logger.info(f"ChromaClient initialized with persist_directory: {persist_directory}")
+        # One instance is shared across request threads: reads run concurrently,
+        # writes are serialized (embedded Chroma has a single SQLite/HNSW writer)
+        self._write_lock = threading.Lock()
+        
+        # Query text -> float32 embedding, LRU-ordered
+        self._emb_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._emb_cache_lock = threading.Lock()
+        
+        # Created on first query_one() call
+        self._batcher: Optional[QueryBatcher] = None
+        self._batcher_lock = threading.Lock()
+        
+        # Opened on first add_documents() call (see embed_documents)
+        self._doc_emb_cache: Optional[sqlite3.Connection] = None
+        self._doc_emb_lock = threading.Lock()
+        
+        # Running totals of embed_documents lookups (cache hits vs. texts encoded)
+        self.doc_embedding_stats: Dict[str, int] = {'cached': 0, 'encoded': 0}
+        
+        if self.http_url:
+            logger.info(f"ChromaClient initialized with server: {self.http_url}")
+        else:
+            logger.info(f"ChromaClient initialized with persist_directory: {persist_directory}")
     
     def connect(self) -> None:
         """
         Connect to ChromaDB and initialize the collection
         """
         try:
-            # Create ChromaDB client with persistence
-            self.client = chromadb.PersistentClient(
-                path=self.persist_directory,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
+            client_settings = Settings(
+                anonymized_telemetry=False,
+                allow_reset=True
             )
             
+            if self.http_url:
+                # Server mode: the Chroma server owns the SQLite store and HNSW
+                # index, so multiple processes can read/write concurrently
+                url = urlparse(self.http_url)
+                self.client = chromadb.HttpClient(
+                    host=url.hostname or "localhost",
+                    port=url.port or (443 if url.scheme == "https" else 8000),
+                    ssl=url.scheme == "https",
+                    settings=client_settings
+                )
+            else:
+                # Embedded mode: ChromaDB client with local persistence
+                self.client = chromadb.PersistentClient(
+                    path=self.persist_directory,
+                    settings=client_settings
+                )
+            
             # Initialize embedding function
-            self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name=self.embedding_model
-            )
+            self.embedding_function = EmbedderFunction(self.embedding_model)
             
             # Get or create collection
             self.collection = self.client.get_or_create_collection(
@@ -82,45 +308,189 @@ class ChromaClient:
         self,
         documents: List[str],
         metadatas: List[Dict[str, Any]],
-        ids: List[str]
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        batch_size: int = ADD_BATCH_SIZE
     ) -> None:
         """
-        Add documents to the collection
+        Add documents to the collection in batches of batch_size
         
         Args:
             documents: List of document texts
             metadatas: List of metadata dictionaries for each document
             ids: List of unique IDs for each document
+            embeddings: Precomputed embeddings (optional; otherwise computed by embed_documents
+                        per batch, so re-indexed text is not encoded again)
+            batch_size: Documents per collection.add call
         """
         if not self.collection:
             raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
         
+        batch_size = max(1, batch_size)
+        start_time = time.perf_counter()
         try:
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+            for i in range(0, len(documents), batch_size):
+                batch_start = time.perf_counter()
+                batch_docs = documents[i:i + batch_size]
+                batch_embeddings = (
+                    embeddings[i:i + batch_size] if embeddings is not None
+                    else self.embed_documents(batch_docs)
+                )
+                
+                # Lock per batch so searches can run between writes
+                with self._write_lock:
+                    self.collection.add(
+                        documents=batch_docs,
+                        metadatas=metadatas[i:i + batch_size],
+                        ids=ids[i:i + batch_size],
+                        embeddings=batch_embeddings
+                    )
+                
+                elapsed = time.perf_counter() - batch_start
+                logger.debug(
+                    f"Added batch {i // batch_size + 1}: {len(batch_docs)} documents "
+                    f"({len(batch_docs) / max(elapsed, 1e-9):.1f} docs/sec)"
+                )
+            
+            elapsed = time.perf_counter() - start_time
+            logger.info(
+                f"✅ Added {len(documents)} documents to collection "
+                f"({len(documents) / max(elapsed, 1e-9):.1f} docs/sec)"
             )
-            logger.info(f"✅ Added {len(documents)} documents to collection")
         except Exception as e:
             logger.error(f"❌ Failed to add documents: {str(e)}")
             raise
     
+    def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """
+        Embed documents with the collection's embedding function, reusing cached vectors
+        
+        Vectors are stored in a SQLite table (persist_directory/emb_cache.db) keyed by
+        sha256 of the text, the model name and the embedder backend (e.g. torch-fp16,
+        onnx-int8), so documents re-indexed by incremental loads skip the encoder and
+        vectors from another backend or precision are never reused. Misses are encoded in one call and written back.
+        In server mode (http_url) there is no local cache and every text is encoded.
+        
+        Args:
+            documents: List of document texts
+            
+        Returns:
+            One embedding per document, in input order
+        """
+        if not self.embedding_function:
+            raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
+        
+        keys = [hashlib.sha256(doc.encode('utf-8')).hexdigest() for doc in documents]
+        backend = self.embedding_function.embedder.backend
+        
+        with self._doc_emb_lock:
+            db = self._open_doc_emb_cache()
+            found: Dict[str, np.ndarray] = {}
+            if db is not None:
+                unique_keys = list(dict.fromkeys(keys))
+                for start in range(0, len(unique_keys), _SQLITE_IN_CHUNK):
+                    chunk = unique_keys[start:start + _SQLITE_IN_CHUNK]
+                    rows = db.execute(
+                        f"SELECT sha256, vec FROM doc_embedding_vectors WHERE model = ? AND backend = ? "
+                        f"AND sha256 IN ({','.join('?' * len(chunk))})",
+                        [self.embedding_model, backend, *chunk]
+                    )
+                    for key, blob in rows:
+                        found[key] = np.frombuffer(blob, dtype=np.float32)
+        
+        # Encode each distinct uncached text once
+        misses = {key: doc for key, doc in zip(keys, documents) if key not in found}
+        if misses:
+            vectors = np.asarray(self.embedding_function(list(misses.values())), dtype=np.float32)
+            found.update(zip(misses, vectors))
+            
+            with self._doc_emb_lock:
+                if db is not None:
+                    try:
+                        with db:
+                            db.executemany(
+                                "INSERT OR REPLACE INTO doc_embedding_vectors (sha256, model, backend, vec) "
+                                "VALUES (?, ?, ?, ?)",
+                                [(key, self.embedding_model, backend, found[key].tobytes()) for key in misses]
+                            )
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️ Could not write document embedding cache: {str(e)}")
+        
+        cached = sum(key not in misses for key in keys)
+        with self._doc_emb_lock:
+            self.doc_embedding_stats['cached'] += cached
+            self.doc_embedding_stats['encoded'] += len(misses)
+        
+        logger.debug(f"[CACHE] Document embeddings: {cached} cached, {len(misses)} encoded")
+        return [found[key].tolist() for key in keys]
+    
+    def _open_doc_emb_cache(self) -> Optional[sqlite3.Connection]:
+        """Open (once) the document embedding cache; None if it cannot be used"""
+        if self.http_url:
+            # Server mode: persist_directory is not ours to write, so don't cache locally
+            return None
+        if self._doc_emb_cache is None:
+            path = os.path.join(self.persist_directory, DOC_EMBEDDING_CACHE_FILE)
+            try:
+                os.makedirs(self.persist_directory, exist_ok=True)
+                db = sqlite3.connect(path, check_same_thread=False)
+                # The old table had no backend column, so its vectors can't be told apart
+                db.execute("DROP TABLE IF EXISTS doc_embeddings")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS doc_embedding_vectors "
+                    "(sha256 TEXT NOT NULL, model TEXT NOT NULL, backend TEXT NOT NULL, vec BLOB NOT NULL, "
+                    "PRIMARY KEY (sha256, model, backend))"
+                )
+                self._doc_emb_cache = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️ Document embedding cache unavailable at {path}: {str(e)}")
+                return None
+        return self._doc_emb_cache
+    
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed a query with the collection's embedding function, memoized per text
+        
+        Args:
+            text: Query string
+            
+        Returns:
+            float32 embedding vector
+        """
+        if not self.embedding_function:
+            raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
+        
+        with self._emb_cache_lock:
+            vector = self._emb_cache.get(text)
+            if vector is not None:
+                self._emb_cache.move_to_end(text)
+                return vector
+        
+        vector = np.asarray(self.embedding_function([text])[0], dtype=np.float32)
+        
+        with self._emb_cache_lock:
+            self._emb_cache[text] = vector
+            if len(self._emb_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+        return vector
+    
     def query(
         self,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
-        where_document: Optional[Dict[str, Any]] = None
+        where_document: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
     ) -> Dict[str, Any]:
         """
         Query the collection for similar documents
         
         Args:
-            query_texts: List of query strings
+            query_texts: List of query strings (embedded via the memoized encode())
             n_results: Number of results to return per query
             where: Metadata filter conditions
             where_document: Document content filter conditions
+            query_embeddings: Precomputed query embeddings (used instead of query_texts)
             
         Returns:
             Dictionary containing query results with documents, metadatas, and distances
@@ -128,9 +498,16 @@ class ChromaClient:
         if not self.collection:
             raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
         
+        if query_texts is None and query_embeddings is None:
+            raise ValueError("Either query_texts or query_embeddings must be provided")
+        
         try:
+            if query_embeddings is None:
+                # Repeated questions skip the transformer forward pass
+                query_embeddings = [self.encode(text).tolist() for text in query_texts]
+            
             results = self.collection.query(
-                query_texts=query_texts,
+                query_embeddings=query_embeddings,
                 n_results=n_results,
                 where=where,
                 where_document=where_document
@@ -141,6 +518,32 @@ class ChromaClient:
             logger.error(f"❌ Query failed: {str(e)}")
             raise
     
+    def query_one(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query with a single embedding, coalesced with concurrent callers' queries
+        
+        Args:
+            query_embedding: Precomputed query embedding
+            n_results: Number of results to return
+            where: Metadata filter conditions
+            
+        Returns:
+            Dictionary containing query results (one row), as query()
+        """
+        if QUERY_BATCH_SIZE <= 1:
+            return self.query(query_embeddings=[query_embedding], n_results=n_results, where=where)
+        
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = QueryBatcher(self, QUERY_BATCH_SIZE, QUERY_BATCH_WINDOW_MS)
+        return self._batcher.query(query_embedding, n_results, where)
+    
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a specific document by ID
@@ -167,6 +570,26 @@ class ChromaClient:
             logger.error(f"❌ Failed to get document {doc_id}: {str(e)}")
             raise
     
+    def get_document_texts(self, doc_ids: List[str]) -> Dict[str, str]:
+        """
+        Retrieve the text of several documents in one call
+        
+        Args:
+            doc_ids: Document IDs
+            
+        Returns:
+            Mapping of document ID to text (missing IDs are omitted)
+        """
+        if not self.collection:
+            raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
+        
+        try:
+            result = self.collection.get(ids=doc_ids, include=["documents"])
+            return dict(zip(result['ids'], result['documents']))
+        except Exception as e:
+            logger.error(f"❌ Failed to get documents: {str(e)}")
+            raise
+    
     def update_document(
         self,
         doc_id: str,
@@ -191,7 +614,8 @@ class ChromaClient:
             if metadata:
                 update_params['metadatas'] = [metadata]
             
-            self.collection.update(**update_params)
+            with self._write_lock:
+                self.collection.update(**update_params)
             logger.info(f"✅ Updated document {doc_id}")
         except Exception as e:
             logger.error(f"❌ Failed to update document {doc_id}: {str(e)}")
@@ -208,7 +632,8 @@ class ChromaClient:
             raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
         
         try:
-            self.collection.delete(ids=ids)
+            with self._write_lock:
+                self.collection.delete(ids=ids)
             logger.info(f"✅ Deleted {len(ids)} documents")
         except Exception as e:
             logger.error(f"❌ Failed to delete documents: {str(e)}")
@@ -234,12 +659,13 @@ class ChromaClient:
             raise RuntimeError("ChromaDB collection not initialized. Call connect() first.")
         
         try:
-            self.client.delete_collection(name=self.collection_name)
-            self.collection = self.client.create_collection(
-                name=self.collection_name,
-                embedding_function=self.embedding_function,
-                metadata={"description": "Legal documents and case law for semantic search"}
-            )
+            with self._write_lock:
+                self.client.delete_collection(name=self.collection_name)
+                self.collection = self.client.create_collection(
+                    name=self.collection_name,
+                    embedding_function=self.embedding_function,
+                    metadata={"description": "Legal documents and case law for semantic search"}
+                )
             logger.warning(f"⚠️ Collection {self.collection_name} has been reset")
         except Exception as e:
             logger.error(f"❌ Failed to reset collection: {str(e)}")
@@ -268,11 +694,16 @@ class ChromaClient:
         """
         self.collection = None
         self.client = None
+        with self._doc_emb_lock:
+            if self._doc_emb_cache is not None:
+                self._doc_emb_cache.close()
+                self._doc_emb_cache = None
         logger.info("Disconnected from ChromaDB")
 
 
 # Singleton instance for global access
 _chroma_client_instance: Optional[ChromaClient] = None
+_chroma_client_lock = threading.Lock()
 
 
 def get_chroma_client(
@@ -281,7 +712,7 @@ def get_chroma_client(
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
 ) -> ChromaClient:
     """
-    Get or create a singleton ChromaClient instance
+    Get or create a singleton ChromaClient instance (thread-safe)
     
     Args:
         persist_directory: Path to persist ChromaDB data
@@ -293,12 +724,21 @@ def get_chroma_client(
     """
     global _chroma_client_instance
     
-    if _chroma_client_instance is None:
-        _chroma_client_instance = ChromaClient(
-            persist_directory=persist_directory,
-            collection_name=collection_name,
-            embedding_model=embedding_model
-        )
-        _chroma_client_instance.connect()
+    # Fast path: no locking once connected
+    instance = _chroma_client_instance
+    if instance is not None:
+        return instance
+    
+    with _chroma_client_lock:
+        # Re-check: another thread may have connected while we waited
+        if _chroma_client_instance is None:
+            client = ChromaClient(
+                persist_directory=persist_directory,
+                collection_name=collection_name,
+                embedding_model=embedding_model
+            )
+            client.connect()
+            # Only publish a connected client, so a failed connect is retried next call
+            _chroma_client_instance = client
     
     return _chroma_client_instance
@@ -7,8 +7,76 @@ sys.path.insert(0, 'src')
 
 from pipelines.adaptive_rag import AdaptiveRAGPipeline
 from graph.neo4j_client import get_neo4j_client
+from cache.redis_cache import (
+    _deserialize, _serialize,
+    _TAG_FLOAT16, _TAG_MSGPACK, _TAG_MSGPACK_ZLIB, _TAG_NDARRAY, _TAG_PICKLE,
+    MSGPACK_AVAILABLE
+)
+from dataclasses import dataclass
+import struct
 import time
 
+import numpy as np
+
+
+@dataclass
+class _Payload:
+    """Non-msgpack value (forces the pickle path)"""
+    name: str
+    scores: list
+
+
+def test_cache_serialization():
+    """Round-trip every tagged payload format (no Redis needed)"""
+    print("\n" + "="*80)
+    print("  CACHE SERIALIZATION ROUND-TRIP TEST")
+    print("="*80)
+    
+    # float32 embeddings -> float16 payload, restored as float32 (approximate)
+    embedding = np.random.default_rng(0).standard_normal((3, 384)).astype(np.float32)
+    payload = _serialize(embedding)
+    assert payload[:1] == _TAG_FLOAT16
+    restored = _deserialize(payload)
+    assert restored.dtype == np.float32 and restored.shape == embedding.shape
+    assert np.allclose(restored, embedding, rtol=1e-3, atol=1e-3)
+    print("[PASS] float32 ndarray (float16 tag)")
+    
+    # Other float dtypes are stored losslessly
+    values = np.array([1e6, 1.2345678901])
+    restored = _deserialize(_serialize(values))
+    assert restored.dtype == np.float64 and np.array_equal(restored, values)
+    print("[PASS] float64 ndarray (lossless)")
+    
+    # Legacy raw float32 payloads are still readable
+    legacy = _TAG_NDARRAY + struct.pack('<BI', 1, 2) + np.array([0.5, 1.5], dtype=np.float32).tobytes()
+    assert np.array_equal(_deserialize(legacy), np.array([0.5, 1.5], dtype=np.float32))
+    print("[PASS] legacy float32 ndarray")
+    
+    # Plain dicts/lists (msgpack when available), including non-str keys
+    record = {"intent": "factual", "sources": [{"id": "IPC_438", "score": 0.91}], "count": 2}
+    payload = _serialize(record)
+    assert payload[:1] == (_TAG_MSGPACK if MSGPACK_AVAILABLE else _TAG_PICKLE)
+    assert _deserialize(payload) == record
+    by_section = {438: ["bail"], 302: ["murder"]}
+    assert _deserialize(_serialize(by_section)) == by_section
+    print("[PASS] dict/list payloads (incl. int keys)")
+    
+    # Large text-heavy payloads are compressed
+    large = {"answer": "Anticipatory bail under Section 438 CrPC. " * 500}
+    payload = _serialize(large)
+    if MSGPACK_AVAILABLE:
+        assert payload[:1] == _TAG_MSGPACK_ZLIB
+    assert _deserialize(payload) == large
+    print("[PASS] large payload (zlib)")
+    
+    # Arbitrary objects fall back to pickle
+    obj = _Payload(name="IPC 302", scores=[0.9, 0.8])
+    payload = _serialize(obj)
+    assert payload[:1] == _TAG_PICKLE
+    assert _deserialize(payload) == obj
+    print("[PASS] dataclass (pickle)")
+
+
 def test_cache_performance():
     print("\n" + "="*80)
     print("  REDIS CACHE PERFORMANCE TEST")
@@ -32,7 +100,7 @@ def test_cache_performance():
     
     # Clear cache first
     print(f"\n[TEST] Clearing cache...")
-    pipeline.cache.clear_all()
+    pipeline.clear_cache()
     
     # First run (cache miss)
     print(f"\n[TEST 1] First run (cache miss)")
@@ -87,9 +155,8 @@ def test_cache_performance():
     for i, query in enumerate(queries, 1):
         print(f"\n[TEST {i}] {query}")
         
-        # Clear cache
-        cache_key = pipeline.cache._generate_key("search", query)
-        pipeline.cache.delete(cache_key)
+        # Invalidate this query in every tier (same key scheme process_query uses)
+        pipeline.clear_cache(query)
         
         # Uncached
         start = time.time()
@@ -131,4 +198,5 @@ def test_cache_performance():
     print("="*80 + "\n")
 
 if __name__ == "__main__":
+    test_cache_serialization()
     test_cache_performance()
@@ -61,6 +61,16 @@ def test_chroma_client():
         )
         logger.info("✅ Documents added successfully")
         
+        # Test 2b: Re-embedding the same texts (a second load) hits the document cache
+        logger.info("\n📝 Test 2b: Re-embedding documents from the embedding cache...")
+        stats_before = dict(client.doc_embedding_stats)
+        client.embed_documents(sample_docs)
+        cached = client.doc_embedding_stats['cached'] - stats_before['cached']
+        encoded = client.doc_embedding_stats['encoded'] - stats_before['encoded']
+        assert cached == len(sample_docs) and encoded == 0, \
+            f"expected {len(sample_docs)} cached / 0 encoded, got {cached} / {encoded}"
+        logger.info(f"✅ All {cached} documents served from the embedding cache")
+        
         # Test 3: Query documents
         logger.info("\n📝 Test 3: Querying for similar documents...")
         query_result = client.query(
@@ -0,0 +1,85 @@
+"""
+Test script for the fast ranking kernels
+Checks dot_scores and dot_scores_int8 against plain NumPy (numba or fallback path)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.fast_rank import NUMBA_AVAILABLE, dot_scores, dot_scores_int8
+from embeddings.embedder import Embedder
+import numpy as np
+
+
+def _unit_rows(rng, rows: int, dim: int) -> np.ndarray:
+    """Random unit-length float32 rows"""
+    matrix = rng.standard_normal((rows, dim)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_dot_scores():
+    """Float kernel equals matrix @ query"""
+    print("\n" + "="*80)
+    print(f"  DOT SCORES TEST (numba: {NUMBA_AVAILABLE})")
+    print("="*80)
+    
+    rng = np.random.default_rng(0)
+    matrix = _unit_rows(rng, 1000, 384)
+    query = _unit_rows(rng, 1, 384)[0]
+    
+    scores = dot_scores(query, matrix)
+    assert scores.dtype == np.float32 and scores.shape == (1000,)
+    assert np.allclose(scores, matrix.astype(np.float64) @ query.astype(np.float64), atol=1e-5)
+    print("[PASS] matches numpy reference")
+    
+    # Non-contiguous / float64 inputs are accepted
+    scores = dot_scores(query.astype(np.float64), np.asfortranarray(matrix))
+    assert np.allclose(scores, matrix @ query, atol=1e-5)
+    print("[PASS] float64 and Fortran-ordered inputs")
+    
+    # Unit vectors: a row scored against itself is 1
+    assert np.allclose(dot_scores(matrix[7], matrix)[7], 1.0, atol=1e-5)
+    print("[PASS] self-similarity is 1")
+
+
+def test_dot_scores_int8():
+    """Int8 kernel equals the dequantized dot product and approximates the float one"""
+    print("\n" + "="*80)
+    print(f"  INT8 DOT SCORES TEST (numba: {NUMBA_AVAILABLE})")
+    print("="*80)
+    
+    rng = np.random.default_rng(1)
+    matrix = _unit_rows(rng, 1000, 384)
+    query = _unit_rows(rng, 1, 384)[0]
+    
+    q_matrix, row_scales = Embedder.quantize_int8(matrix)
+    q_query, query_scale = Embedder.quantize_int8(query[None, :])
+    q_query, query_scale = q_query[0], float(query_scale[0])
+    
+    scores = dot_scores_int8(q_query, query_scale, q_matrix, row_scales)
+    assert scores.dtype == np.float32 and scores.shape == (1000,)
+    
+    # Exact integer dot products, rescaled (int64 so the reference itself can't overflow)
+    reference = (q_matrix.astype(np.int64) @ q_query.astype(np.int64)) * query_scale * row_scales.astype(np.float64)
+    assert np.allclose(scores, reference, rtol=1e-5, atol=1e-6)
+    print("[PASS] matches numpy int8 reference")
+    
+    # Saturated rows (every value +/-127) would overflow int16 accumulation
+    saturated = np.full((2, 384), 127, dtype=np.int8)
+    saturated[1] = -127
+    scores = dot_scores_int8(saturated[0], 1.0, saturated, np.ones(2, dtype=np.float32))
+    assert np.array_equal(scores, np.array([384 * 127 * 127, -384 * 127 * 127], dtype=np.float32))
+    print("[PASS] int32 accumulation (no overflow)")
+    
+    # Quantization error stays small relative to the float scores
+    float_scores = matrix @ query
+    error = np.abs(dot_scores_int8(q_query, query_scale, q_matrix, row_scales) - float_scores).max()
+    assert error < 0.02, error
+    print(f"[PASS] close to float scores (max error {error:.4f})")
+
+
+if __name__ == "__main__":
+    test_dot_scores()
+    test_dot_scores_int8()
@@ -0,0 +1,86 @@
+"""
+Test script for the internal API key middleware
+Public paths pass without a key; everything else needs X-Internal-API-Key
+"""
+import sys
+import os
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from middleware import verify_internal_api_key
+from middleware.api_key_middleware import _EXPECTED_KEY_BYTES
+
+
+def _request(path: str, api_key: str = None) -> Request:
+    """Bare HTTP request scope for path"""
+    headers = [(b"x-internal-api-key", api_key.encode("utf-8"))] if api_key is not None else []
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+    })
+
+
+def _call(path: str, api_key: str = None):
+    """Run the middleware; returns the downstream response, or the HTTPException it raised"""
+    async def call_next(request):
+        return PlainTextResponse("ok")
+    
+    try:
+        return asyncio.run(verify_internal_api_key(_request(path, api_key), call_next))
+    except HTTPException as e:
+        return e
+
+
+def test_public_paths():
+    """Docs, health and root need no key; look-alike paths are not public"""
+    print("\n" + "="*80)
+    print("  MIDDLEWARE PUBLIC PATHS TEST")
+    print("="*80)
+    
+    for path in ["/", "/health", "/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"]:
+        response = _call(path)
+        assert not isinstance(response, HTTPException), f"{path} should be public"
+        assert response.status_code == 200
+    print("[PASS] public paths pass without a key")
+    
+    for path in ["/api/adaptive-query", "/api/query", "/healthz", "/health/details", "/openapi.yaml", "/api/docs"]:
+        response = _call(path)
+        assert isinstance(response, HTTPException) and response.status_code == 401, f"{path} should need a key"
+    print("[PASS] protected paths reject requests without a key")
+
+
+def test_api_key_check():
+    """Wrong keys are rejected; the configured key is accepted"""
+    print("\n" + "="*80)
+    print("  MIDDLEWARE API KEY TEST")
+    print("="*80)
+    
+    if _EXPECTED_KEY_BYTES is None:
+        response = _call("/api/query", api_key="anything")
+        assert isinstance(response, HTTPException) and response.status_code == 500
+        print("[WARN] INTERNAL_API_KEY not configured: protected paths return 500")
+        return
+    
+    response = _call("/api/query", api_key="wrong-key")
+    assert isinstance(response, HTTPException) and response.status_code == 401
+    print("[PASS] wrong key rejected")
+    
+    response = _call("/api/query", api_key=_EXPECTED_KEY_BYTES.decode("utf-8"))
+    assert not isinstance(response, HTTPException) and response.status_code == 200
+    print("[PASS] configured key accepted")
+
+
+if __name__ == "__main__":
+    test_public_paths()
+    test_api_key_check()
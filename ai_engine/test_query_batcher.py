@@ -0,0 +1,127 @@
+"""
+Test script for QueryBatcher
+Concurrent searches are coalesced into one collection query per filter, and a failed
+search fails only its own callers (runs against a stand-in client, no ChromaDB needed)
+"""
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from vectorstore.chroma_client import QueryBatcher
+
+
+class _FakeClient:
+    """Stands in for ChromaClient.query; row i's ids are '<embedding[0]>_<rank>'"""
+    
+    def __init__(self):
+        self.calls = []  # (number of embeddings, n_results, where)
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+    
+    def query(self, query_embeddings, n_results, where=None):
+        self.calls.append((len(query_embeddings), n_results, where))
+        self.entered.set()
+        self.release.wait()
+        if where == {"act": "broken"}:
+            raise RuntimeError("collection unavailable")
+        rows = [int(embedding[0]) for embedding in query_embeddings]
+        return {
+            'ids': [[f"{row}_{rank}" for rank in range(n_results)] for row in rows],
+            'documents': [[f"doc {row}_{rank}" for rank in range(n_results)] for row in rows],
+            'metadatas': [[{"rank": rank} for rank in range(n_results)] for row in rows],
+            'distances': [[rank / 10 for rank in range(n_results)] for row in rows],
+        }
+
+
+def _wait_for_queue(batcher: QueryBatcher, size: int) -> None:
+    """Block until size requests are waiting behind the running batch"""
+    deadline = time.monotonic() + 5
+    while batcher._queue.qsize() < size:
+        assert time.monotonic() < deadline, "requests never queued"
+        time.sleep(0.001)
+
+
+def test_query_batcher_fan_out():
+    """Queued requests share one query per filter and each gets its own top-n"""
+    print("\n" + "="*80)
+    print("  QUERY BATCHER FAN-OUT TEST")
+    print("="*80)
+    
+    client = _FakeClient()
+    batcher = QueryBatcher(client, max_batch=16)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        # Hold the worker inside a first search so the next requests pile up
+        client.release.clear()
+        first = pool.submit(batcher.query, [0.0], 2)
+        assert client.entered.wait(5)
+        
+        requests = [
+            ([1.0], 1, None),
+            ([2.0], 3, None),
+            ([3.0], 2, None),
+            ([4.0], 2, {"act": "IPC"}),
+            ([5.0], 1, {"act": "IPC"}),
+        ]
+        futures = [pool.submit(batcher.query, *request) for request in requests]
+        _wait_for_queue(batcher, len(requests))
+        client.release.set()
+        
+        assert first.result(5)['ids'] == [["0_0", "0_1"]]
+        for (embedding, n, _), future in zip(requests, futures):
+            result = future.result(5)
+            row = int(embedding[0])
+            assert result['ids'] == [[f"{row}_{rank}" for rank in range(n)]], result['ids']
+            assert result['distances'] == [[rank / 10 for rank in range(n)]]
+            assert len(result['documents'][0]) == len(result['metadatas'][0]) == n
+    
+    # The lone first request, then one call per filter at the largest n_results
+    assert client.calls[0] == (1, 2, None)
+    assert sorted(client.calls[1:], key=repr) == sorted([(3, 3, None), (2, 2, {"act": "IPC"})], key=repr)
+    print(f"[PASS] 6 searches served by {len(client.calls)} collection queries")
+
+
+def test_query_batcher_errors():
+    """A failing group fails only its callers, and the worker keeps serving"""
+    print("\n" + "="*80)
+    print("  QUERY BATCHER ERROR PATH TEST")
+    print("="*80)
+    
+    client = _FakeClient()
+    batcher = QueryBatcher(client, max_batch=16)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        client.release.clear()
+        first = pool.submit(batcher.query, [0.0], 1)
+        assert client.entered.wait(5)
+        
+        broken = [pool.submit(batcher.query, [float(i)], 1, {"act": "broken"}) for i in (1, 2)]
+        healthy = pool.submit(batcher.query, [3.0], 1)
+        _wait_for_queue(batcher, 3)
+        client.release.set()
+        
+        assert first.result(5)['ids'] == [["0_0"]]
+        for future in broken:
+            try:
+                future.result(5)
+                raise AssertionError("expected the broken search to fail")
+            except RuntimeError as e:
+                assert "collection unavailable" in str(e)
+        assert healthy.result(5)['ids'] == [["3_0"]]
+    print("[PASS] failed group raised to its callers only")
+    
+    # Worker thread survived and still answers
+    assert batcher._worker.is_alive()
+    assert batcher.query([7.0], 1)['ids'] == [["7_0"]]
+    print("[PASS] worker still serving after a failed batch")
+
+
+if __name__ == "__main__":
+    test_query_batcher_fan_out()
+    test_query_batcher_errors()
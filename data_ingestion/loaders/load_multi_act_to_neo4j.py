@@ -161,7 +161,7 @@ def create_act_node(neo4j_client: Neo4jClient, act_key: str) -> bool:
     }
     
     try:
-        result = neo4j_client.run_query(query, params)
+        result = neo4j_client.run_query(query, params, write=True)
         if result:
             logger.info(f"   [PASS] Act node created/updated: {short_name}")
             return True
@@ -227,7 +227,7 @@ def create_section_node(
     }
     
     try:
-        result = neo4j_client.run_query(query, params)
+        result = neo4j_client.run_query(query, params, write=True)
         if result:
             logger.info(f"   [PASS] Section node created/updated: {section_id}")
             return True
@@ -268,7 +268,7 @@ def create_has_section_relationship(
     }
     
     try:
-        result = neo4j_client.run_query(query, params)
+        result = neo4j_client.run_query(query, params, write=True)
         if result:
             logger.debug(f"   ✓ HAS_SECTION relationship: {act_short_name} -> {section_id}")
             return True
@@ -331,7 +331,7 @@ def create_section_references(
             }
             
             try:
-                result = neo4j_client.run_query(query, params)
+                result = neo4j_client.run_query(query, params, write=True)
                 if result:
                     relationships_created += 1
                     logger.debug(f"   ✓ RELATED_TO: {section_id} -> {ref_section_id}")
@@ -356,11 +356,14 @@ def create_indexes(neo4j_client: Neo4jClient) -> bool:
         "CREATE INDEX IF NOT EXISTS FOR (s:Section) ON (s.id)",
         "CREATE INDEX IF NOT EXISTS FOR (s:Section) ON (s.number)",
         "CREATE INDEX IF NOT EXISTS FOR (s:Section) ON (s.act_key)",
+        # Full-text index for keyword search over section titles (avoids label scans)
+        "CREATE FULLTEXT INDEX section_title_ft IF NOT EXISTS FOR (s:Section) ON EACH [s.title]",
     ]
     
     try:
         for index_query in indexes:
-            neo4j_client.run_query(index_query)
+            if neo4j_client.run_write_query(index_query) is None:
+                raise RuntimeError(f"Index statement failed: {index_query}")
         logger.info("   [PASS] Indexes created/verified")
         return True
     except Exception as e: